@@ -0,0 +1,86 @@
+"""Теги и категории по ключевым словам: KeywordMatcher (регулярное выражение и pyahocorasick) против проверок `in`
+
+Запуск: python benchmarks/bench_keyword_matcher.py [--abstracts 2000] [--extra-keywords 0 200 1000]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher, TAG_KEYWORDS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = (
+    "dense alumina ceramics were sintered at 1600 C and their microstructure was characterised by SEM the "
+    "Vickers hardness reached 18 GPa while fracture toughness remained moderate grain growth was suppressed "
+    "by MgO doping which also improved optical transmittance we discuss wear resistant components in pumps "
+    "and valves where chemical stability in acidic media is required carbon fiber reinforced polymer matrix "
+    "composites show high specific strength for aircraft structures titanium alloy heat treatment"
+).split()
+
+def generate_abstracts(count: int, size: int = 1024):
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(size // 4))[:size] for _ in range(count)]
+
+def substring_match(text: str, tag_keywords, categories):
+    """Проверки `in` по каждому слову, как до KeywordMatcher"""
+    text = text.lower()
+    tags = {tag for tag, keywords in tag_keywords.items() if any(keyword in text for keyword in keywords)}
+    scores = {
+        category: sum(1 for keyword in dict.fromkeys(k.lower() for k in info.get("keywords", [])) if keyword in text)
+        for category, info in categories.items()
+    }
+    return tags, scores
+
+def best_of(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--abstracts", type=int, default=2000)
+    arg_parser.add_argument("--extra-keywords", type=int, nargs="+", default=[0, 200, 1000],
+                            help="дополнительные ключевые слова категорий")
+    args = arg_parser.parse_args()
+
+    with open(ROOT / "config.example.json", encoding="utf-8") as f:
+        base_categories = json.load(f)["categories"]
+    abstracts = generate_abstracts(args.abstracts)
+
+    automaton = keyword_matcher.ahocorasick is not None
+    print(f"abstracts: {len(abstracts)} x 1 KB, pyahocorasick: {automaton}")
+    print(f"{'keywords':>9} {'in s':>8} {'regex s':>8} {'automaton s':>12}")
+    for extra in args.extra_keywords:
+        categories = dict(base_categories)
+        rng = random.Random(extra)
+        for index in range(0, extra, 10):
+            categories[f"synthetic_{index}"] = {"keywords": [
+                "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12)))
+                for _ in range(10)
+            ]}
+        matchers = [KeywordMatcher(TAG_KEYWORDS, categories, use_automaton=False)]
+        if automaton:
+            matchers.append(KeywordMatcher(TAG_KEYWORDS, categories, use_automaton=True))
+        for matcher in matchers:
+            for text in abstracts[:50]:
+                match = matcher.match(text)
+                assert (match.tags, match.category_scores) == substring_match(text, TAG_KEYWORDS, categories)
+
+        substring = best_of(lambda: [substring_match(text, TAG_KEYWORDS, categories) for text in abstracts])
+        row = f"{len(matchers[0].keywords):>9} {substring:>8.3f}"
+        for width, matcher in zip((8, 12), matchers):
+            row += f" {best_of(lambda: [matcher.match(text) for text in abstracts]):>{width}.3f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
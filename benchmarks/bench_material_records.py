@@ -0,0 +1,74 @@
+"""Память каталога: словари materials.yaml против MaterialRecord
+
+Каталог загружается из двоичного снимка, поэтому, как и при чтении YAML,
+каждая строка записи - отдельный объект.
+
+Запуск: python benchmarks/bench_material_records.py [--size 100000]
+"""
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_materials_snapshot import generate_materials
+from material_record import MaterialRecord, materials_from_records, records_from_materials
+from materials_snapshot import load_snapshot, write_snapshot
+
+def traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--size", type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "materials.yaml"
+        snapshot_path = Path(tmp) / "materials.snapshot"
+        yaml_path.write_text("")
+        write_snapshot(snapshot_path, generate_materials(args.size), yaml_path)
+
+        tracemalloc.start()
+        baseline = traced_bytes()
+        tracemalloc.reset_peak()
+        materials = load_snapshot(snapshot_path, yaml_path)
+        dict_bytes = traced_bytes() - baseline
+
+        start = time.perf_counter()
+        records = records_from_materials(materials)
+        convert_time = time.perf_counter() - start
+        del materials
+        record_bytes = traced_bytes() - baseline
+        convert_peak = tracemalloc.get_traced_memory()[1] - baseline
+
+        # Загрузка с преобразованием по категориям: словари всего каталога не создаются
+        del records
+        baseline = traced_bytes()
+        tracemalloc.reset_peak()
+        records = load_snapshot(snapshot_path, yaml_path, MaterialRecord.from_dict)
+        streamed_peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        exported = materials_from_records(records)
+        export_time = time.perf_counter() - start
+        assert exported == load_snapshot(snapshot_path, yaml_path)
+
+    scale = 100000 / args.size
+    print(f"materials:          {args.size}")
+    print(f"dicts:              {dict_bytes / 1e6:8.1f} MB ({dict_bytes * scale / 1e6:.1f} MB per 100k)")
+    print(f"MaterialRecord:     {record_bytes / 1e6:8.1f} MB ({record_bytes * scale / 1e6:.1f} MB per 100k)")
+    print(f"reduction:          {1 - record_bytes / dict_bytes:8.1%}")
+    print(f"peak, then convert: {convert_peak / 1e6:8.1f} MB")
+    print(f"peak, per category: {streamed_peak / 1e6:8.1f} MB")
+    print(f"dicts -> records:   {convert_time:8.3f} s (под tracemalloc)")
+    print(f"records -> dicts:   {export_time:8.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Загрузка базы материалов: yaml.safe_load против двоичного снимка
+
+Запуск: python benchmarks/bench_materials_snapshot.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml_io
+from materials_snapshot import load_snapshot, write_snapshot
+
+CATEGORIES = ["composites", "ceramics", "metals", "polymers", "nanomaterials"]
+TAGS = ["metal", "ceramic", "thermal", "structural", "lightweight", "corrosion", "optical"]
+
+def generate_materials(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    materials = {category: [] for category in CATEGORIES}
+    for i in range(count):
+        materials[CATEGORIES[i % len(CATEGORIES)]].append({
+            "label": f"Material {i}",
+            "formula": f"X{i % 97}Y{i % 13}",
+            "λ": round(rng.uniform(0.1, 400), 3),
+            "ρ": round(rng.uniform(500, 20000), 1),
+            "temp_max": rng.randint(100, 3000),
+            "E": round(rng.uniform(1, 400), 2),
+            "yield_strength": round(rng.uniform(10, 2000), 1),
+            "hardness": rng.randint(10, 2500),
+            "cost": round(rng.uniform(0.5, 500), 2),
+            "toxicity": rng.choice(["low", "medium", "high"]),
+            "tags": rng.sample(TAGS, 2)
+        })
+    return materials
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = arg_parser.parse_args()
+
+    print(f"{'materials':>10} {'yaml MB':>8} {'snap MB':>8} {'safe_load s':>12} {'write s':>8} {'snapshot s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "materials.yaml"
+        snapshot_path = Path(tmp) / "materials.snapshot"
+        for size in args.sizes:
+            materials = generate_materials(size)
+            with open(yaml_path, "w", encoding="utf-8") as f:
+                yaml_io.dump(materials, f)
+
+            with open(yaml_path, encoding="utf-8") as f:
+                parsed, yaml_time = measure(lambda: yaml.safe_load(f))
+            _, write_time = measure(lambda: write_snapshot(snapshot_path, parsed, yaml_path))
+            loaded, snapshot_time = measure(lambda: load_snapshot(snapshot_path, yaml_path))
+            assert loaded == parsed
+
+            print(f"{size:>10} {yaml_path.stat().st_size / 1e6:>8.1f} {snapshot_path.stat().st_size / 1e6:>8.1f} "
+                  f"{yaml_time:>12.3f} {write_time:>8.3f} {snapshot_time:>11.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Пропускная способность ParameterParser.parse_query
+
+Запуск: python benchmarks/bench_parameter_parser.py [--iterations N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parameter_parser import ParameterParser
+
+QUERIES = [
+    "pressure drop ≤ 200 kPa\ninlet temperature 25–40 °C\nmass ≤ 1.5 kg\ncost ≤ 50",
+    "pressure_drop < 100 Pa/m AND inlet_temperature > 300 K AND mass < 1000 kg AND cost < 5000 USD",
+    "density ≤ 3000 kg/m³\nthermal conductivity ≥ 10 W/m·K\nstrength ≥ 250 MPa",
+    "hardness > 200 HV",
+]
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--iterations", type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    total_chars = sum(len(query) for query in QUERIES)
+
+    # Без кэша измеряется разбор; с кэшем повторяющиеся запросы - попадания в LRU
+    for title, parser in (("uncached", ParameterParser(cache_size=0)), ("cached", ParameterParser())):
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            for query in QUERIES:
+                parser.parse_query(query)
+        elapsed = time.perf_counter() - start
+
+        parsed = args.iterations * len(QUERIES)
+        print(f"{title}:")
+        print(f"  queries:     {parsed}")
+        print(f"  elapsed:     {elapsed:.3f} s")
+        print(f"  throughput:  {parsed / elapsed:,.0f} queries/s")
+        print(f"               {args.iterations * total_chars / elapsed / 1e6:.2f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Загрузка и запись materials.yaml: чистый Python против libyaml (yaml_io)
+
+Запуск: python benchmarks/bench_yaml_io.py [--sizes 1000 5000 20000] [--memory]
+"""
+import argparse
+import gc
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml_io
+from bench_materials_snapshot import generate_materials
+
+def measure(func, memory: bool):
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    arg_parser.add_argument("--memory", action="store_true", help="пиковая память загрузки (tracemalloc, медленно)")
+    args = arg_parser.parse_args()
+
+    print(f"libyaml: {yaml_io.LIBYAML}")
+    header = f"{'materials':>10} {'py load s':>10} {'C load s':>9} {'stream s':>9} {'py dump s':>10} {'C dump s':>9}"
+    if args.memory:
+        header += f" {'py peak MB':>11} {'C peak MB':>10} {'stream MB':>10}"
+    print(header)
+
+    for size in args.sizes:
+        materials = generate_materials(size)
+        text = yaml_io.dump(materials)
+
+        py_loaded, py_load, py_peak = measure(lambda: yaml.safe_load(text), args.memory)
+        c_loaded, c_load, c_peak = measure(lambda: yaml_io.load(text), args.memory)
+        streamed, stream_load, stream_peak = measure(lambda: yaml_io.load_materials(io.StringIO(text)), args.memory)
+        assert py_loaded == c_loaded == streamed == materials
+        del py_loaded, c_loaded, streamed
+
+        _, py_dump, _ = measure(lambda: yaml.dump(materials, allow_unicode=True), False)
+        _, c_dump, _ = measure(lambda: yaml_io.dump(materials), False)
+
+        row = f"{size:>10} {py_load:>10.3f} {c_load:>9.3f} {stream_load:>9.3f} {py_dump:>10.3f} {c_dump:>9.3f}"
+        if args.memory:
+            row += f" {py_peak / 1e6:>11.1f} {c_peak / 1e6:>10.1f} {stream_peak / 1e6:>10.1f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,26 @@
-import yaml
 import json
-import requests
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 import re
 from dataclasses import dataclass
 from pathlib import Path
 import logging
 from enum import Enum
+import os
 import time
+import threading
 from concurrent.futures import ThreadPoolExecutor
-import spacy
-from tenacity import retry, stop_after_attempt, wait_exponential
 from web_search import WebMaterialSearcher, WebSearchResult
-from parameter_parser import ParameterParser, ParameterConstraint
+from parameter_parser import ParameterParser, ParameterConstraint, unit_dimension
+from materials_journal import MaterialsJournal
+from materials_snapshot import load_snapshot, write_snapshot
+import yaml_io
+from material_record import MISSING, MaterialRecord, RawCategory, materials_from_records, records_from_categories
+from materials_project import MaterialsProjectClient
+from keyword_matcher import KeywordMatcher, TAG_KEYWORDS
+from property_store import (
+    PropertyStore, CONSTRAINT_COLUMNS, COLUMN_PARAMETERS, canonicalize_properties, constraint_interval,
+    constraint_unit, parameter_unit
+)
 
 # Настройка логирования
 logging.basicConfig(
@@ -21,6 +29,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+
 class MaterialCategory(Enum):
     COMPOSITES = "composites"
     CERAMICS = "ceramics"
@@ -88,68 +98,251 @@ class Material:
 
 class MaterialsAgent:
     def __init__(self, config_path: str = "config.json"):
+        self.config_path = config_path
+        self.config = self._load_config()
         self.materials_file = Path("materials.yaml")
+        storage = self.config.get("storage", {})
+        self.storage_mode = storage.get("mode", "rewrite")
+        self.compact_threshold = storage.get("compact_threshold", 1000)
+        self.journal = MaterialsJournal(Path(storage.get("journal_file", "materials.journal")))
+        snapshot_file = storage.get("snapshot_file")
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else None
+        self._storage_lock = threading.Lock()
+        # Компактизация целиком (отделение журнала, запись, удаление) в одном потоке
+        self._flush_lock = threading.Lock()
+        self._compaction_executor = ThreadPoolExecutor(max_workers=1)
+        self._compaction_future = None
+        self.parameter_parser = ParameterParser(
+            cache_size=self.config.get("settings", {}).get("parse_cache_size", 256)
+        )
         self.existing_materials = self._load_existing_materials()
-        self.nlp = spacy.load("en_core_web_sm")
-        self.config = self._load_config()
+        self._build_indexes()
+        self.keyword_matcher = KeywordMatcher(TAG_KEYWORDS, self.config.get("categories", {}))
         self.web_searcher = WebMaterialSearcher(self.config) if self.config.get("web_search", {}).get("enabled", False) else None
-        self.parameter_parser = ParameterParser()
+        self.materials_project = self._create_materials_project_client()
         
     def _load_config(self) -> Dict:
         """Загрузка конфигурации"""
         try:
-            with open(config_path, "r") as f:
+            with open(self.config_path, "r") as f:
                 return json.load(f)
         except FileNotFoundError:
             logger.error("Файл config.json не найден")
             raise
         
          
+    def _read_materials_file(self) -> Optional[Dict]:
+        """Содержимое materials.yaml на диске в виде словарей (из снимка, если он актуален)"""
+        if not self.materials_file.exists():
+            return None
+        materials = self._load_snapshot()
+        if materials is None:
+            with open(self.materials_file, 'r', encoding='utf-8') as f:
+                materials = yaml_io.load_materials(f)
+            if materials:
+                self._write_snapshot(materials)
+        return materials
+
+    def _read_material_records(self) -> Optional[Dict]:
+        """Записи MaterialRecord из materials.yaml (или снимка), преобразуемые по категориям"""
+        if not self.materials_file.exists():
+            return None
+        records = self._load_snapshot(MaterialRecord.from_dict)
+        if records is None:
+            with open(self.materials_file, 'r', encoding='utf-8') as f:
+                records = records_from_categories(yaml_io.iter_categories(f))
+            if records:
+                # RawEntry и RawCategory в снимок не попадают: write_snapshot его не запишет
+                self._write_snapshot(records, lambda record: record.to_dict())
+        return records
+
     def _load_existing_materials(self) -> Dict:
         try:
-            if not self.materials_file.exists():
-                return {category.value: [] for category in MaterialCategory}
-            
-            with open(self.materials_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            materials = self._read_material_records() or {category.value: [] for category in MaterialCategory}
         except Exception as e:
             logger.error(f"Ошибка при загрузке материалов: {e}")
-            return {category.value: [] for category in MaterialCategory}
+            materials = {category.value: [] for category in MaterialCategory}
+
+        try:
+            self._replay_journal(materials)
+        except Exception as e:
+            logger.error(f"Ошибка при чтении журнала материалов: {e}")
+        return materials
+
+    def _replay_journal(self, materials: Dict):
+        """Применение записей журнала, еще не перенесенных в materials.yaml"""
+        replayed = self._merge_journal_entries(materials, self.journal.replay(), MaterialRecord.from_dict)
+        self.journal.pending = replayed
+        if replayed:
+            logger.info(f"Из журнала восстановлено материалов: {replayed}")
+
+    def _merge_journal_entries(self, materials: Dict, entries: Iterable[Tuple[str, Dict]],
+                               convert: Callable[[Dict], Any] = lambda material: material) -> int:
+        """Добавление записей журнала, которых еще нет в materials (по названию)"""
+        known = {
+            self._normalize_string(str(material.get('label', '')))
+            for existing in materials.values() for material in existing or []
+        }
+        merged = 0
+        for category, material in entries:
+            key = self._normalize_string(str(material.get('label', '')))
+            if key in known:
+                # Запись уже попала в materials.yaml до сбоя компактизации
+                continue
+            known.add(key)
+            if materials.get(category) is None:
+                materials[category] = []
+            materials[category].append(convert(material))
+            merged += 1
+        return merged
+
+    def _persist_materials(self, entries: List[Tuple[str, Dict]]):
+        """Сохранение добавленных материалов согласно режиму хранения"""
+        if not entries:
+            # Пакет без новых материалов: файл и снимок не перезаписываются
+            return
+        if self.storage_mode == "journal":
+            self.journal.append(entries)
+            compaction_running = self._compaction_future is not None and not self._compaction_future.done()
+            if self.journal.pending >= self.compact_threshold and not compaction_running:
+                self._compaction_future = self._compaction_executor.submit(self.flush_materials)
+        else:
+            self._write_materials_file(materials_from_records(self.existing_materials))
+
+    def _write_materials_file(self, materials: Dict):
+        """Атомарная запись materials.yaml (словарь категорий в формате файла)"""
+        tmp_path = self.materials_file.with_name(self.materials_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yaml_io.dump(materials, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.materials_file)
+        self._write_snapshot(materials)
+
+    def _load_snapshot(self, convert: Optional[Callable[[Dict], Any]] = None) -> Optional[Dict]:
+        """Материалы из двоичного снимка, если он включен и соответствует materials.yaml"""
+        if not self.snapshot_file:
+            return None
+        materials = load_snapshot(self.snapshot_file, self.materials_file, convert)
+        if materials is not None:
+            logger.info(f"Материалы загружены из снимка {self.snapshot_file}")
+        return materials
+
+    def _write_snapshot(self, materials: Dict, convert: Optional[Callable[[Any], Dict]] = None):
+        """Пересоздание снимка после чтения или записи materials.yaml"""
+        if not self.snapshot_file:
+            return
+        try:
+            write_snapshot(self.snapshot_file, materials, self.materials_file, convert)
+        except Exception as e:
+            logger.error(f"Ошибка при записи снимка материалов: {e}")
+
+    def flush_materials(self):
+        """Компактизация журнала в materials.yaml.
+
+        Записывается materials.yaml с диска вместе с отделенным журналом, а не
+        представление этого процесса: журнал может дописываться другими
+        воркерами. Отделение журнала, запись и удаление выполняются под
+        блокировкой компактизации, общей для потоков и процессов.
+        """
+        try:
+            with self._flush_lock, self.journal.compaction():
+                if not self.journal.rotate():
+                    return
+                materials = self._read_materials_file() or {}
+                merged = self._merge_journal_entries(materials, self.journal.replay_rotated())
+                self._write_materials_file(materials)
+                self.journal.commit_rotation()
+            logger.info(f"Журнал материалов перенесен в materials.yaml: {merged}")
+        except Exception as e:
+            logger.error(f"Ошибка при компактизации журнала материалов: {e}")
+
+    def close(self):
+        """Завершение фоновых задач и сброс журнала"""
+        if self.web_searcher:
+            self.web_searcher.close()
+        self._compaction_executor.shutdown(wait=True)
+        if self.storage_mode == "journal":
+            self.flush_materials()
     
     def _normalize_string(self, s: str) -> str:
         """Нормализация строки для сравнения"""
-        return re.sub(r'[^a-zA-Z0-9]', '', s.lower())
-    
+        return _NON_ALNUM_RE.sub('', s.lower())
+
+    def _build_indexes(self):
+        """Построение индексов дубликатов и колоночного хранилища свойств"""
+        self._build_duplicate_index()
+        self.property_store = PropertyStore.from_materials(self.existing_materials)
+
+    def _build_duplicate_index(self):
+        """Построение индексов нормализованных названий и формул"""
+        self._label_index: Dict[str, Tuple[str, int]] = {}
+        self._formula_index: Dict[str, Tuple[str, int]] = {}
+        for category, materials in self.existing_materials.items():
+            for position, material in enumerate(materials or []):
+                self._index_material(category, position, material)
+
+    def _index_material(self, category: str, position: int, material: MaterialRecord):
+        """Добавление материала в индексы дубликатов (первое вхождение сохраняется)"""
+        if material.label is not MISSING:
+            self._label_index.setdefault(self._normalize_string(str(material.label)), (category, position))
+        if material.formula is not MISSING:
+            self._formula_index.setdefault(self._normalize_string(str(material.formula)), (category, position))
+
+    def find_duplicate(self, material: Material) -> Optional[Dict]:
+        """Поиск существующего материала с тем же названием или формулой"""
+        for field, index, value in (
+            ("label", self._label_index, material.label),
+            ("formula", self._formula_index, material.formula),
+        ):
+            location = index.get(self._normalize_string(value))
+            if location is not None:
+                category, position = location
+                existing = self.existing_materials[category][position]
+                return {
+                    "category": category,
+                    "position": position,
+                    "label": existing.get("label"),
+                    "formula": existing.get("formula"),
+                    "matched_on": field
+                }
+        return None
+
     def is_duplicate(self, material: Material) -> bool:
         """Проверка на дубликаты"""
         try:
-            for category in self.existing_materials.values():
-                for existing in category:
-                    if (self._normalize_string(existing['label']) == self._normalize_string(material.label) or
-                        self._normalize_string(existing['formula']) == self._normalize_string(material.formula)):
-                        return True
-            return False
+            return self.find_duplicate(material) is not None
         except Exception as e:
             logger.error(f"Ошибка при проверке дубликатов: {e}")
             return False
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def _search_materials_project(self, query: str) -> Optional[Dict]:
+    def _create_materials_project_client(self) -> Optional[MaterialsProjectClient]:
+        """Клиент Materials Project API (если задан ключ)"""
+        api_key = self.config.get("materials_project")
+        if not api_key:
+            return None
+        settings = self.config.get("settings", {})
+        return MaterialsProjectClient(
+            api_key,
+            timeout=settings.get("timeout", 30),
+            max_concurrency=settings.get("materials_project_concurrency", 10),
+            retry_attempts=settings.get("retry_attempts", 3),
+            retry_delay=settings.get("retry_delay", 4)
+        )
+
+    async def _search_materials_project(self, query: str) -> Optional[Dict]:
         """Поиск в Materials Project API"""
-        if not self.config.get("materials_project"):
+        if not self.materials_project:
             logger.warning("API ключ Materials Project не найден")
             return None
-            
-        try:
-            response = requests.get(
-                f"https://api.materialsproject.org/materials/{query}",
-                headers={"X-API-KEY": self.config["materials_project"]}
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Ошибка при поиске в Materials Project: {e}")
-            return None
+        return await self.materials_project.get_material(query)
+
+    async def lookup_materials_project(self, queries: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Пакетный поиск материалов (ID или формул) в Materials Project API"""
+        if not self.materials_project:
+            logger.warning("API ключ Materials Project не найден")
+            return {}
+        return await self.materials_project.get_materials(queries)
 
     async def _search_pubchem(self, query: str) -> Optional[Dict]:
         """Поиск в PubChem (заглушка)"""
@@ -157,34 +350,7 @@ class MaterialsAgent:
 
     def _extract_tags(self, description: str) -> Set[str]:
         """Извлечение тегов из описания материала"""
-        doc = self.nlp(description.lower())
-        
-        # Базовые теги на основе ключевых слов
-        tag_keywords = {
-            "lightweight": ["light", "low density", "lightweight"],
-            "conductive": ["conductive", "conductivity", "electrical"],
-            "thermal": ["thermal", "heat", "temperature"],
-            "structural": ["structural", "strength", "mechanical"],
-            "aerospace": ["aerospace", "aircraft", "space"],
-            "biocompatible": ["biocompatible", "bio", "medical"],
-            "corrosion": ["corrosion", "rust", "resistant"],
-            "magnetic": ["magnetic", "magnet", "ferromagnetic"],
-            "optical": ["optical", "light", "transparent"],
-            "ceramic": ["ceramic", "ceramics"],
-            "metal": ["metal", "metallic"],
-            "polymer": ["polymer", "plastic"],
-            "composite": ["composite", "composites"],
-            "nanomaterial": ["nano", "nanomaterial", "nanoparticle"]
-        }
-        
-        tags = set()
-        text = description.lower()
-        
-        for tag, keywords in tag_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                tags.add(tag)
-                
-        return tags
+        return self.keyword_matcher.match(description).tags
 
     async def search_material(self, query: str, category: Optional[str] = None) -> List[Dict]:
         """Поиск материалов в различных источниках"""
@@ -195,16 +361,7 @@ class MaterialsAgent:
             try:
                 web_results = await self.web_searcher.search_material(query, category)
                 for result in web_results:
-                    material = {
-                        "name": result.title,
-                        "description": result.description,
-                        "category": category or self._determine_category(result.title, result.description),
-                        "properties": result.properties,
-                        "source": result.source,
-                        "confidence": result.confidence,
-                        "url": result.url
-                    }
-                    results.append(material)
+                    results.append(self._ingest_web_result(result, category))
             except Exception as e:
                 logger.error(f"Ошибка при веб-поиске: {str(e)}")
         
@@ -213,19 +370,22 @@ class MaterialsAgent:
         
         return results
 
+    def _ingest_web_result(self, result: WebSearchResult, category: Optional[str] = None) -> Dict:
+        """Преобразование веб-результата в словарь со свойствами в СИ"""
+        return {
+            "name": result.title,
+            "description": result.description,
+            "category": category or self._determine_category(result.title, result.description),
+            "properties": canonicalize_properties(result.properties),
+            "display_properties": result.properties,
+            "source": result.source,
+            "confidence": result.confidence,
+            "url": result.url
+        }
+
     def _determine_category(self, title: str, description: str) -> str:
         """Определение категории материала на основе текста"""
-        text = f"{title} {description}".lower()
-        max_matches = 0
-        best_category = "other"
-        
-        for category, info in self.config["categories"].items():
-            matches = sum(1 for keyword in info["keywords"] if keyword.lower() in text)
-            if matches > max_matches:
-                max_matches = matches
-                best_category = category
-        
-        return best_category
+        return self.keyword_matcher.match(f"{title} {description}").best_category()
 
     def add_material(self, material: Material, category: str = "composites"):
         """Добавление материала в YAML"""
@@ -238,36 +398,110 @@ class MaterialsAgent:
                     logger.error(f"- {error}")
                 return
             
-            if self.is_duplicate(material):
-                logger.warning(f"Материал {material.label} уже существует")
+            duplicate = self.find_duplicate(material)
+            if duplicate:
+                logger.warning(
+                    f"Материал {material.label} уже существует: "
+                    f"{duplicate['label']} в категории {duplicate['category']} "
+                    f"(совпадение по полю {duplicate['matched_on']})"
+                )
                 return
             
-            material_dict = {
-                "label": material.label,
-                "formula": material.formula,
-                "λ": material.thermal_conductivity,
-                "ρ": material.density,
-                "temp_max": material.max_temp,
-                "E": material.young_modulus,
-                "yield_strength": material.yield_strength,
-                "hardness": material.hardness,
-                "cost": material.cost,
-                "toxicity": material.toxicity.value,
-                "tags": material.tags
-            }
-            
-            if category not in self.existing_materials:
-                self.existing_materials[category] = []
-            
-            self.existing_materials[category].append(material_dict)
-            
-            with open(self.materials_file, 'w', encoding='utf-8') as f:
-                yaml.dump(self.existing_materials, f, allow_unicode=True)
+            material_dict = self._material_to_dict(material)
+
+            with self._storage_lock:
+                self._append_material(category, material_dict)
+                self._persist_materials([(category, material_dict)])
                 
             logger.info(f"Материал {material.label} успешно добавлен в категорию {category}")
             
         except Exception as e:
             logger.error(f"Ошибка при добавлении материала: {e}")
+
+    def add_materials(self, materials: Iterable[Material], category: str = "composites") -> List[Dict]:
+        """Пакетное добавление материалов с одной записью на диск"""
+        report = []
+        added = []
+        with self._storage_lock:
+            if isinstance(self.existing_materials.get(category), RawCategory):
+                error = f"Категория {category} в materials.yaml не является списком материалов"
+                logger.error(error)
+                return [{"label": getattr(material, "label", None), "status": "error", "errors": [error]}
+                        for material in materials]
+            for material in materials:
+                label = getattr(material, "label", None)
+                try:
+                    errors = material.validate()
+                except Exception as e:
+                    errors = [str(e)]
+                if errors:
+                    report.append({"label": label, "status": "invalid", "errors": errors})
+                    continue
+
+                # Индекс обновляется по ходу пакета, поэтому ловит и повторы внутри него
+                duplicate = self.find_duplicate(material)
+                if duplicate:
+                    report.append({"label": label, "status": "duplicate", "duplicate_of": duplicate})
+                    continue
+
+                material_dict = self._material_to_dict(material)
+                self._append_material(category, material_dict, update_indexes=False)
+                added.append((category, material_dict))
+                report.append({"label": label, "status": "added", "category": category})
+
+            # Индексы свойств строятся один раз на пакет, а не вставкой по строке
+            if added:
+                self.property_store.rebuild_indexes()
+            try:
+                self._persist_materials(added)
+            except Exception as e:
+                logger.error(f"Ошибка при сохранении пакета материалов: {e}")
+                self._rollback_materials(added)
+                for item in report:
+                    if item["status"] == "added":
+                        item.update(status="error", errors=[str(e)])
+                return report
+
+        counts = {}
+        for item in report:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        logger.info(f"Пакетное добавление в категорию {category}: {counts}")
+        return report
+
+    def _material_to_dict(self, material: Material) -> Dict:
+        """Преобразование материала в формат materials.yaml"""
+        return {
+            "label": material.label,
+            "formula": material.formula,
+            "λ": material.thermal_conductivity,
+            "ρ": material.density,
+            "temp_max": material.max_temp,
+            "E": material.young_modulus,
+            "yield_strength": material.yield_strength,
+            "hardness": material.hardness,
+            "cost": material.cost,
+            "toxicity": material.toxicity.value,
+            "tags": material.tags
+        }
+
+    def _append_material(self, category: str, material_dict: Dict, update_indexes: bool = True):
+        """Добавление материала в память и индексы (под self._storage_lock)"""
+        if isinstance(self.existing_materials.get(category), RawCategory):
+            raise ValueError(f"Категория {category} в materials.yaml не является списком материалов")
+        if self.existing_materials.get(category) is None:
+            self.existing_materials[category] = []
+
+        record = MaterialRecord.from_dict(material_dict)
+        self.existing_materials[category].append(record)
+        position = len(self.existing_materials[category]) - 1
+        self._index_material(category, position, record)
+        self.property_store.append(category, position, record, update_indexes)
+
+    def _rollback_materials(self, added: List[Tuple[str, Dict]]):
+        """Откат материалов, которые не удалось сохранить"""
+        for category, _ in reversed(added):
+            self.existing_materials[category].pop()
+        self._build_indexes()
     
     def generate_n8n_json(self, category: str) -> Dict:
         """Генерация JSON для n8n"""
@@ -332,18 +566,20 @@ class MaterialsAgent:
             # Поиск материалов в различных источниках
             results = []
             
-            # Поиск в существующих материалах
-            for category, materials in self.existing_materials.items():
-                for material in materials:
-                    if self._check_material_constraints(material, constraints):
-                        results.append({
-                            "name": material["label"],
-                            "description": f"Найден в категории {category}",
-                            "category": category,
-                            "properties": self._extract_material_properties(material),
-                            "source": "local_database",
-                            "confidence": 1.0
-                        })
+            # Поиск в существующих материалах (по индексам колонок в СИ)
+            store = self.property_store
+            for row in store.query_rows(constraints):
+                category, position = store.rows[row]
+                material = self.existing_materials[category][position]
+                results.append({
+                    "name": material.label,
+                    "description": f"Найден в категории {category}",
+                    "category": category,
+                    "properties": store.si_properties(row),
+                    "display_properties": store.display_properties(row),
+                    "source": "local_database",
+                    "confidence": 1.0
+                })
 
             # Поиск в интернете
             if self.web_searcher:
@@ -351,8 +587,9 @@ class MaterialsAgent:
                     self._generate_search_query(constraints)
                 )
                 for result in web_results:
-                    if self._check_web_result_constraints(result, constraints):
-                        results.append(result)
+                    material = self._ingest_web_result(result)
+                    if self._check_material_constraints(material["properties"], constraints):
+                        results.append(material)
 
             # Сортировка результатов по количеству удовлетворенных ограничений
             results.sort(key=lambda x: self._count_satisfied_constraints(x, constraints), reverse=True)
@@ -363,45 +600,37 @@ class MaterialsAgent:
             logger.error(f"Ошибка при поиске по параметрам: {str(e)}")
             return []
 
-    def _check_material_constraints(self, material: Dict, constraints: List[ParameterConstraint]) -> bool:
-        """Проверка соответствия материала ограничениям"""
-        for constraint in constraints:
-            if not self._check_constraint(material, constraint):
-                return False
-        return True
-
-    def _check_web_result_constraints(self, result: WebSearchResult, constraints: List[ParameterConstraint]) -> bool:
-        """Проверка соответствия веб-результата ограничениям"""
-        properties = result.properties
+    def _check_material_constraints(self, properties: Dict, constraints: List[ParameterConstraint]) -> bool:
+        """Проверка соответствия канонических свойств (СИ) ограничениям"""
         for constraint in constraints:
             if not self._check_constraint(properties, constraint):
                 return False
         return True
 
     def _check_constraint(self, data: Dict, constraint: ParameterConstraint) -> bool:
-        """Проверка одного ограничения"""
-        value = data.get(constraint.name)
-        if value is None:
+        """Проверка одного ограничения по свойствам, уже приведенным к СИ"""
+        name = constraint.name
+        value = data.get(name)
+        if value is None and name in CONSTRAINT_COLUMNS:
+            name = COLUMN_PARAMETERS[CONSTRAINT_COLUMNS[name]]
+            value = data.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
             return False
 
-        # Конвертируем единицы измерения если необходимо
-        if constraint.unit and isinstance(value, (int, float)):
-            value = self.parameter_parser.convert_unit(value, data.get(f"{constraint.name}_unit", ""), constraint.unit)
-
-        if constraint.operator == "less_equal":
-            return value <= constraint.value
-        elif constraint.operator == "greater_equal":
-            return value >= constraint.value
-        elif constraint.operator == "less":
-            return value < constraint.value
-        elif constraint.operator == "greater":
-            return value > constraint.value
-        elif constraint.operator == "equal":
-            return value == constraint.value
-        elif constraint.operator == "range":
-            return constraint.range_min <= value <= constraint.range_max
-
-        return False
+        # Значение в другой размерности (например, HB при ограничении в HV) не сравнимо;
+        # без единицы значение считается заданным в единице параметра по умолчанию
+        unit = data.get(f"{name}_unit") or parameter_unit(name)
+        if unit and unit_dimension(unit) != unit_dimension(constraint_unit(constraint)):
+            return False
+
+        # Конвертируется только ограничение, хранимые значения уже в СИ
+        interval = constraint_interval(constraint)
+        if interval is None:
+            return False
+        low, high, low_inclusive, high_inclusive = interval
+        above = value >= low if low_inclusive else value > low
+        below = value <= high if high_inclusive else value < high
+        return above and below
 
     def _count_satisfied_constraints(self, result: Dict, constraints: List[ParameterConstraint]) -> int:
         """Подсчет количества удовлетворенных ограничений"""
@@ -418,20 +647,6 @@ class MaterialsAgent:
             query_parts.append(f"{constraint.name} {constraint.value} {constraint.unit}")
         return " ".join(query_parts)
 
-    def _extract_material_properties(self, material: Dict) -> Dict:
-        """Извлечение свойств материала в стандартный формат"""
-        return {
-            "pressure": material.get("pressure", 0),
-            "temperature": material.get("temperature", 0),
-            "mass": material.get("mass", 0),
-            "cost": material.get("cost", 0),
-            "density": material.get("density", 0),
-            "thermal_conductivity": material.get("thermal_conductivity", 0),
-            "electrical_conductivity": material.get("electrical_conductivity", 0),
-            "strength": material.get("strength", 0),
-            "hardness": material.get("hardness", 0)
-        }
-
 async def main():
     try:
         agent = MaterialsAgent()
@@ -0,0 +1,129 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+class WebDriverPool:
+    """Ограниченный пул переиспользуемых драйверов Selenium.
+
+    Драйверы создаются лениво при первой выдаче (или заранее через warm_up),
+    проверяются перед выдачей и пересоздаются после `max_pages` страниц или
+    после ошибки во время работы с ними. Одновременно выдается не больше
+    `size` драйверов, остальные вызовы ждут освобождения.
+    """
+
+    def __init__(self, factory: Callable, size: int = 2, max_pages: int = 50, checkout_timeout: float = 60):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self._idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.in_use = 0
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator:
+        """Выдача драйвера на время блока with"""
+        if self._closed:
+            raise RuntimeError("Пул драйверов закрыт")
+        if not self._slots.acquire(timeout=self.checkout_timeout if timeout is None else timeout):
+            raise TimeoutError("Нет свободного драйвера Selenium")
+
+        pooled = None
+        failed = False
+        try:
+            pooled = self._acquire()
+            with self._lock:
+                self.in_use += 1
+            yield pooled.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if pooled is not None:
+                with self._lock:
+                    self.in_use -= 1
+                self._release(pooled, failed)
+            self._slots.release()
+
+    def warm_up(self, count: Optional[int] = None):
+        """Заблаговременное создание драйверов"""
+        count = min(count or self.size, self.size)
+        while self._idle.qsize() < count:
+            self._idle.put(self._create())
+
+    def close(self):
+        """Закрытие всех свободных драйверов; занятые закрываются при возврате"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(pooled)
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики пула"""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": self.in_use,
+            "created": self.created,
+            "recycled": self.recycled
+        }
+
+    def _acquire(self) -> _PooledDriver:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if self._is_healthy(pooled):
+                return pooled
+            logger.warning("Драйвер Selenium не отвечает, создаем новый")
+            self._discard(pooled)
+
+    def _release(self, pooled: _PooledDriver, failed: bool):
+        pooled.pages += 1
+        if self._closed or failed or pooled.pages >= self.max_pages:
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def _create(self) -> _PooledDriver:
+        driver = self.factory()
+        with self._lock:
+            self.created += 1
+        return _PooledDriver(driver)
+
+    def _discard(self, pooled: _PooledDriver):
+        with self._lock:
+            self.recycled += 1
+        self._quit(pooled)
+
+    def _is_healthy(self, pooled: _PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, pooled: _PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.error(f"Ошибка при закрытии драйвера Selenium: {e}")
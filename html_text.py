@@ -0,0 +1,116 @@
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Поддеревья, текст которых не относится к содержимому страницы
+SKIP_TAGS = {"script", "style", "nav", "footer", "noscript", "template", "svg", "iframe"}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+class HtmlTextExtractor(HTMLParser):
+    """Потоковое извлечение заголовка, мета-описания и текста из HTML.
+
+    Дерево документа не строится: текст собирается по мере разбора,
+    поддеревья SKIP_TAGS пропускаются, а после `max_text_bytes` байт текста
+    разбор прекращается. Каждый фрагмент текста передается в `on_text`
+    (например, в PropertyExtractor.feed).
+    """
+
+    def __init__(self, max_text_bytes: int = 1024 * 1024, on_text: Optional[Callable[[str], None]] = None):
+        super().__init__(convert_charrefs=True)
+        self.max_text_bytes = max_text_bytes
+        self.on_text = on_text
+        self.title = ""
+        self.description = ""
+        self.text_bytes = 0
+        self.truncated = False
+        self._text: List[str] = []
+        self._pending: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta" and not self.description:
+            attrs = dict(attrs)
+            if (attrs.get("name") or "").lower() == "description":
+                self.description = attrs.get("content") or ""
+
+    def handle_startendtag(self, tag, attrs):
+        # Самозакрывающиеся теги (<svg/>) не открывают поддерево
+        self._flush()
+        if tag == "meta":
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        # Текст между тегами может прийти по частям, если граница фрагмента
+        # HTML попала внутрь него; он обрабатывается целиком на следующем теге
+        if not self._skip_depth or self._in_title:
+            self._pending.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        data = "".join(self._pending)
+        self._pending.clear()
+        if self._in_title:
+            self.title += data
+        if self._skip_depth or self.truncated:
+            return
+
+        text = _WHITESPACE_RE.sub(" ", data).strip()
+        if not text:
+            return
+        size = len(text.encode("utf-8"))
+        if self.text_bytes + size > self.max_text_bytes:
+            text = text.encode("utf-8")[:self.max_text_bytes - self.text_bytes].decode("utf-8", errors="ignore")
+            self.truncated = True
+        if not text:
+            return
+
+        self.text_bytes += len(text.encode("utf-8")) + 1
+        self._text.append(text)
+        if self.on_text:
+            self.on_text(text + " ")
+
+    def result(self) -> Dict:
+        return {
+            "title": _WHITESPACE_RE.sub(" ", self.title).strip(),
+            "description": self.description,
+            "text": " ".join(self._text)
+        }
+
+def extract_page(html_chunks: Iterable[str], max_text_bytes: int = 1024 * 1024,
+                 on_text: Optional[Callable[[str], None]] = None) -> Dict:
+    """Заголовок, мета-описание и текст страницы из последовательности фрагментов HTML"""
+    parser = HtmlTextExtractor(max_text_bytes, on_text)
+    for chunk in html_chunks:
+        parser.feed(chunk)
+        if parser.truncated:
+            break
+    parser.close()
+    return parser.result()
+
+def iter_chunks(html: str, size: int = 64 * 1024) -> Iterable[str]:
+    """Нарезка уже загруженного HTML на фрагменты для потокового разбора"""
+    for start in range(0, len(html), size):
+        yield html[start:start + size]
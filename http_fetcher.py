@@ -0,0 +1,159 @@
+import codecs
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+from html_text import extract_page, iter_chunks
+
+logger = logging.getLogger(__name__)
+
+# Сайты, которые отдают пустой каркас и рисуют содержимое через JavaScript
+DEFAULT_SPA_DOMAINS = (
+    "sciencedirect.com",
+    "researchgate.net",
+    "matweb.com",
+)
+
+# Пустой корневой контейнер, который заполняет клиентский фреймворк. Атрибуты
+# не выходят за пределы тега ([^<>]), иначе поиск по "<div" без ">" квадратичен
+_EMPTY_APP_ROOT_RE = re.compile(r'<div\b[^<>]*\bid=["\'](root|app|__next)["\'][^<>]*>\s*</div>', re.IGNORECASE)
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# <meta charset="..."> или <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Объявление кодировки ищется в начале документа, как это делают браузеры
+_META_SCAN_BYTES = 4096
+
+class TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter с таймаутом для клиентов, которые не передают его сами (arxiv)"""
+
+    def __init__(self, timeout: float, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+@dataclass
+class FetchedPage:
+    html: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+    # Ответ получен, но это не HTML-страница (код ошибки, PDF и т.п.)
+    not_renderable: bool = False
+
+class HttpFetcher:
+    """Загрузка страниц обычным HTTP-запросом.
+
+    Использует одну requests.Session с пулом соединений, читает тело потоково
+    и не больше `max_bytes`. `needs_javascript` решает, нужно ли вместо
+    результата рендерить страницу в браузере.
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 10, max_bytes: int = 2 * 1024 * 1024,
+                 user_agent: Optional[str] = None, spa_domains: Iterable[str] = DEFAULT_SPA_DOMAINS,
+                 min_text_length: int = 200):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.spa_domains = tuple(domain.lower() for domain in spa_domains)
+        self.min_text_length = min_text_length
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+    def fetch(self, url: str) -> Optional[str]:
+        """HTML страницы или None, если страница недоступна или не является HTML"""
+        page = self.fetch_page(url)
+        return page.html if page else None
+
+    def fetch_page(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[FetchedPage]:
+        """Загрузка страницы с валидаторами кэша.
+
+        Если переданы `etag`/`last_modified`, запрос условный, и ответ
+        304 возвращается как FetchedPage(not_modified=True). Код ошибки или
+        не-HTML ответ возвращается как FetchedPage(not_renderable=True): браузер
+        такую страницу тоже не покажет. None - только при сетевой ошибке.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True, headers=headers) as response:
+                if response.status_code == 304 and headers:
+                    return FetchedPage(None, etag, last_modified, not_modified=True)
+                if response.status_code != 200:
+                    logger.info(f"HTTP {response.status_code} для {url}")
+                    return FetchedPage(None, not_renderable=True)
+                content_type = response.headers.get("Content-Type", "")
+                if content_type and "html" not in content_type.lower():
+                    logger.info(f"Ответ {url} не является HTML: {content_type}")
+                    return FetchedPage(None, not_renderable=True)
+
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+                body = b"".join(chunks)[:self.max_bytes]
+                return FetchedPage(
+                    body.decode(_body_encoding(content_type, body), errors="replace"),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+        except Exception as e:
+            logger.warning(f"Ошибка HTTP-запроса {url}: {e}")
+            return None
+
+    def is_spa_domain(self, url: str) -> bool:
+        """Сайт из списка известных SPA"""
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.spa_domains)
+
+    def needs_javascript(self, url: str, html: Optional[str]) -> bool:
+        """Эвристика: страницу нужно рендерить в браузере.
+
+        Видимый текст считается потоковым HtmlTextExtractor, который
+        останавливается, как только текста набралось достаточно.
+        """
+        if not html or self.is_spa_domain(url) or _EMPTY_APP_ROOT_RE.search(html):
+            return True
+        # Символ UTF-8 занимает не больше 4 байт
+        text = extract_page(iter_chunks(html), max_text_bytes=4 * self.min_text_length)["text"]
+        return len(text) < self.min_text_length
+
+    def close(self):
+        self.session.close()
+
+def _body_encoding(content_type: str, body: bytes) -> str:
+    """Кодировка тела: charset из заголовка, затем из <meta>, затем по содержимому.
+
+    requests без charset в заголовке считает text/html кодировкой ISO-8859-1,
+    из-за чего UTF-8 страницы превращаются в "g/cmÂ³".
+    """
+    match = _HEADER_CHARSET_RE.search(content_type)
+    candidates = [match.group(1)] if match else []
+    match = _META_CHARSET_RE.search(body[:_META_SCAN_BYTES])
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    for encoding in candidates:
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            continue
+    # То же, что response.apparent_encoding, но по уже прочитанному телу
+    return chardet.detect(body)["encoding"] or "utf-8"
@@ -0,0 +1,155 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Теги материалов и ключевые слова, по которым они ставятся
+TAG_KEYWORDS: Dict[str, List[str]] = {
+    "lightweight": ["light", "low density", "lightweight"],
+    "conductive": ["conductive", "conductivity", "electrical"],
+    "thermal": ["thermal", "heat", "temperature"],
+    "structural": ["structural", "strength", "mechanical"],
+    "aerospace": ["aerospace", "aircraft", "space"],
+    "biocompatible": ["biocompatible", "bio", "medical"],
+    "corrosion": ["corrosion", "rust", "resistant"],
+    "magnetic": ["magnetic", "magnet", "ferromagnetic"],
+    "optical": ["optical", "light", "transparent"],
+    "ceramic": ["ceramic", "ceramics"],
+    "metal": ["metal", "metallic"],
+    "polymer": ["polymer", "plastic"],
+    "composite": ["composite", "composites"],
+    "nanomaterial": ["nano", "nanomaterial", "nanoparticle"]
+}
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Альтернатива ключевых слов, свернутая по общим префиксам.
+
+    На каждой позиции текста выбирается самое длинное подходящее слово, а
+    неподходящая позиция отбрасывается по первому символу, а не перебором
+    всех вариантов альтернативы. Пробел в слове совпадает с любыми
+    пробельными символами, поэтому текст не нужно нормализовать отдельным
+    проходом.
+    """
+    trie: Dict[str, Dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Слово кончается в этом узле: продолжение необязательно (жадно - сначала длинное)
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+def _normalize(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+@dataclass
+class KeywordMatch:
+    tags: Set[str] = field(default_factory=set)
+    category_scores: Dict[str, int] = field(default_factory=dict)
+
+    def best_category(self, default: str = "other") -> str:
+        """Категория с наибольшим числом совпавших ключевых слов (первая при равенстве)"""
+        best, best_score = default, 0
+        for category, score in self.category_scores.items():
+            if score > best_score:
+                best, best_score = category, score
+        return best
+
+class KeywordMatcher:
+    """Теги и оценки категорий по ключевым словам за один проход по тексту.
+
+    Ключевые слова всех тегов и категорий ищутся одним проходом в C: через
+    автомат pyahocorasick, если он установлен, иначе одним регулярным
+    выражением внутри опережающей проверки `(?=(...))`, которое находит и
+    перекрывающиеся вхождения. Выражение дает на каждой позиции самое
+    длинное слово, поэтому к нему добавляются более короткие слова-префиксы
+    с той же позиции. Тег ставится, если встретилось хотя бы одно его слово,
+    а оценка категории - число разных ее слов, найденных в тексте. Сравнение
+    без учета регистра, подряд идущие пробельные символы - один пробел.
+    """
+
+    def __init__(self, tag_keywords: Dict[str, List[str]], categories: Dict[str, Dict],
+                 use_automaton: Optional[bool] = None):
+        self.category_names = list(categories)
+        keyword_labels: Dict[str, List[Tuple[str, str]]] = {}
+        for tag, keywords in tag_keywords.items():
+            for keyword in keywords:
+                keyword_labels.setdefault(_normalize(keyword), []).append(("tag", tag))
+        for category, info in categories.items():
+            for keyword in dict.fromkeys(_normalize(keyword) for keyword in info.get("keywords", [])):
+                keyword_labels.setdefault(keyword, []).append(("category", category))
+        keyword_labels.pop("", None)
+        self.keywords = list(keyword_labels)
+
+        self._tags = {
+            keyword: tuple(name for kind, name in labels if kind == "tag") for keyword, labels in keyword_labels.items()
+        }
+        self._categories = {
+            keyword: tuple(name for kind, name in labels if kind == "category")
+            for keyword, labels in keyword_labels.items()
+        }
+
+        if use_automaton is None:
+            use_automaton = ahocorasick is not None
+        self._automaton = None
+        self._pattern = None
+        if not keyword_labels:
+            return
+        if use_automaton:
+            # Текст для автомата нормализуется, только если пробел есть в каком-нибудь слове
+            self._normalize_text = any(" " in keyword for keyword in keyword_labels)
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keyword_labels:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            # Слово вместе со всеми словами-префиксами: они найдены на той же позиции
+            self._prefixes = {
+                keyword: tuple(other for other in keyword_labels if keyword.startswith(other))
+                for keyword in keyword_labels
+            }
+            self._pattern = re.compile("(?=(" + _trie_pattern(keyword_labels) + "))")
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """Разные ключевые слова, встречающиеся в тексте"""
+        text = text.lower()
+        if self._automaton is not None:
+            if self._normalize_text:
+                text = " ".join(text.split())
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        found = set()
+        if self._pattern is not None:
+            for keyword in set(self._pattern.findall(text)):
+                prefixes = self._prefixes.get(keyword)
+                if prefixes is None:
+                    # Слово с пробелом, найденное через перевод строки или несколько пробелов
+                    prefixes = self._prefixes[_normalize(keyword)]
+                found.update(prefixes)
+        return found
+
+    def match(self, text: str) -> KeywordMatch:
+        scores = dict.fromkeys(self.category_names, 0)
+        tags = set()
+        for keyword in self.find_keywords(text):
+            tags.update(self._tags[keyword])
+            for category in self._categories[keyword]:
+                scores[category] += 1
+        return KeywordMatch(tags, scores)
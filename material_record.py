@@ -0,0 +1,213 @@
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _Missing:
+    """Отметка поля, которого нет в записи materials.yaml"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+MISSING = _Missing()
+
+# Наборы тегов встречаются многократно, поэтому кортежи общие для записей
+_TAG_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+# Поля materials.yaml -> атрибуты MaterialRecord (в порядке записи)
+FIELD_ATTRIBUTES = {
+    "label": "label",
+    "formula": "formula",
+    "λ": "thermal_conductivity",
+    "ρ": "density",
+    "temp_max": "max_temp",
+    "E": "young_modulus",
+    "yield_strength": "yield_strength",
+    "hardness": "hardness",
+    "cost": "cost",
+    "toxicity": "toxicity",
+    "tags": "tags",
+}
+
+_FIELD_KEYS = frozenset(FIELD_ATTRIBUTES)
+_TOXICITY = list(FIELD_ATTRIBUTES).index("toxicity")
+_TAGS = list(FIELD_ATTRIBUTES).index("tags")
+
+@dataclass
+class MaterialRecord:
+    """Компактная запись материала в памяти агента.
+
+    Вместо словаря с ключами `λ`, `ρ`, ... значения хранятся в слотах, теги -
+    кортежем интернированных строк, общих для всех записей. Поля, которых
+    нет в FIELD_ATTRIBUTES, и значения, не подходящие слоту (например, теги
+    не списком строк), хранятся в `extra`. Отсутствующие поля - MISSING,
+    поэтому to_dict() возвращает исходный словарь materials.yaml.
+    """
+
+    __slots__ = tuple(FIELD_ATTRIBUTES.values()) + ("extra",)
+
+    label: Any
+    formula: Any
+    thermal_conductivity: Any
+    density: Any
+    max_temp: Any
+    young_modulus: Any
+    yield_strength: Any
+    hardness: Any
+    cost: Any
+    toxicity: Any
+    tags: Any
+    extra: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_dict(cls, material: Dict) -> "MaterialRecord":
+        """Запись из словаря materials.yaml или журнала"""
+        if material.keys() <= _FIELD_KEYS:
+            # Обычная запись: только известные поля, теги - список строк
+            values = [material.get(key, MISSING) for key in FIELD_ATTRIBUTES]
+            tags = _tag_tuple(values[_TAGS]) if values[_TAGS] is not MISSING else MISSING
+            if tags is not None:
+                values[_TAGS] = tags
+                if isinstance(values[_TOXICITY], str):
+                    values[_TOXICITY] = sys.intern(values[_TOXICITY])
+                return cls(*values, None)
+
+        values = {}
+        extra = {}
+        for key, value in material.items():
+            attribute = FIELD_ATTRIBUTES.get(key)
+            if attribute is None:
+                extra[key] = value
+                continue
+            if key == "tags":
+                value = _tag_tuple(value)
+                if value is None:
+                    extra[key] = material[key]
+                    continue
+            elif key == "toxicity" and isinstance(value, str):
+                value = sys.intern(value)
+            values[attribute] = value
+        return cls(
+            *(values.get(attribute, MISSING) for attribute in FIELD_ATTRIBUTES.values()),
+            extra or None
+        )
+
+    def to_dict(self) -> Dict:
+        """Словарь в формате materials.yaml"""
+        material = {}
+        for key, attribute in FIELD_ATTRIBUTES.items():
+            value = getattr(self, attribute)
+            if value is not MISSING:
+                material[key] = list(value) if key == "tags" else value
+        if self.extra:
+            material.update(self.extra)
+        return material
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Значение поля materials.yaml по его ключу"""
+        attribute = FIELD_ATTRIBUTES.get(key)
+        if attribute is not None:
+            value = getattr(self, attribute)
+            if value is not MISSING:
+                return list(value) if key == "tags" else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+@dataclass
+class RawEntry:
+    """Запись категории materials.yaml, которая не является словарем материала.
+
+    Значение хранится как есть и возвращается to_dict(), поэтому запись
+    переживает перезапись файла. Для индексов и поиска это запись без полей.
+    """
+
+    __slots__ = ("value",)
+
+    value: Any
+    label = MISSING
+    formula = MISSING
+
+    def to_dict(self) -> Any:
+        return self.value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return default
+
+@dataclass
+class RawCategory:
+    """Категория materials.yaml, значение которой не является списком материалов.
+
+    Значение хранится как есть и возвращается materials_from_records();
+    для индексов и поиска категория пуста.
+    """
+
+    __slots__ = ("value",)
+
+    value: Any
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+def _tag_tuple(tags: Any) -> Optional[Tuple[str, ...]]:
+    """Общий для всех записей кортеж интернированных тегов или None, если это не список строк"""
+    if type(tags) is not list:
+        return None
+    if not all(type(tag) is str for tag in tags):
+        return None
+    key = tuple(tags)
+    tag_tuple = _TAG_TUPLES.get(key)
+    if tag_tuple is None:
+        tag_tuple = _TAG_TUPLES[key] = tuple(sys.intern(tag) for tag in tags)
+    return tag_tuple
+
+def records_from_materials(materials: Dict) -> Dict[str, Any]:
+    """Словарь категорий materials.yaml -> списки записей"""
+    return records_from_categories(materials.items())
+
+def records_from_categories(categories: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Пары (категория, материалы) -> списки записей.
+
+    Категории преобразуются по мере получения, поэтому при чтении через
+    yaml_io.iter_categories словари всего каталога не создаются. Категории
+    не списком и записи не словарем сохраняются как RawCategory и RawEntry,
+    чтобы materials_from_records вернул их без изменений.
+    """
+    records = {}
+    for category, entries in categories:
+        if entries is None:
+            records[category] = None
+            continue
+        if not isinstance(entries, list):
+            logger.warning(f"Категория {category} не является списком материалов и хранится без изменений")
+            records[category] = RawCategory(entries)
+            continue
+        records[category] = []
+        for material in entries:
+            if not isinstance(material, dict):
+                logger.warning(f"Запись категории {category} не является словарем и хранится без изменений")
+                records[category].append(RawEntry(material))
+                continue
+            records[category].append(MaterialRecord.from_dict(material))
+    return records
+
+def materials_from_records(records: Dict[str, Any]) -> Dict:
+    """Списки записей -> словарь категорий в формате materials.yaml"""
+    return {category: _category_value(entries) for category, entries in records.items()}
+
+def _category_value(entries: Any) -> Any:
+    if entries is None:
+        return None
+    if isinstance(entries, RawCategory):
+        return entries.value
+    return [record.to_dict() for record in entries]
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class MaterialsJournal:
+    """Журнал добавлений материалов (append-only, JSON Lines).
+
+    Каждая строка - одна операция добавления. При компактизации текущий журнал
+    переименовывается в `<журнал>.compacting`, новые записи идут в свежий файл,
+    а после успешной записи materials.yaml переименованный файл удаляется.
+
+    Журнал может быть общим для нескольких процессов (воркеров). Запись идет
+    под разделяемой блокировкой файла `<журнал>.lock`, переименование - под
+    исключительной, поэтому отделенный журнал уже никто не дописывает.
+    Компактизация целиком выполняется под блокировкой `<журнал>.compact.lock`.
+    Без fcntl (Windows) блокировки между процессами не используются.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.compacting_path = self.path.with_name(self.path.name + ".compacting")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compaction_lock_path = self.path.with_name(self.path.name + ".compact.lock")
+        self.pending = 0
+
+    @contextmanager
+    def _file_lock(self, path: Path, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        with open(path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def compaction(self):
+        """Исключительная блокировка компактизации для всех процессов"""
+        with self._file_lock(self.compaction_lock_path, exclusive=True):
+            yield
+
+    def append(self, entries: Iterable[Tuple[str, Dict]]) -> int:
+        """Дописывание записей в журнал одной операцией записи"""
+        lines = [
+            json.dumps({"op": "add", "category": category, "material": material}, ensure_ascii=False) + "\n"
+            for category, material in entries
+        ]
+        if not lines:
+            return 0
+
+        with self._file_lock(self.lock_path, exclusive=False):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.pending += len(lines)
+        return len(lines)
+
+    def replay(self) -> Iterator[Tuple[str, Dict]]:
+        """Чтение записей журнала (включая незавершенную компактизацию)"""
+        for path in (self.compacting_path, self.path):
+            yield from self._read(path)
+
+    def replay_rotated(self) -> Iterator[Tuple[str, Dict]]:
+        """Чтение записей отделенного для компактизации журнала"""
+        yield from self._read(self.compacting_path)
+
+    def _read(self, path: Path) -> Iterator[Tuple[str, Dict]]:
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Оборванная последняя строка после аварийного завершения
+                        logger.warning(f"Пропущена поврежденная запись журнала {path}:{lineno}")
+                        continue
+                    if entry.get("op") == "add":
+                        yield entry["category"], entry["material"]
+
+    def rotate(self) -> bool:
+        """Отделение текущего журнала для компактизации"""
+        with self._file_lock(self.lock_path, exclusive=True):
+            return self._rotate()
+
+    def _rotate(self) -> bool:
+        if not self.path.exists():
+            return self.compacting_path.exists()
+
+        if self.compacting_path.exists():
+            # Предыдущая компактизация не завершилась - объединяем журналы
+            with open(self.path, "r", encoding="utf-8") as src, \
+                    open(self.compacting_path, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            self.path.unlink()
+        else:
+            os.replace(self.path, self.compacting_path)
+
+        self.pending = 0
+        return True
+
+    def commit_rotation(self):
+        """Удаление журнала, содержимое которого уже записано в materials.yaml"""
+        if self.compacting_path.exists():
+            self.compacting_path.unlink()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Ответы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class MaterialsProjectClient:
+    """Асинхронный клиент Materials Project API.
+
+    Одно httpx.AsyncClient на цикл событий держит пул keep-alive соединений;
+    повторы выполняются с экспоненциальной задержкой через asyncio.sleep и не
+    блокируют цикл. `get_materials` ищет много материалов параллельно, не
+    больше `max_concurrency` запросов одновременно.
+    """
+
+    BASE_URL = "https://api.materialsproject.org"
+
+    def __init__(self, api_key: str, timeout: float = 30, max_connections: int = 20, max_concurrency: int = 10,
+                 retry_attempts: int = 3, retry_delay: float = 4, max_retry_delay: float = 10,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        # Хотя бы одна попытка, даже если в настройках retry_attempts: 0
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers={"X-API-KEY": self.api_key},
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self._transport
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def get_material(self, query: str) -> Optional[Dict]:
+        """Поиск материала по ID или формуле"""
+        client = self._get_client()
+        for attempt in range(self.retry_attempts):
+            try:
+                response = await client.get(f"/materials/{query}")
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code == 404:
+                        return None
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+            except Exception as e:
+                logger.error(f"Ошибка при поиске в Materials Project: {e}")
+                return None
+
+            if attempt + 1 < self.retry_attempts:
+                delay = min(self.retry_delay * 2 ** attempt, self.max_retry_delay)
+                logger.warning(f"Materials Project: {error}, повтор через {delay} с")
+                await asyncio.sleep(delay)
+
+        logger.error(f"Ошибка при поиске в Materials Project: {error}")
+        return None
+
+    async def get_materials(self, queries: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Параллельный поиск нескольких материалов"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queries = list(dict.fromkeys(queries))
+
+        async def lookup(query: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self.get_material(query)
+
+        results = await asyncio.gather(*(lookup(query) for query in queries))
+        return dict(zip(queries, results))
+
+    async def aclose(self):
+        """Закрытие пула соединений"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,291 @@
+import gc
+import json
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from property_store import PROPERTY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CMSNAP\x00\x01"
+VERSION = 1
+
+# Строковые поля записи; остальные поля, кроме PROPERTY_COLUMNS и tags,
+# хранятся в JSON-поле extra
+STRING_FIELDS = ("label", "formula", "toxicity")
+
+# Тип значения в строке колонки: нет поля, значение (float или строка),
+# целое число, null
+ABSENT, VALUE, INT, NULL = 0, 1, 2, 3
+
+# Наибольшее целое, точно представимое во float64
+_MAX_EXACT_INT = 2 ** 53
+
+_TAG_SEPARATOR = "\x1f"
+
+# Отсутствующее поле в колонке значений
+_MISSING = object()
+
+_HEADER = struct.Struct("<8sI")
+
+def source_fingerprint(source_path: Path) -> Optional[Dict[str, int]]:
+    """Размер и время изменения materials.yaml, по которым проверяется актуальность снимка"""
+    try:
+        stat = os.stat(source_path)
+    except FileNotFoundError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def write_snapshot(path: Path, materials: Dict, source_path: Path,
+                   convert: Optional[Callable[[Any], Dict]] = None) -> bool:
+    """Запись двоичного снимка базы материалов для materials.yaml.
+
+    Числовые свойства PROPERTY_COLUMNS хранятся колонками float64 с байтом
+    типа значения на строку, строки - в общей таблице UTF-8 со смещениями.
+    Значения, которые не укладываются в колонки (нечисловые, дополнительные
+    поля), сохраняются в JSON-поле extra строки, поэтому снимок
+    восстанавливает исходные словари без потерь. `convert` превращает
+    записи каталога в словари по одной, например MaterialRecord.to_dict.
+    """
+    fingerprint = source_fingerprint(source_path)
+    if fingerprint is None:
+        return False
+
+    rows = []
+    row_categories = []
+    categories = []
+    for category, entries in materials.items():
+        if entries is not None and not isinstance(entries, list):
+            logger.warning(f"Снимок не записан: категория {category} не является списком")
+            return False
+        categories.append([category, None if entries is None else len(entries)])
+        rows.extend(entries or [])
+        row_categories.extend([category] * len(entries or []))
+
+    count = len(rows)
+    numeric = {key: np.full(count, np.nan) for key in PROPERTY_COLUMNS}
+    numeric_kinds = {key: np.zeros(count, dtype=np.uint8) for key in PROPERTY_COLUMNS}
+    string_kinds = {field: np.zeros(count, dtype=np.uint8) for field in STRING_FIELDS + ("tags", "extra")}
+    strings = {field: [] for field in STRING_FIELDS + ("tags", "extra")}
+    # Порядок полей записей; у большинства записей он одинаков
+    key_orders: Dict[Tuple[str, ...], int] = {}
+    orders = np.zeros(count, dtype=np.uint32)
+
+    for row, material in enumerate(rows):
+        if convert is not None:
+            material = convert(material)
+        if not isinstance(material, dict) or not all(isinstance(key, str) for key in material):
+            logger.warning(
+                f"Снимок не записан: запись категории {row_categories[row]} не является словарем со строковыми ключами"
+            )
+            return False
+        orders[row] = key_orders.setdefault(tuple(material), len(key_orders))
+        extra = {}
+        for key, value in material.items():
+            if key in numeric:
+                kind = _numeric_kind(value)
+                if kind is None:
+                    extra[key] = value
+                    continue
+                numeric_kinds[key][row] = kind
+                if kind != NULL:
+                    numeric[key][row] = value
+            elif key in strings and key != "extra":
+                kind, text = _string_value(key, value)
+                if kind is None:
+                    extra[key] = value
+                    continue
+                string_kinds[key][row] = kind
+                strings[key].append((row, text))
+            else:
+                extra[key] = value
+        if extra:
+            string_kinds["extra"][row] = VALUE
+            strings["extra"].append((row, json.dumps(extra, ensure_ascii=False)))
+
+    # Общая таблица строк; смещения считаются в символах декодированного текста
+    table: List[str] = []
+    offsets = {}
+    position = 0
+    for field, values in strings.items():
+        starts = np.zeros(count, dtype=np.int64)
+        lengths = np.zeros(count, dtype=np.int64)
+        for row, text in values:
+            starts[row] = position
+            lengths[row] = len(text)
+            table.append(text)
+            position += len(text)
+        offsets[field] = (starts, lengths)
+    text_blob = "".join(table).encode("utf-8")
+
+    sections = [("order", orders)]
+    for key in PROPERTY_COLUMNS:
+        sections.append((f"num:{key}", numeric[key]))
+        sections.append((f"kind:{key}", numeric_kinds[key]))
+    for field, (starts, lengths) in offsets.items():
+        sections.append((f"start:{field}", starts))
+        sections.append((f"length:{field}", lengths))
+        sections.append((f"kind:{field}", string_kinds[field]))
+
+    layout = {}
+    body = bytearray()
+    for name, array in sections:
+        body.extend(b"\0" * (-len(body) % 8))
+        layout[name] = [len(body), array.dtype.str]
+        body.extend(array.tobytes())
+    body.extend(b"\0" * (-len(body) % 8))
+    layout["strings"] = [len(body), len(text_blob)]
+    body.extend(text_blob)
+
+    header = json.dumps({
+        "version": VERSION,
+        "source": fingerprint,
+        "count": count,
+        "categories": categories,
+        "key_orders": [list(order) for order in key_orders],
+        "sections": layout
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-(len(header) + _HEADER.size) % 8)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+def load_snapshot(path: Path, source_path: Path, convert: Optional[Callable[[Dict], Any]] = None) -> Optional[Dict]:
+    """Словарь категорий из снимка или None, если снимка нет или он устарел.
+
+    Файл отображается в память (mmap), колонки читаются без копирования
+    через numpy.frombuffer, а таблица строк декодируется одним вызовом.
+    Словари записей собираются по категориям; с `convert` (например,
+    MaterialRecord.from_dict) каждая категория сразу преобразуется, и
+    словари всего каталога не находятся в памяти одновременно.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    # Записи не образуют циклов ссылок, а проходы сборщика мусора на каждую
+    # сотню новых словарей заметно замедляют загрузку
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _read_snapshot(mapped, source_path, convert)
+    except Exception as e:
+        logger.warning(f"Снимок {path} не прочитан: {e}")
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def _read_snapshot(mapped: mmap.mmap, source_path: Path, convert: Optional[Callable[[Dict], Any]]) -> Optional[Dict]:
+    magic, header_size = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError("неизвестный формат файла")
+    header = json.loads(mapped[_HEADER.size:_HEADER.size + header_size].decode("utf-8"))
+    if header.get("version") != VERSION or header.get("source") != source_fingerprint(source_path):
+        return None
+
+    count = header["count"]
+    base = _HEADER.size + header_size
+    layout = header["sections"]
+
+    def column(name: str) -> np.ndarray:
+        offset, dtype = layout[name]
+        return np.frombuffer(mapped, dtype=np.dtype(dtype), count=count, offset=base + offset)
+
+    offset, size = layout["strings"]
+    text = mapped[base + offset:base + offset + size].decode("utf-8")
+
+    numeric = {key: (column(f"num:{key}"), column(f"kind:{key}")) for key in PROPERTY_COLUMNS}
+    strings = {
+        field: (column(f"start:{field}"), column(f"length:{field}"), column(f"kind:{field}"))
+        for field in STRING_FIELDS + ("tags", "extra")
+    }
+    orders = column("order")
+
+    def category_rows(start: int, stop: int) -> list:
+        # Значения категории восстанавливаются по колонкам, затем собираются в записи
+        columns = {}
+        for key, (values, kinds) in numeric.items():
+            columns[key] = _numeric_values(values[start:stop], kinds[start:stop])
+        for field, (starts, lengths, kinds) in strings.items():
+            columns[field] = _string_values(field, text, starts[start:stop], lengths[start:stop], kinds[start:stop])
+        extras = columns.pop("extra")
+
+        # Для каждого порядка полей - колонки, из которых берутся значения
+        plans = [(keys, [columns.get(key) for key in keys]) for keys in header["key_orders"]]
+        rows = []
+        for row, order in enumerate(orders[start:stop].tolist()):
+            keys, values = plans[order]
+            extra = extras[row]
+            if extra is _MISSING:
+                rows.append(dict(zip(keys, [values[row] for values in values])))
+            else:
+                extra = json.loads(extra)
+                rows.append({key: extra[key] if key in extra else columns[key][row] for key in keys})
+        return rows
+
+    # Записи собираются по категориям, чтобы convert получал их сразу
+    materials = {}
+    position = 0
+    for category, size in header["categories"]:
+        if size is None:
+            materials[category] = None
+            continue
+        rows = category_rows(position, position + size)
+        materials[category] = rows if convert is None else [convert(material) for material in rows]
+        position += size
+    return materials
+
+def _numeric_values(values: np.ndarray, kinds: np.ndarray) -> list:
+    if (kinds == VALUE).all():
+        return values.tolist()
+    return [
+        value if kind == VALUE else int(value) if kind == INT else None if kind == NULL else _MISSING
+        for value, kind in zip(values.tolist(), kinds.tolist())
+    ]
+
+def _string_values(field: str, text: str, starts: np.ndarray, lengths: np.ndarray, kinds: np.ndarray) -> list:
+    values = [
+        text[start:end] if kind == VALUE else None if kind == NULL else _MISSING
+        for start, end, kind in zip(starts.tolist(), (starts + lengths).tolist(), kinds.tolist())
+    ]
+    if field == "tags":
+        return [value if value is _MISSING else value.split(_TAG_SEPARATOR) if value else [] for value in values]
+    return values
+
+def _numeric_kind(value) -> Optional[int]:
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, float):
+        return VALUE
+    if isinstance(value, int) and abs(value) <= _MAX_EXACT_INT:
+        return INT
+    return None
+
+def _string_value(field: str, value) -> Tuple[Optional[int], str]:
+    if field == "tags":
+        if isinstance(value, list) and all(isinstance(tag, str) and tag and _TAG_SEPARATOR not in tag for tag in value):
+            return VALUE, _TAG_SEPARATOR.join(value)
+        return None, ""
+    if value is None:
+        return NULL, ""
+    if isinstance(value, str):
+        return VALUE, value
+    return None, ""
@@ -1,11 +1,166 @@
 import re
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Словарь единиц измерения по типам параметров
+UNIT_VOCABULARY = {
+    'pressure': ['kPa', 'MPa', 'Pa', 'bar', 'psi'],
+    'pressure_drop': ['Pa/m', 'kPa/m', 'MPa/m', 'bar/m'],
+    'temperature': ['°C', 'K', '°F'],
+    'mass': ['kg', 'g', 'mg', 't'],
+    'cost': ['$', '€', '£', 'USD', 'EUR', 'GBP'],
+    'length': ['m', 'cm', 'mm', 'in', 'ft'],
+    'time': ['s', 'min', 'h', 'hr'],
+    'volume': ['L', 'ml', 'm³', 'cm³'],
+    'density': ['kg/m³', 'g/cm³'],
+    'thermal_conductivity': ['W/m·K', 'W/mK', 'W/(m·K)'],
+    'electrical_conductivity': ['S/m', 'Ω·m'],
+    'strength': ['MPa', 'GPa', 'N/m²'],
+    'hardness': ['HV', 'HRC', 'HB']
+}
+
+OPERATORS = {
+    '≤': 'less_equal',
+    '≥': 'greater_equal',
+    '<=': 'less_equal',
+    '>=': 'greater_equal',
+    '<': 'less',
+    '>': 'greater',
+    '=': 'equal',
+    '==': 'equal',
+    '–': 'range',  # en dash
+    '—': 'range',  # em dash
+    '-': 'range'   # hyphen
+}
+
+# Единица -> (размерность, масштаб, смещение): значение_СИ = значение * масштаб + смещение
+UNIT_REGISTRY: Dict[str, Tuple[str, float, float]] = {
+    'Pa': ('pressure', 1.0, 0.0),
+    'kPa': ('pressure', 1e3, 0.0),
+    'MPa': ('pressure', 1e6, 0.0),
+    'GPa': ('pressure', 1e9, 0.0),
+    'bar': ('pressure', 1e5, 0.0),
+    'psi': ('pressure', 6894.757293168, 0.0),
+    'N/m²': ('pressure', 1.0, 0.0),
+    'Pa/m': ('pressure_drop', 1.0, 0.0),
+    'kPa/m': ('pressure_drop', 1e3, 0.0),
+    'MPa/m': ('pressure_drop', 1e6, 0.0),
+    'bar/m': ('pressure_drop', 1e5, 0.0),
+    'K': ('temperature', 1.0, 0.0),
+    '°C': ('temperature', 1.0, 273.15),
+    'C': ('temperature', 1.0, 273.15),
+    '°F': ('temperature', 5 / 9, 273.15 - 32 * 5 / 9),
+    'F': ('temperature', 5 / 9, 273.15 - 32 * 5 / 9),
+    'kg': ('mass', 1.0, 0.0),
+    'g': ('mass', 1e-3, 0.0),
+    'mg': ('mass', 1e-6, 0.0),
+    't': ('mass', 1e3, 0.0),
+    'm': ('length', 1.0, 0.0),
+    'cm': ('length', 1e-2, 0.0),
+    'mm': ('length', 1e-3, 0.0),
+    'in': ('length', 0.0254, 0.0),
+    'ft': ('length', 0.3048, 0.0),
+    's': ('time', 1.0, 0.0),
+    'min': ('time', 60.0, 0.0),
+    'h': ('time', 3600.0, 0.0),
+    'hr': ('time', 3600.0, 0.0),
+    'm³': ('volume', 1.0, 0.0),
+    'L': ('volume', 1e-3, 0.0),
+    'ml': ('volume', 1e-6, 0.0),
+    'cm³': ('volume', 1e-6, 0.0),
+    'kg/m³': ('density', 1.0, 0.0),
+    'g/cm³': ('density', 1e3, 0.0),
+    'W/m·K': ('thermal_conductivity', 1.0, 0.0),
+    'W/mK': ('thermal_conductivity', 1.0, 0.0),
+    'W/(m·K)': ('thermal_conductivity', 1.0, 0.0),
+    'S/m': ('electrical_conductivity', 1.0, 0.0),
+    'Ω·m': ('electrical_resistivity', 1.0, 0.0),
+    # Шкалы твердости и валюты между собой не пересчитываются
+    'HV': ('hardness_vickers', 1.0, 0.0),
+    'HRC': ('hardness_rockwell_c', 1.0, 0.0),
+    'HB': ('hardness_brinell', 1.0, 0.0),
+    'USD': ('cost_usd', 1.0, 0.0),
+    '$': ('cost_usd', 1.0, 0.0),
+    'EUR': ('cost_eur', 1.0, 0.0),
+    '€': ('cost_eur', 1.0, 0.0),
+    'GBP': ('cost_gbp', 1.0, 0.0),
+    '£': ('cost_gbp', 1.0, 0.0),
+}
+
+# Единица СИ для каждой размерности
+SI_UNITS = {
+    dimension: unit
+    for unit, (dimension, scale, offset) in reversed(list(UNIT_REGISTRY.items()))
+    if scale == 1.0 and offset == 0.0
+}
+
+def unit_dimension(unit: str) -> Optional[str]:
+    """Размерность единицы или None для неизвестной единицы"""
+    entry = UNIT_REGISTRY.get(unit)
+    return entry[0] if entry else None
+
+def to_si(value, unit: str):
+    """Перевод значения (или массива NumPy) в СИ; неизвестные единицы не меняют значение"""
+    entry = UNIT_REGISTRY.get(unit)
+    if entry is None:
+        return value
+    _, scale, offset = entry
+    return value * scale + offset
+
+def from_si(value, unit: str):
+    """Перевод значения (или массива NumPy) из СИ в заданную единицу"""
+    entry = UNIT_REGISTRY.get(unit)
+    if entry is None:
+        return value
+    _, scale, offset = entry
+    return (value - offset) / scale
+
+def convert_unit(value, from_unit: str, to_unit: str):
+    """Конвертация между единицами одной размерности; иначе значение не меняется"""
+    if from_unit == to_unit:
+        return value
+    source = UNIT_REGISTRY.get(from_unit)
+    target = UNIT_REGISTRY.get(to_unit)
+    if source is None or target is None or source[0] != target[0]:
+        return value
+    return ((value * source[1] + source[2]) - target[2]) / target[1]
+
+def _alternation(options) -> str:
+    """Альтернатива регулярного выражения, длинные варианты первыми"""
+    return '|'.join(re.escape(option) for option in sorted(set(options), key=len, reverse=True))
+
+# Десятичная запятая допускается ("1,5"); запятая перед ровно тремя цифрами
+# ("1,000") может быть разделителем тысяч, и такое ограничение не разбирается.
+# Число не может продолжаться цифрой или разделителем ("1.5.3", "1,000,000")
+_NUMBER = r'(?:\d+(?:\.\d*|,(?!\d{3}(?!\d))\d+)?|\.\d+)(?:[eE][-+]?\d+)?(?![.,]?\d)'
+
+# Слово имени параметра: начинается не внутри другого слова и ограничено по
+# длине, иначе поиск по длинному слову без оператора становится квадратичным
+_NAME_WORD = r'(?<![^\W\d])[^\W\d]{1,48}'
+
+def _compile_clause_pattern(units) -> re.Pattern:
+    """Одно регулярное выражение для ограничения: имя, оператор или диапазон, значение, единица"""
+    # Единица не должна быть началом слова ("m" в "mass"), поэтому после нее
+    # не допускается буква
+    unit = r'(?:' + _alternation(units) + r')(?![^\W\d])'
+    operator = _alternation(op for op, name in OPERATORS.items() if name != 'range')
+    return re.compile(
+        r'(?P<name>' + _NAME_WORD + r'(?:[ \t]+' + _NAME_WORD + r'){0,6}?)[ \t]*'
+        r'(?:(?P<op>' + operator + r')[ \t]*(?P<prefix>' + unit + r')?[ \t]*(?P<value>-?[ \t]*' + _NUMBER + r')'
+        r'|(?P<low>-?[ \t]*' + _NUMBER + r')[ \t]*[–—-][ \t]*(?P<high>-?[ \t]*' + _NUMBER + r'))'
+        r'[ \t]*(?P<unit>' + unit + r')?'
+    )
+
+_CLAUSE_RE = _compile_clause_pattern(
+    [unit for units in UNIT_VOCABULARY.values() for unit in units] + list(UNIT_REGISTRY)
+)
+
+@dataclass(frozen=True)
 class ParameterConstraint:
     name: str
     operator: str
@@ -15,32 +170,15 @@ class ParameterConstraint:
     range_max: Optional[float] = None
 
 class ParameterParser:
-    def __init__(self):
-        self.unit_patterns = {
-            'pressure': r'(kPa|MPa|Pa|bar|psi)',
-            'temperature': r'(°C|K|°F)',
-            'mass': r'(kg|g|mg)',
-            'cost': r'(\$|€|£|USD|EUR|GBP)',
-            'length': r'(m|cm|mm|in|ft)',
-            'time': r'(s|min|h|hr)',
-            'volume': r'(L|ml|m³|cm³)',
-            'density': r'(kg/m³|g/cm³)',
-            'thermal_conductivity': r'(W/m·K|W/mK)',
-            'electrical_conductivity': r'(S/m|Ω·m)',
-            'strength': r'(MPa|GPa|N/m²)',
-            'hardness': r'(HV|HRC|HB)'
-        }
-        
-        self.operator_patterns = {
-            '≤': 'less_equal',
-            '≥': 'greater_equal',
-            '<': 'less',
-            '>': 'greater',
-            '=': 'equal',
-            '==': 'equal',
-            '–': 'range',  # en dash
-            '-': 'range'   # hyphen
-        }
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[ParameterConstraint, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.unit_patterns = UNIT_VOCABULARY
+        self.operator_patterns = OPERATORS
         
         self.parameter_mapping = {
             'pressure drop': 'pressure',
@@ -52,73 +190,113 @@ class ParameterParser:
             'thermal conductivity': 'thermal_conductivity',
             'electrical conductivity': 'electrical_conductivity',
             'strength': 'strength',
-            'hardness': 'hardness'
+            'hardness': 'hardness',
+            'pressure': 'pressure',
+            'temperature': 'temperature',
+            'max temperature': 'max_temp',
+            'maximum temperature': 'max_temp',
+            'temp max': 'max_temp',
+            'young modulus': 'young_modulus',
+            'elastic modulus': 'young_modulus',
+            'yield strength': 'yield_strength',
+            'λ': 'thermal_conductivity',
+            'ρ': 'density'
         }
+        # Нормализованное имя -> параметр: синонимы и канонические имена с пробелами
+        self._name_lookup = {name.replace('_', ' '): name for name in self.parameter_mapping.values()}
+        self._name_lookup.update(self.parameter_mapping)
+        self._name_lookup.update({name.replace(' ', '_'): parameter for name, parameter in self._name_lookup.items()})
+
+    def parse_query(self, query: str) -> Tuple[ParameterConstraint, ...]:
+        """Парсинг параметрического запроса с LRU-кэшем по нормализованному тексту"""
+        key = _normalize_query(query)
+        if self.cache_size <= 0:
+            return self._parse_uncached(key)
 
-    def parse_query(self, query: str) -> List[ParameterConstraint]:
-        """Парсинг параметрического запроса"""
+        with self._cache_lock:
+            constraints = self._cache.get(key)
+            if constraints is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return constraints
+            self.cache_misses += 1
+
+        constraints = self._parse_uncached(key)
+
+        with self._cache_lock:
+            self._cache[key] = constraints
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.cache_evictions += 1
+        return constraints
+
+    def cache_info(self) -> Dict:
+        """Статистика кэша разбора запросов"""
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "evictions": self.cache_evictions,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+                "hit_rate": self.cache_hits / lookups if lookups else 0.0
+            }
+
+    def clear_cache(self):
+        """Очистка кэша и счетчиков"""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = self.cache_misses = self.cache_evictions = 0
+
+    def _parse_uncached(self, query: str) -> Tuple[ParameterConstraint, ...]:
+        """Парсинг параметрического запроса за один проход.
+
+        Ограничения ищутся одним скомпилированным выражением по всему тексту,
+        поэтому строки, ';' и 'AND' между ними одинаково работают как разделители.
+        """
         constraints = []
-        
-        # Разбиваем запрос на строки
-        lines = [line.strip() for line in query.split('\n') if line.strip()]
-        
-        for line in lines:
+        for match in _CLAUSE_RE.finditer(query):
             try:
-                # Удаляем маркеры списка и лишние пробелы
-                line = re.sub(r'^[-•*]\s*', '', line)
-                
-                # Парсим параметр
-                constraint = self._parse_line(line)
+                constraint = self._build_constraint(match)
                 if constraint:
                     constraints.append(constraint)
             except Exception as e:
-                logger.error(f"Ошибка при парсинге строки '{line}': {str(e)}")
-                continue
-        
-        return constraints
+                logger.error(f"Ошибка при разборе ограничения '{match.group()}': {str(e)}")
+        return tuple(constraints)
 
-    def _parse_line(self, line: str) -> Optional[ParameterConstraint]:
-        """Парсинг одной строки с параметром"""
-        # Ищем оператор
-        operator = None
-        operator_pos = -1
-        for op in self.operator_patterns.keys():
-            pos = line.find(op)
-            if pos != -1 and (operator_pos == -1 or pos < operator_pos):
-                operator = op
-                operator_pos = pos
-        
-        if not operator:
-            return None
-            
-        # Разделяем на имя параметра и значение
-        parts = line.split(operator)
-        if len(parts) != 2:
-            return None
-            
-        param_name = parts[0].strip().lower()
-        value_part = parts[1].strip()
-        
-        # Нормализуем имя параметра
-        normalized_name = self._normalize_parameter_name(param_name)
-        if not normalized_name:
-            return None
-            
-        # Парсим значение и единицу измерения
-        value, unit = self._parse_value_and_unit(value_part)
-        if value is None:
-            return None
-            
-        # Обработка диапазона значений
-        range_min = None
-        range_max = None
-        if self.operator_patterns[operator] == 'range':
-            range_min, range_max = value
-        
+    def _build_constraint(self, match: re.Match) -> Optional[ParameterConstraint]:
+        """Преобразование совпадения _CLAUSE_RE в ParameterConstraint"""
+        # Перед именем могут оказаться посторонние слова ("AND", хвост единицы
+        # "Pa/m", артикли) - берем самый длинный известный суффикс
+        name_text, op, value, prefix, unit, low, high = match.group(
+            'name', 'op', 'value', 'prefix', 'unit', 'low', 'high'
+        )
+        name = self._name_lookup.get(name_text)
+        if not name:
+            words = name_text.lower().replace('_', ' ').split()
+            for start in range(len(words)):
+                name = self._name_lookup.get(' '.join(words[start:]))
+                if name:
+                    break
+            if not name:
+                return None
+
+        unit = unit or prefix or ''
+        if op:
+            return ParameterConstraint(
+                name=name,
+                operator=OPERATORS[op],
+                value=_to_float(value),
+                unit=unit
+            )
+
+        range_min, range_max = sorted((_to_float(low), _to_float(high)))
         return ParameterConstraint(
-            name=normalized_name,
-            operator=self.operator_patterns[operator],
-            value=value if not isinstance(value, tuple) else value[1],
+            name=name,
+            operator='range',
+            value=range_max,
             unit=unit,
             range_min=range_min,
             range_max=range_max
@@ -126,66 +304,57 @@ class ParameterParser:
 
     def _normalize_parameter_name(self, name: str) -> Optional[str]:
         """Нормализация имени параметра"""
-        name = name.lower().strip()
-        return self.parameter_mapping.get(name)
-
-    def _parse_value_and_unit(self, text: str) -> Tuple[Optional[float], str]:
-        """Парсинг значения и единицы измерения"""
-        # Удаляем все пробелы
-        text = text.replace(' ', '')
-        
-        # Ищем число
-        number_match = re.search(r'[-+]?\d*\.?\d+', text)
-        if not number_match:
-            return None, ''
-            
-        value = float(number_match.group())
-        
-        # Ищем единицу измерения
-        unit = ''
-        for param_type, pattern in self.unit_patterns.items():
-            unit_match = re.search(pattern, text)
-            if unit_match:
-                unit = unit_match.group()
-                break
-                
-        return value, unit
+        return self._name_lookup.get(' '.join(name.lower().replace('_', ' ').split()))
 
     def convert_unit(self, value: float, from_unit: str, to_unit: str) -> float:
         """Конвертация единиц измерения"""
-        # Таблица конвертации для основных единиц
-        conversion_table = {
-            'pressure': {
-                'kPa': {'Pa': 1000, 'MPa': 0.001, 'bar': 0.01, 'psi': 0.145038},
-                'MPa': {'kPa': 1000, 'Pa': 1000000, 'bar': 10, 'psi': 145.038},
-                'Pa': {'kPa': 0.001, 'MPa': 0.000001, 'bar': 0.00001, 'psi': 0.000145038},
-                'bar': {'kPa': 100, 'MPa': 0.1, 'Pa': 100000, 'psi': 14.5038},
-                'psi': {'kPa': 6.89476, 'MPa': 0.00689476, 'Pa': 6894.76, 'bar': 0.0689476}
-            },
-            'temperature': {
-                '°C': {'K': lambda x: x + 273.15, '°F': lambda x: x * 9/5 + 32},
-                'K': {'°C': lambda x: x - 273.15, '°F': lambda x: (x - 273.15) * 9/5 + 32},
-                '°F': {'°C': lambda x: (x - 32) * 5/9, 'K': lambda x: (x - 32) * 5/9 + 273.15}
-            },
-            'mass': {
-                'kg': {'g': 1000, 'mg': 1000000},
-                'g': {'kg': 0.001, 'mg': 1000},
-                'mg': {'kg': 0.000001, 'g': 0.001}
-            }
-        }
-        
-        # Определяем тип параметра
-        param_type = None
-        for type_name, units in conversion_table.items():
-            if from_unit in units and to_unit in units[from_unit]:
-                param_type = type_name
-                break
-                
-        if not param_type:
-            return value
-            
-        # Выполняем конвертацию
-        if param_type == 'temperature':
-            return conversion_table[param_type][from_unit][to_unit](value)
-        else:
-            return value * conversion_table[param_type][from_unit][to_unit] 
\ No newline at end of file
+        return convert_unit(value, from_unit, to_unit)
+
+class UnitConverter:
+    """Строгая конвертация единиц по отдельным величинам (на основе UNIT_REGISTRY)"""
+
+    def convert(self, value: float, from_unit: str, to_unit: str, dimension: Optional[str] = None) -> float:
+        """Конвертация с проверкой единиц; ValueError для неизвестных или несовместимых единиц"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Invalid value: {value!r}")
+        for unit in (from_unit, to_unit):
+            if unit not in UNIT_REGISTRY:
+                raise ValueError(f"Invalid unit: {unit}")
+        source_dimension = unit_dimension(from_unit)
+        target_dimension = unit_dimension(to_unit)
+        if source_dimension != target_dimension or (dimension and source_dimension != dimension):
+            raise ValueError(f"Incompatible units: {from_unit} -> {to_unit}")
+        return convert_unit(value, from_unit, to_unit)
+
+    def convert_pressure_drop(self, value: float, from_unit: str, to_unit: str) -> float:
+        return _round_significant(self.convert(value, from_unit, to_unit, 'pressure_drop'))
+
+    def convert_temperature(self, value: float, from_unit: str, to_unit: str) -> float:
+        return round(self.convert(value, from_unit, to_unit, 'temperature'), 2)
+
+    def convert_mass(self, value: float, from_unit: str, to_unit: str) -> float:
+        return _round_significant(self.convert(value, from_unit, to_unit, 'mass'))
+
+    def is_valid_pressure_drop_unit(self, unit: str) -> bool:
+        return unit_dimension(unit) == 'pressure_drop'
+
+    def is_valid_temperature_unit(self, unit: str) -> bool:
+        return unit_dimension(unit) == 'temperature'
+
+    def is_valid_mass_unit(self, unit: str) -> bool:
+        return unit_dimension(unit) == 'mass'
+
+def _round_significant(value: float, digits: int = 12) -> float:
+    """Отбрасывание погрешности двоичной арифметики (1000 / 0.001 -> 1000000.0)"""
+    return float(f"{value:.{digits}g}")
+
+def _normalize_query(query: str) -> str:
+    """Ключ кэша: строки без крайних пробелов, повторные пробелы схлопнуты"""
+    return '\n'.join(' '.join(line.split()) for line in query.splitlines() if line.strip())
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        # Пробел после знака ("- 5") или десятичная запятая ("1,5")
+        return float(text.replace(' ', '').replace('\t', '').replace(',', '.'))
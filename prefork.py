@@ -0,0 +1,95 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Минимальный интервал между перезапусками упавшего воркера, секунды
+RESTART_DELAY = 1.0
+
+def fork_supported() -> bool:
+    """Доступен ли os.fork (на Windows его нет)"""
+    return hasattr(os, "fork")
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Слушающий сокет, открытый до fork и общий для всех воркеров"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+def run_workers(target: Callable[[], None], workers: int) -> None:
+    """Запуск `workers` дочерних процессов с `target` и наблюдение за ними.
+
+    Все, что загружено в родителе до вызова, воркеры получают через fork и
+    делят страницы памяти, пока не изменяют их (copy-on-write). Перед fork
+    объекты переносятся в постоянное поколение сборщика мусора (gc.freeze),
+    чтобы его проходы в воркерах не копировали эти страницы. Упавший воркер
+    перезапускается; SIGINT/SIGTERM пересылаются воркерам, после их
+    завершения функция возвращает управление.
+    """
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(slot: int):
+        pid = os.fork()
+        if pid == 0:
+            # Воркер: обработчики сигналов родителя не наследуются
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                target()
+            except BaseException as e:
+                logger.error(f"Воркер {os.getpid()} завершился с ошибкой: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = slot
+        logger.info(f"Запущен воркер {slot} (pid {pid})")
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    previous = {sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for slot in range(workers):
+            spawn(slot)
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = children.pop(pid, None)
+            if slot is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if stopping or code == 0:
+                logger.info(f"Воркер {slot} (pid {pid}) завершен")
+                continue
+            logger.warning(f"Воркер {slot} (pid {pid}) аварийно завершился ({code}), перезапуск")
+            time.sleep(RESTART_DELAY)
+            if not stopping:
+                spawn(slot)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        gc.unfreeze()
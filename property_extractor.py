@@ -0,0 +1,196 @@
+import logging
+import re
+from typing import Dict, Optional, Tuple
+
+from parameter_parser import SI_UNITS, UNIT_REGISTRY, UNIT_VOCABULARY, _alternation, to_si, unit_dimension
+
+logger = logging.getLogger(__name__)
+
+# Названия свойств в тексте -> (параметр, допустимые размерности единиц)
+PROPERTY_KEYWORDS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "thermal conductivity": ("thermal_conductivity", ("thermal_conductivity",)),
+    "λ": ("thermal_conductivity", ("thermal_conductivity",)),
+    "density": ("density", ("density",)),
+    "ρ": ("density", ("density",)),
+    "young's modulus": ("young_modulus", ("pressure",)),
+    "young’s modulus": ("young_modulus", ("pressure",)),
+    "youngs modulus": ("young_modulus", ("pressure",)),
+    "young modulus": ("young_modulus", ("pressure",)),
+    "elastic modulus": ("young_modulus", ("pressure",)),
+    "modulus of elasticity": ("young_modulus", ("pressure",)),
+    "yield strength": ("strength", ("pressure",)),
+    "yield stress": ("strength", ("pressure",)),
+    "strength": ("strength", ("pressure",)),
+    "tensile strength": ("tensile_strength", ("pressure",)),
+    "compressive strength": ("compressive_strength", ("pressure",)),
+    "flexural strength": ("flexural_strength", ("pressure",)),
+    "hardness": ("hardness", ("hardness_vickers", "hardness_rockwell_c", "hardness_brinell")),
+    "maximum service temperature": ("max_temp", ("temperature",)),
+    "service temperature": ("max_temp", ("temperature",)),
+    "operating temperature": ("max_temp", ("temperature",)),
+    "maximum temperature": ("max_temp", ("temperature",)),
+    "max temperature": ("max_temp", ("temperature",)),
+    "melting point": ("melting_point", ("temperature",)),
+    "melting temperature": ("melting_point", ("temperature",)),
+    "electrical conductivity": ("electrical_conductivity", ("electrical_conductivity",)),
+    "cost": ("cost", ("cost_usd", "cost_eur", "cost_gbp")),
+    "price": ("cost", ("cost_usd", "cost_eur", "cost_gbp")),
+}
+
+# Написания единиц, встречающиеся в статьях, -> единицы UNIT_REGISTRY
+TEXT_UNIT_ALIASES = {
+    "g/cm3": "g/cm³",
+    "g cm-3": "g/cm³",
+    "g cm−3": "g/cm³",
+    "g/cc": "g/cm³",
+    "kg/m3": "kg/m³",
+    "kg m-3": "kg/m³",
+    "kg m−3": "kg/m³",
+    "W/m K": "W/m·K",
+    "W/m-K": "W/m·K",
+    "W/(m K)": "W/(m·K)",
+    "W/(m*K)": "W/(m·K)",
+    "W m-1 K-1": "W/m·K",
+    "W m−1 K−1": "W/m·K",
+    "W·m−1·K−1": "W/m·K",
+    "ºC": "°C",
+    "℃": "°C",
+    "ºF": "°F",
+}
+
+# Размерности, которые имеют смысл для свойств материалов
+_PROPERTY_DIMENSIONS = {dimension for _, dimensions in PROPERTY_KEYWORDS.values() for dimension in dimensions}
+
+_TEXT_UNITS = {
+    unit: unit
+    for unit in list(UNIT_REGISTRY) + [unit for units in UNIT_VOCABULARY.values() for unit in units]
+    if unit_dimension(unit) in _PROPERTY_DIMENSIONS and unit not in ("C", "F")
+}
+_TEXT_UNITS.update(TEXT_UNIT_ALIASES)
+
+_CURRENCY_PREFIXES = ("$", "€", "£", "USD", "EUR", "GBP")
+
+_NUMBER = r'(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?(?:[eE][-+]?\d+)?'
+_SIGN = r'(?:(?<![\w.])[-−])?'
+
+# Значение (или диапазон) с единицей после числа либо валютой перед ним.
+# Число не может продолжать слово или другое число. Опережающая проверка
+# первого символа позволяет быстро пропускать обычный текст.
+_VALUE_RE = re.compile(
+    r'(?=[\d$€£UEG\-−])'
+    r'(?:(?P<currency>' + _alternation(_CURRENCY_PREFIXES) + r')[ \t]?(?P<price>' + _NUMBER + r')'
+    r'|(?<![\w.])(?P<value>' + _SIGN + _NUMBER + r')'
+    r'(?:[ \t]*[-–—][ \t]*(?P<high>' + _NUMBER + r')|[ \t]*±[ \t]*' + _NUMBER + r')?'
+    r'[ \t]*(?P<unit>' + _alternation(_TEXT_UNITS) + r'))(?![^\W\d])'
+)
+
+_KEYWORD_RE = re.compile(r'(?<!\w)(?:' + _alternation(PROPERTY_KEYWORDS) + r')(?!\w)', re.IGNORECASE)
+
+# Сколько символов перед значением просматривается в поисках названия свойства
+LOOKBACK = 80
+
+# Запас в конце буфера: значение с единицей у границы фрагмента может
+# продолжиться в следующем фрагменте
+_VALUE_MARGIN = 64
+
+class PropertyExtractor:
+    """Потоковое извлечение свойств материала из текста по фрагментам.
+
+    Хранит только необработанный хвост текста и `lookback` символов перед
+    ним, поэтому память не зависит от длины документа. Значения с единицами
+    ищутся одним проходом скомпилированного выражения; для каждого берется
+    ближайшее предшествующее название свойства не дальше `lookback` символов,
+    размерность единицы должна подходить свойству. Результат в СИ:
+    {"density": 2700.0, "density_unit": "kg/m³", ...}. Для каждого свойства
+    берется первое найденное значение, для диапазона - его середина.
+    """
+
+    def __init__(self, lookback: int = LOOKBACK):
+        self.lookback = lookback
+        self.properties: Dict = {}
+        self._buffer = ""
+        self._scanned = 0
+
+    def feed(self, chunk: str):
+        """Обработка очередного фрагмента текста"""
+        if chunk:
+            self._buffer += chunk
+            self._scan(final=False)
+
+    def close(self) -> Dict:
+        """Обработка остатка текста и итоговые свойства"""
+        self._scan(final=True)
+        self._buffer = ""
+        self._scanned = 0
+        return self.properties
+
+    def _scan(self, final: bool):
+        buffer = self._buffer
+        limit = len(buffer) if final else len(buffer) - _VALUE_MARGIN
+        if limit <= self._scanned:
+            return
+
+        scanned = limit
+        for match in _VALUE_RE.finditer(buffer, self._scanned):
+            if match.end() > limit:
+                # Значение у конца буфера разбирается после следующего фрагмента
+                scanned = match.start()
+                break
+            self._record(buffer, match)
+
+        # Оставляем необработанный хвост и окно для поиска названий свойств
+        keep_from = max(0, scanned - self.lookback)
+        self._buffer = buffer[keep_from:]
+        self._scanned = scanned - keep_from
+
+    def _record(self, text: str, match: re.Match):
+        unit = _TEXT_UNITS.get(match.group("unit")) if match.group("unit") else match.group("currency")
+        dimension = unit_dimension(unit)
+        if dimension is None:
+            return
+
+        parameter = _nearest_property(text, match.start(), dimension, self.lookback)
+        if parameter is None or parameter in self.properties:
+            return
+
+        value = _parse_value(match)
+        if value is None:
+            return
+        self.properties[parameter] = float(to_si(value, unit))
+        self.properties[f"{parameter}_unit"] = SI_UNITS.get(dimension, unit)
+
+def extract_properties(text: str, lookback: int = LOOKBACK) -> Dict:
+    """Извлечение свойств материала из текста (значения в СИ).
+
+    Время работы линейно по длине текста.
+    """
+    extractor = PropertyExtractor(lookback)
+    extractor.feed(text)
+    return extractor.close()
+
+def _nearest_property(text: str, position: int, dimension: str, lookback: int) -> Optional[str]:
+    """Ближайшее перед позицией название свойства с подходящей размерностью"""
+    window_start = max(0, position - lookback)
+    found = None
+    for keyword in _KEYWORD_RE.finditer(text, window_start, position):
+        parameter, dimensions = PROPERTY_KEYWORDS[keyword.group(0).lower()]
+        if dimension in dimensions:
+            found = parameter
+    return found
+
+def _parse_value(match: re.Match) -> Optional[float]:
+    try:
+        if match.group("price") is not None:
+            return _to_float(match.group("price"))
+        value = _to_float(match.group("value"))
+        if match.group("high") is not None:
+            high = _to_float(match.group("high"))
+            if high < value:
+                return None
+            value = (value + high) / 2
+        return value
+    except ValueError:
+        return None
+
+def _to_float(number: str) -> float:
+    return float(number.replace(",", "").replace("−", "-"))
@@ -0,0 +1,338 @@
+import logging
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from parameter_parser import ParameterConstraint, SI_UNITS, UNIT_REGISTRY, to_si, unit_dimension
+
+logger = logging.getLogger(__name__)
+
+# Числовые свойства materials.yaml и единицы, в которых они хранятся по умолчанию
+PROPERTY_COLUMNS = {
+    "λ": "W/m·K",
+    "ρ": "kg/m³",
+    "temp_max": "°C",
+    "E": "GPa",
+    "yield_strength": "MPa",
+    "hardness": "HV",
+    "cost": "USD",
+}
+
+# Колонки -> имена параметров в канонических словарях свойств
+COLUMN_PARAMETERS = {
+    "λ": "thermal_conductivity",
+    "ρ": "density",
+    "temp_max": "max_temp",
+    "E": "young_modulus",
+    "yield_strength": "strength",
+    "hardness": "hardness",
+    "cost": "cost",
+}
+
+# Имена параметров ParameterParser -> колонки
+CONSTRAINT_COLUMNS = {
+    "thermal_conductivity": "λ",
+    "density": "ρ",
+    "max_temp": "temp_max",
+    "young_modulus": "E",
+    "strength": "yield_strength",
+    "yield_strength": "yield_strength",
+    "hardness": "hardness",
+    "cost": "cost",
+}
+
+# Размерность -> код в колонках размерностей; 0 - нет значения или неизвестная единица
+DIMENSION_CODES = {
+    dimension: code
+    for code, dimension in enumerate(dict.fromkeys(entry[0] for entry in UNIT_REGISTRY.values()), start=1)
+}
+
+class PropertyStore:
+    """Колоночное представление числовых свойств локальной базы материалов.
+
+    Для каждого свойства хранятся исходные значения (`raw`, в единицах из
+    `<ключ>_unit` или PROPERTY_COLUMNS) и значения в СИ (`normalized`),
+    вычисленные один раз при загрузке или добавлении материала, и код
+    размерности единицы (`dimensions`, DIMENSION_CODES). Значения разных
+    размерностей (HV и HRC, USD и EUR) не сравниваются между собой.
+    Отсутствующие и нечисловые значения хранятся как NaN. По каждой колонке
+    поддерживается SortedColumnIndex для диапазонных запросов.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.rows: List[Tuple[str, int]] = []
+        self.units: List[Dict[str, str]] = []
+        self.raw = {key: np.full(capacity, np.nan) for key in PROPERTY_COLUMNS}
+        self.normalized = {key: np.full(capacity, np.nan) for key in PROPERTY_COLUMNS}
+        self.dimensions = {key: np.zeros(capacity, dtype=np.int16) for key in PROPERTY_COLUMNS}
+        self.rebuild_indexes()
+
+    @classmethod
+    def from_materials(cls, materials: Dict) -> "PropertyStore":
+        """Построение хранилища из словаря категорий materials.yaml.
+
+        Значения собираются в колонки целиком, а единицы приводятся
+        векторно - одной операцией на каждую встреченную единицу.
+        """
+        rows = [
+            (category, position, material)
+            for category, entries in materials.items()
+            for position, material in enumerate(entries or [])
+        ]
+        store = cls(capacity=max(len(rows), 1024))
+        size = len(rows)
+        for key in PROPERTY_COLUMNS:
+            raw = np.array([_as_float(material.get(key)) for _, _, material in rows], dtype=float).reshape(size)
+            units = np.array([stored_unit(material, key) for _, _, material in rows], dtype=object)
+            normalized = np.full(size, np.nan)
+            dimensions = np.zeros(size, dtype=np.int16)
+            for unit in set(units.tolist()):
+                mask = units == unit
+                normalized[mask] = to_si(raw[mask], unit)
+                dimensions[mask] = dimension_code(unit)
+            dimensions[np.isnan(raw)] = 0
+            store.raw[key][:size] = raw
+            store.normalized[key][:size] = normalized
+            store.dimensions[key][:size] = dimensions
+        store.rows = [(category, position) for category, position, _ in rows]
+        store.units = [_custom_units(material) for _, _, material in rows]
+        store.size = size
+        store.rebuild_indexes()
+        return store
+
+    def _grow(self):
+        capacity = len(self.raw["λ"]) * 2
+        for columns in (self.raw, self.normalized):
+            for key, values in columns.items():
+                grown = np.full(capacity, np.nan)
+                grown[:self.size] = values[:self.size]
+                columns[key] = grown
+        for key, values in self.dimensions.items():
+            grown = np.zeros(capacity, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.dimensions[key] = grown
+
+    def append(self, category: str, position: int, material: Dict, update_indexes: bool = True):
+        """Добавление строки для материала с обновлением индексов.
+
+        Пакет строк добавляется с update_indexes=False и одним вызовом
+        rebuild_indexes() в конце: каждая вставка в индекс копирует колонку.
+        """
+        row = self._append_row(category, position, material)
+        if not update_indexes:
+            return
+        for key, index in self.indexes.items():
+            index.insert(row, self.normalized[key][row])
+
+    def _append_row(self, category: str, position: int, material: Dict) -> int:
+        if self.size == len(self.raw["λ"]):
+            self._grow()
+
+        row = self.size
+        for key in PROPERTY_COLUMNS:
+            value = _as_float(material.get(key))
+            if value is None:
+                continue
+            unit = stored_unit(material, key)
+            self.raw[key][row] = value
+            self.normalized[key][row] = to_si(value, unit)
+            self.dimensions[key][row] = dimension_code(unit)
+
+        self.rows.append((category, position))
+        self.units.append(_custom_units(material))
+        self.size += 1
+        return row
+
+    def rebuild_indexes(self):
+        """Построение отсортированных индексов по всем колонкам"""
+        self.indexes = {key: SortedColumnIndex(self.normalized[key][:self.size]) for key in PROPERTY_COLUMNS}
+
+    def query(self, constraints: Iterable[ParameterConstraint]) -> List[Tuple[str, int]]:
+        """Материалы (категория, позиция), удовлетворяющие всем ограничениям"""
+        return [self.rows[row] for row in self.query_rows(constraints)]
+
+    def query_rows(self, constraints: Iterable[ParameterConstraint]) -> List[int]:
+        """Номера строк, удовлетворяющих всем ограничениям.
+
+        Каждое ограничение сводится к интервалу в СИ и оценивается бинарным
+        поиском по индексу; кандидаты берутся из самого селективного
+        ограничения и фильтруются по остальным колонкам. Строка подходит,
+        только если размерность ее единицы совпадает с размерностью
+        ограничения.
+        """
+        size = self.size
+        plans = []
+        for constraint in constraints:
+            key = CONSTRAINT_COLUMNS.get(constraint.name, constraint.name)
+            if key not in PROPERTY_COLUMNS:
+                return []
+            interval = constraint_interval(constraint)
+            code = dimension_code(constraint_unit(constraint))
+            if interval is None or not code:
+                return []
+            start, stop = self.indexes[key].bounds(interval)
+            if stop <= start:
+                return []
+            plans.append((stop - start, key, interval, code, start, stop))
+
+        if not plans:
+            return list(range(size))
+
+        plans.sort(key=lambda plan: plan[0])
+        _, key, _, code, start, stop = plans[0]
+        candidates = np.sort(self.indexes[key].slice(start, stop))
+        candidates = candidates[candidates < size]
+        candidates = candidates[self.dimensions[key][candidates] == code]
+        for _, key, interval, code, _, _ in plans[1:]:
+            mask = _interval_mask(self.normalized[key][candidates], interval) & (self.dimensions[key][candidates] == code)
+            candidates = candidates[mask]
+            if not len(candidates):
+                return []
+        return candidates.tolist()
+
+    def si_properties(self, row: int) -> Dict:
+        """Канонический словарь свойств строки: значения в СИ и единицы СИ"""
+        properties = {}
+        units = self.units[row]
+        for key, parameter in COLUMN_PARAMETERS.items():
+            value = self.normalized[key][row]
+            if not math.isnan(value):
+                properties[parameter] = float(value)
+                properties[f"{parameter}_unit"] = _si_unit(units.get(key, PROPERTY_COLUMNS[key]))
+        return properties
+
+    def display_properties(self, row: int) -> Dict:
+        """Исходные значения и единицы строки для отображения"""
+        properties = {}
+        units = self.units[row]
+        for key, parameter in COLUMN_PARAMETERS.items():
+            value = self.raw[key][row]
+            if not math.isnan(value):
+                properties[parameter] = {"value": float(value), "unit": units.get(key, PROPERTY_COLUMNS[key])}
+        return properties
+
+def stored_unit(material: Dict, key: str) -> str:
+    """Единица хранимого свойства: `<ключ>_unit` или единица колонки по умолчанию"""
+    return material.get(f"{key}_unit") or PROPERTY_COLUMNS[key]
+
+def parameter_unit(name: str) -> str:
+    """Единица по умолчанию для параметра без явной единицы"""
+    key = CONSTRAINT_COLUMNS.get(name)
+    return PROPERTY_COLUMNS[key] if key else ""
+
+def dimension_code(unit: str) -> int:
+    """Код размерности единицы для PropertyStore.dimensions (0 - неизвестная единица)"""
+    return DIMENSION_CODES.get(unit_dimension(unit), 0)
+
+def constraint_unit(constraint: ParameterConstraint) -> str:
+    """Единица ограничения: указанная в запросе, без нее - единица параметра по умолчанию"""
+    return constraint.unit or parameter_unit(constraint.name)
+
+def value_to_si(value: Optional[float], unit: str) -> float:
+    """Перевод значения в СИ; None - NaN"""
+    if value is None:
+        return math.nan
+    return to_si(value, unit)
+
+def constraint_interval(constraint: ParameterConstraint) -> Optional[Tuple[float, float, bool, bool]]:
+    """Ограничение в виде интервала (low, high, low_inclusive, high_inclusive) в СИ.
+
+    Интервал задан в размерности constraint_unit(constraint); сравнивать его
+    можно только со значениями той же размерности.
+    """
+    unit = constraint_unit(constraint)
+
+    if constraint.operator == "range":
+        low = value_to_si(constraint.range_min, unit)
+        high = value_to_si(constraint.range_max, unit)
+        return low, high, True, True
+
+    target = value_to_si(constraint.value, unit)
+    if constraint.operator == "less_equal":
+        return -math.inf, target, True, True
+    elif constraint.operator == "greater_equal":
+        return target, math.inf, True, True
+    elif constraint.operator == "less":
+        return -math.inf, target, True, False
+    elif constraint.operator == "greater":
+        return target, math.inf, False, True
+    elif constraint.operator == "equal":
+        return target, target, True, True
+
+    return None
+
+def canonicalize_properties(properties: Dict) -> Dict:
+    """Приведение словаря свойств (например, из веб-результата) к СИ.
+
+    Значение `<имя>` с необязательной единицей `<имя>_unit` заменяется
+    значением в СИ, а единица - единицей СИ, поэтому повторный вызов
+    ничего не меняет.
+    """
+    canonical = {}
+    for name, value in properties.items():
+        if name.endswith("_unit"):
+            continue
+        number = _as_float(value)
+        if number is None:
+            canonical[name] = value
+            continue
+        unit = properties.get(f"{name}_unit") or parameter_unit(name)
+        canonical[name] = float(to_si(number, unit))
+        if unit:
+            canonical[f"{name}_unit"] = _si_unit(unit)
+    return canonical
+
+def _si_unit(unit: str) -> str:
+    return SI_UNITS.get(unit_dimension(unit), unit)
+
+def _custom_units(material: Dict) -> Dict[str, str]:
+    """Единицы, явно заданные у материала (обычно пусто)"""
+    return {key: material.get(f"{key}_unit") for key in PROPERTY_COLUMNS if material.get(f"{key}_unit")}
+
+class SortedColumnIndex:
+    """Отсортированный индекс колонки: значения по возрастанию и номера строк"""
+
+    def __init__(self, values: np.ndarray):
+        rows = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[rows], kind="stable")
+        rows = rows[order]
+        # Значения и строки заменяются одним присваиванием, чтобы читатели
+        # никогда не видели их рассогласованными
+        self._data = (values[rows], rows)
+
+    def __len__(self) -> int:
+        return len(self._data[0])
+
+    def insert(self, row: int, value: float):
+        """Вставка значения с сохранением порядка"""
+        if math.isnan(value):
+            return
+        values, rows = self._data
+        pos = np.searchsorted(values, value, side="right")
+        self._data = (np.insert(values, pos, value), np.insert(rows, pos, row))
+
+    def bounds(self, interval: Tuple[float, float, bool, bool]) -> Tuple[int, int]:
+        """Диапазон позиций индекса, попадающих в интервал"""
+        low, high, low_inclusive, high_inclusive = interval
+        if math.isnan(low) or math.isnan(high):
+            return 0, 0
+        values = self._data[0]
+        start = np.searchsorted(values, low, side="left" if low_inclusive else "right")
+        stop = np.searchsorted(values, high, side="right" if high_inclusive else "left")
+        return int(start), int(stop)
+
+    def slice(self, start: int, stop: int) -> np.ndarray:
+        return self._data[1][start:stop]
+
+def _interval_mask(values: np.ndarray, interval: Tuple[float, float, bool, bool]) -> np.ndarray:
+    low, high, low_inclusive, high_inclusive = interval
+    above = values >= low if low_inclusive else values > low
+    below = values <= high if high_inclusive else values < high
+    return above & below
+
+def _as_float(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
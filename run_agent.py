@@ -1,8 +1,11 @@
 import asyncio
 import json
 import logging
+import os
 from pathlib import Path
 from creatoria_agent import MaterialsAgent, MaterialCategory
+from single_flight import SingleFlight
+from prefork import bind_socket, fork_supported, run_workers
 from fastapi import FastAPI, HTTPException
 import uvicorn
 from pydantic import BaseModel
@@ -28,10 +31,17 @@ class MaterialRequest(BaseModel):
 # Глобальный экземпляр агента
 agent = None
 
+# Одинаковые одновременные запросы выполняют один поиск
+search_flight = SingleFlight()
+
 @app.on_event("startup")
 async def startup_event():
     """Инициализация агента при запуске сервера"""
     global agent
+    if agent is not None:
+        # Агент загружен в родительском процессе до fork (serve_preloaded)
+        logger.info("Используется агент, загруженный до запуска воркеров")
+        return
     try:
         agent = MaterialsAgent()
         logger.info("Агент успешно инициализирован")
@@ -39,6 +49,14 @@ async def startup_event():
         logger.error(f"Ошибка при инициализации агента: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Сброс журнала материалов и закрытие соединений при остановке сервера"""
+    if agent:
+        if agent.materials_project:
+            await agent.materials_project.aclose()
+        agent.close()
+
 @app.post("/materials-webhook")
 async def materials_webhook(request: MaterialRequest):
     """Webhook для получения запросов от n8n"""
@@ -46,12 +64,14 @@ async def materials_webhook(request: MaterialRequest):
         if not agent:
             raise HTTPException(status_code=500, detail="Агент не инициализирован")
 
-        # Если есть параметрический запрос, используем его
-        if request.parameters:
-            results = await agent.search_by_parameters(request.parameters)
-        else:
+        async def run_search():
+            # Если есть параметрический запрос, используем его
+            if request.parameters:
+                return await agent.search_by_parameters(request.parameters)
             # Обычный поиск по ключевым словам
-            results = await agent.search_material(request.query, request.category)
+            return await agent.search_material(request.query, request.category)
+
+        results = await search_flight.do((request.query, request.category, request.parameters), run_search)
 
         # Генерация JSON для n8n
         n8n_json = agent.generate_n8n_json(request.category or "other")
@@ -77,6 +97,19 @@ async def health_check():
     """Проверка работоспособности сервера"""
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Счетчики кэшей и внутренних компонентов агента"""
+    if not agent:
+        raise HTTPException(status_code=500, detail="Агент не инициализирован")
+    metrics = {
+        "parameter_parser": agent.parameter_parser.cache_info(),
+        "single_flight": search_flight.stats()
+    }
+    if agent.web_searcher:
+        metrics["web_search"] = agent.web_searcher.stats()
+    return metrics
+
 async def run_agent_once():
     """Запуск агента для однократного поиска"""
     try:
@@ -90,14 +123,78 @@ async def run_agent_once():
     except Exception as e:
         logger.error(f"Ошибка при запуске агента: {e}")
 
+# Переменные окружения платформ (Heroku и др.), задающие порт и число воркеров
+PLATFORM_VARIABLES = {"PORT": "port", "WEB_CONCURRENCY": "workers"}
+
+def load_deployment(config_path: str = "config.json") -> Dict:
+    """Параметры запуска сервера из секции deployment конфигурации.
+
+    Переменные окружения DEPLOYMENT_<ПАРАМЕТР> (например, DEPLOYMENT_RELOAD=false),
+    а также PORT и WEB_CONCURRENCY переопределяют значения из файла.
+    """
+    deployment = {"host": "0.0.0.0", "port": 8000, "workers": 1, "reload": True, "preload": False}
+    try:
+        with open(config_path, "r") as f:
+            deployment.update(json.load(f).get("deployment", {}))
+    except FileNotFoundError:
+        logger.warning(f"Файл {config_path} не найден, используются параметры запуска по умолчанию")
+
+    variables = {f"DEPLOYMENT_{key.upper()}": key for key in deployment}
+    variables.update(PLATFORM_VARIABLES)
+    for variable, key in variables.items():
+        value = os.environ.get(variable)
+        if value:
+            deployment[key] = _deployment_value(deployment[key], value)
+    return deployment
+
+def _deployment_value(default, value: str):
+    """Значение из переменной окружения с типом значения по умолчанию"""
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    return value
+
+def serve_preloaded(host: str, port: int, workers: int):
+    """Запуск воркеров uvicorn с каталогом, загруженным один раз до fork.
+
+    Родитель разбирает materials.yaml и строит индексы, затем открывает
+    сокет и запускает воркеры. Воркеры делят эти данные как copy-on-write
+    страницы и не загружают их заново; браузеры Selenium и HTTP-клиенты
+    каждый воркер открывает сам при первом запросе.
+    """
+    global agent
+    agent = MaterialsAgent()
+    logger.info(f"Каталог загружен, запуск воркеров: {workers}")
+
+    sock = bind_socket(host, port)
+
+    def serve():
+        config = uvicorn.Config(app, host=host, port=port)
+        uvicorn.Server(config).run(sockets=[sock])
+
+    try:
+        run_workers(serve, workers)
+    finally:
+        sock.close()
+
 def main():
     """Основная функция запуска"""
-    # Запуск FastAPI сервера
+    deployment = load_deployment()
+    host, port = deployment["host"], deployment["port"]
+    workers = deployment["workers"]
+
+    if deployment["preload"] and not deployment["reload"] and workers > 1 and fork_supported():
+        serve_preloaded(host, port, workers)
+        return
+
+    # Запуск FastAPI сервера; при reload uvicorn запускает один процесс
     uvicorn.run(
         "run_agent:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        host=host,
+        port=port,
+        reload=deployment["reload"],
+        workers=None if deployment["reload"] else workers
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+class _SqliteCache:
+    """Общая часть кэшей в SQLite: ленивое соединение на процесс и LRU-вытеснение по размеру"""
+
+    TABLE = ""
+    SCHEMA = ""
+
+    def __init__(self, path: Path, max_bytes: int, clock: Callable[[], float]):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({self.SCHEMA})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.TABLE}_accessed ON {self.TABLE} (accessed)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.TABLE} ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany(f"DELETE FROM {self.TABLE} WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+class SearchResultCache(_SqliteCache):
+    """Дисковый кэш результатов веб-поиска (SQLite).
+
+    Результаты хранятся как списки словарей в JSON. Ключ - хэш источника,
+    нормализованного запроса и категории. Запись свежая в течение TTL
+    источника, затем еще `stale_ttl` секунд может отдаваться как устаревшая
+    (stale-while-revalidate). Когда суммарный размер записей превышает
+    `max_bytes`, удаляются давно не читавшиеся. Соединение открывается
+    лениво и заново в каждом процессе.
+    """
+
+    TABLE = "results"
+    SCHEMA = "key TEXT PRIMARY KEY, source TEXT, payload TEXT, size INTEGER, created REAL, accessed REAL"
+
+    def __init__(self, path: Path, default_ttl: float = 86400, source_ttls: Optional[Dict[str, float]] = None,
+                 stale_ttl: float = 604800, max_bytes: int = 50 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        super().__init__(path, max_bytes, clock)
+        self.default_ttl = default_ttl
+        self.source_ttls = source_ttls or {}
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def ttl(self, source: str) -> float:
+        return self.source_ttls.get(source, self.default_ttl)
+
+    def get(self, source: str, query: str, category: Optional[str] = None) -> Optional[Tuple[List[Dict], bool]]:
+        """Результаты из кэша и признак свежести или None"""
+        key = cache_key(source, query, category)
+        now = self.clock()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT payload, created FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                payload, created = row
+                age = now - created
+                ttl = self.ttl(source)
+                if age > ttl + self.stale_ttl:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+                fresh = age <= ttl
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+            return json.loads(payload), fresh
+        except Exception as e:
+            logger.error(f"Ошибка чтения кэша поиска: {e}")
+            return None
+
+    def set(self, source: str, query: str, category: Optional[str], results: List[Dict]):
+        """Сохранение результатов источника"""
+        key = cache_key(source, query, category)
+        payload = json.dumps(results, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = self.clock()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, source, payload, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, source, payload, size, now, now)
+                )
+                self._evict(conn)
+        except Exception as e:
+            logger.error(f"Ошибка записи кэша поиска: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики кэша"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+class PageCache(_SqliteCache):
+    """Кэш разобранных страниц (заголовок, мета-описание, текст) по URL.
+
+    Запись используется без запросов в течение `ttl` секунд. После этого
+    страница с ETag или Last-Modified перепроверяется условным запросом, а
+    страница без валидаторов загружается заново.
+    """
+
+    TABLE = "pages"
+    SCHEMA = "key TEXT PRIMARY KEY, payload TEXT, etag TEXT, last_modified TEXT, size INTEGER, created REAL, accessed REAL"
+
+    def __init__(self, path: Path, ttl: float = 3600, max_bytes: int = 200 * 1024 * 1024,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(path, max_bytes, clock)
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Запись кэша: content, etag, last_modified и признак свежести fresh"""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT payload, etag, last_modified, created FROM pages WHERE key = ?", (url,)
+                ).fetchone()
+            if row is None:
+                return None
+            payload, etag, last_modified, created = row
+            return {
+                "content": json.loads(payload),
+                "etag": etag,
+                "last_modified": last_modified,
+                "fresh": self.clock() - created <= self.ttl
+            }
+        except Exception as e:
+            logger.error(f"Ошибка чтения кэша страниц: {e}")
+            return None
+
+    def set(self, url: str, content: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Сохранение разобранной страницы"""
+        payload = json.dumps(content, ensure_ascii=False)
+        now = self.clock()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (key, payload, etag, last_modified, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, payload, etag, last_modified, len(payload.encode("utf-8")), now, now)
+                )
+                self._evict(conn)
+        except Exception as e:
+            logger.error(f"Ошибка записи кэша страниц: {e}")
+
+    def touch(self, url: str, validated: bool = False):
+        """Отметка об использовании записи; validated - страница подтверждена сервером"""
+        now = self.clock()
+        try:
+            with self._lock:
+                if validated:
+                    self._connection().execute("UPDATE pages SET accessed = ?, created = ? WHERE key = ?", (now, now, url))
+                else:
+                    self._connection().execute("UPDATE pages SET accessed = ? WHERE key = ?", (now, url))
+        except Exception as e:
+            logger.error(f"Ошибка записи кэша страниц: {e}")
+
+    def record(self, outcome: str):
+        """Учет результата обращения: hit, revalidated или miss"""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict:
+        """Счетчики кэша и доля обращений без загрузки страницы"""
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.revalidated) / total if total else 0.0
+            }
+
+def cache_key(source: str, query: str, category: Optional[str] = None) -> str:
+    """Ключ записи: источник + нормализованный запрос + категория"""
+    normalized = _WHITESPACE_RE.sub(" ", query.strip().lower())
+    return hashlib.sha256(f"{source}\0{normalized}\0{category or ''}".encode("utf-8")).hexdigest()
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Объединение одинаковых одновременных асинхронных вызовов.
+
+    Пока вызов с ключом выполняется, повторные вызовы с тем же ключом не
+    запускают функцию, а ждут тот же результат (или то же исключение).
+    Вызов выполняется в отдельной задаче, поэтому отмена одного из ожидающих
+    не прерывает его для остальных. Результат общий для всех ожидающих.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+        else:
+            self.shared += 1
+            logger.info(f"Запрос {key} присоединен к уже выполняющемуся")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики выполненных и объединенных вызовов"""
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "shared": self.shared
+        }
@@ -0,0 +1,115 @@
+import threading
+import unittest
+
+from driver_pool import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return "about:blank"
+
+    def quit(self):
+        self.closed = True
+
+
+class TestWebDriverPool(unittest.TestCase):
+    def setUp(self):
+        self.drivers = []
+
+        def factory():
+            driver = FakeDriver()
+            self.drivers.append(driver)
+            return driver
+
+        self.factory = factory
+
+    def test_lazy_creation_and_reuse(self):
+        pool = WebDriverPool(self.factory, size=2)
+        self.assertEqual(self.drivers, [])
+
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats()["created"], 1)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_warm_up(self):
+        pool = WebDriverPool(self.factory, size=3)
+        pool.warm_up(2)
+        self.assertEqual(len(self.drivers), 2)
+        self.assertEqual(pool.stats()["idle"], 2)
+
+    def test_recycle_after_max_pages(self):
+        pool = WebDriverPool(self.factory, size=1, max_pages=2)
+        for _ in range(3):
+            with pool.checkout():
+                pass
+
+        self.assertEqual(len(self.drivers), 2)
+        self.assertTrue(self.drivers[0].closed)
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+    def test_recycle_after_crash(self):
+        pool = WebDriverPool(self.factory, size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.checkout():
+                raise RuntimeError("tab crashed")
+
+        with pool.checkout() as driver:
+            self.assertIs(driver, self.drivers[1])
+        self.assertTrue(self.drivers[0].closed)
+
+    def test_unhealthy_idle_driver_is_replaced(self):
+        pool = WebDriverPool(self.factory, size=1)
+        with pool.checkout() as driver:
+            pass
+        driver.alive = False
+
+        with pool.checkout() as replacement:
+            self.assertIsNot(replacement, driver)
+        self.assertTrue(driver.closed)
+
+    def test_checkout_is_bounded(self):
+        pool = WebDriverPool(self.factory, size=1)
+        with pool.checkout():
+            with self.assertRaises(TimeoutError):
+                with pool.checkout(timeout=0.05):
+                    pass
+
+    def test_concurrent_checkouts_get_distinct_drivers(self):
+        pool = WebDriverPool(self.factory, size=3)
+        barrier = threading.Barrier(3)
+        seen = []
+
+        def worker():
+            with pool.checkout() as driver:
+                seen.append(driver)
+                barrier.wait(timeout=1)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(driver) for driver in seen}), 3)
+
+    def test_close_quits_idle_drivers(self):
+        pool = WebDriverPool(self.factory, size=2)
+        pool.warm_up()
+        pool.close()
+        self.assertTrue(all(driver.closed for driver in self.drivers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from html_text import extract_page, iter_chunks
+from property_extractor import PropertyExtractor
+
+PAGE = """<!DOCTYPE html>
+<html><head>
+<title>Alumina &amp; zirconia datasheet</title>
+<meta name="Description" content="Properties of technical ceramics">
+<style>body { color: red; }</style>
+<script>var density = "9.99 g/cm³";</script>
+</head>
+<body>
+<nav><a href="/">Home</a> <nav><a href="/x">Nested</a></nav> Products</nav>
+<h1>Alumina</h1>
+<p>Alumina has a density of 3.95 g/cm³ and a thermal
+   conductivity of 30 W/m·K.</p>
+<img src="a.png"/><svg/><p>Hardness 1500 HV.</p>
+<footer>Copyright 2026, density 1 g/cm³</footer>
+</body></html>"""
+
+
+class TestExtractPage(unittest.TestCase):
+    def test_title_description_and_text(self):
+        page = extract_page([PAGE])
+
+        self.assertEqual(page["title"], "Alumina & zirconia datasheet")
+        self.assertEqual(page["description"], "Properties of technical ceramics")
+        self.assertIn("Alumina has a density of 3.95 g/cm³ and a thermal conductivity of 30 W/m·K.", page["text"])
+        self.assertIn("Hardness 1500 HV.", page["text"])
+        for skipped in ("color: red", "9.99", "Home", "Nested", "Products", "Copyright"):
+            self.assertNotIn(skipped, page["text"])
+
+    def test_chunked_input_gives_same_result(self):
+        whole = extract_page([PAGE])
+        for size in (1, 7, 100):
+            self.assertEqual(extract_page(iter_chunks(PAGE, size)), whole)
+
+    def test_text_is_capped(self):
+        html = "<p>" + "word " * 10000 + "</p><p>tail</p>"
+        page = extract_page(iter_chunks(html, 1024), max_text_bytes=100)
+        self.assertLessEqual(len(page["text"].encode("utf-8")), 100)
+        self.assertNotIn("tail", page["text"])
+
+    def test_text_chunks_feed_property_extraction(self):
+        extractor = PropertyExtractor()
+        extract_page(iter_chunks(PAGE, 16), on_text=extractor.feed)
+        properties = extractor.close()
+
+        self.assertAlmostEqual(properties["density"], 3950)
+        self.assertAlmostEqual(properties["thermal_conductivity"], 30)
+        self.assertEqual(properties["hardness"], 1500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from http_fetcher import FetchedPage, HttpFetcher
+from web_search import WebMaterialSearcher
+
+ARTICLE = "<html><head><title>Alumina</title></head><body><p>" + "Alumina is a ceramic. " * 20 + "</p></body></html>"
+SPA_SHELL = '<html><head><script src="/app.js"></script></head><body><div id="root"></div></body></html>'
+
+
+def make_response(body: bytes, status: int = 200, content_type: str = "text/html; charset=utf-8", **headers):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = {"Content-Type": content_type, **headers}
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [body[i:i + 10] for i in range(0, len(body), 10)]
+    response.__enter__.return_value = response
+    return response
+
+
+class TestHttpFetcher(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = HttpFetcher(max_bytes=1024, spa_domains=["spa.example.com"])
+
+    def test_fetch_streams_body(self):
+        with patch.object(self.fetcher.session, "get", return_value=make_response(ARTICLE.encode())) as get:
+            html = self.fetcher.fetch("http://example.com/alumina")
+
+        self.assertEqual(html, ARTICLE)
+        self.assertTrue(get.call_args.kwargs["stream"])
+
+    def test_fetch_stops_at_max_bytes(self):
+        with patch.object(self.fetcher.session, "get", return_value=make_response(b"x" * 5000)):
+            self.assertEqual(len(self.fetcher.fetch("http://example.com/big")), 1024)
+
+    def test_fetch_rejects_errors_and_non_html(self):
+        with patch.object(self.fetcher.session, "get", return_value=make_response(b"", status=404)):
+            self.assertIsNone(self.fetcher.fetch("http://example.com/missing"))
+            self.assertTrue(self.fetcher.fetch_page("http://example.com/missing").not_renderable)
+        with patch.object(self.fetcher.session, "get", return_value=make_response(b"%PDF", content_type="application/pdf")):
+            self.assertIsNone(self.fetcher.fetch("http://example.com/paper.pdf"))
+            self.assertTrue(self.fetcher.fetch_page("http://example.com/paper.pdf").not_renderable)
+
+    def test_network_error_is_not_a_page(self):
+        with patch.object(self.fetcher.session, "get", side_effect=ConnectionError("refused")):
+            self.assertIsNone(self.fetcher.fetch_page("http://example.com/alumina"))
+
+    def test_decodes_utf8_without_header_charset(self):
+        body = "<html><body>Плотность 3.95 g/cm³</body></html>".encode("utf-8")
+        response = make_response(body, content_type="text/html")
+        # Так requests поступает с text/html без charset
+        response.encoding = "ISO-8859-1"
+        with patch.object(self.fetcher.session, "get", return_value=response):
+            self.assertIn("Плотность 3.95 g/cm³", self.fetcher.fetch("http://example.com/alumina"))
+
+    def test_meta_charset_used_without_header_charset(self):
+        html = '<html><head><meta charset="windows-1251"></head><body>Плотность</body></html>'
+        with patch.object(self.fetcher.session, "get",
+                          return_value=make_response(html.encode("cp1251"), content_type="text/html")):
+            self.assertEqual(self.fetcher.fetch("http://example.com/alumina"), html)
+
+    def test_header_charset_takes_precedence(self):
+        html = '<html><head><meta charset="utf-8"></head><body>Плотность</body></html>'
+        with patch.object(self.fetcher.session, "get",
+                          return_value=make_response(html.encode("koi8-r"), content_type="text/html; charset=KOI8-R")):
+            self.assertEqual(self.fetcher.fetch("http://example.com/alumina"), html)
+
+    def test_conditional_request(self):
+        response = make_response(ARTICLE.encode(), ETag='"v1"', **{"Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+        with patch.object(self.fetcher.session, "get", return_value=response):
+            page = self.fetcher.fetch_page("http://example.com/alumina")
+        self.assertEqual((page.etag, page.last_modified), ('"v1"', "Mon, 05 Oct 2026 10:00:00 GMT"))
+
+        with patch.object(self.fetcher.session, "get", return_value=make_response(b"", status=304)) as get:
+            page = self.fetcher.fetch_page("http://example.com/alumina", etag='"v1"')
+        self.assertTrue(page.not_modified)
+        self.assertEqual(get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    def test_needs_javascript(self):
+        self.assertFalse(self.fetcher.needs_javascript("http://example.com/a", ARTICLE))
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", None))
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", SPA_SHELL))
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", "<html><body>Loading...</body></html>"))
+        self.assertTrue(self.fetcher.needs_javascript("https://www.spa.example.com/a", ARTICLE))
+        # Текст внутри script, style и noscript не считается
+        hidden = "<html><body><script>" + "x" * 500 + "</script><noscript>" + "y" * 500 + "</noscript></body></html>"
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", hidden))
+
+    def test_needs_javascript_with_unclosed_scripts_is_linear(self):
+        start = time.perf_counter()
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", "<script>x" * 200000))
+        self.assertTrue(self.fetcher.needs_javascript("http://example.com/a", "<style a>" * 200000))
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+class TestFetchTiers(unittest.TestCase):
+    def setUp(self):
+        self.searcher = WebMaterialSearcher({"web_search": {"http": {"spa_domains": ["spa.example.com"]}}})
+
+    def tearDown(self):
+        self.searcher.close()
+
+    def test_static_page_served_over_http(self):
+        with patch.object(self.searcher.http_fetcher, "fetch_page", return_value=FetchedPage(ARTICLE)), \
+                patch.object(self.searcher, "_render_webpage") as render:
+            page = self.searcher._fetch_webpage("http://example.com/alumina")
+
+        self.assertEqual(page["title"], "Alumina")
+        render.assert_not_called()
+        self.assertEqual(self.searcher.stats()["fetches"], {"cache": 0, "http": 1, "selenium": 0, "failed": 0})
+
+    def test_javascript_page_falls_back_to_selenium(self):
+        with patch.object(self.searcher.http_fetcher, "fetch_page", return_value=FetchedPage(SPA_SHELL)), \
+                patch.object(self.searcher, "_render_webpage", return_value=ARTICLE):
+            page = self.searcher._fetch_webpage("http://example.com/app")
+
+        self.assertIn("ceramic", page["text"])
+        self.assertEqual(self.searcher.stats()["fetches"]["selenium"], 1)
+
+    def test_error_page_is_not_rendered(self):
+        with patch.object(self.searcher.http_fetcher, "fetch_page",
+                          return_value=FetchedPage(None, not_renderable=True)), \
+                patch.object(self.searcher, "_render_webpage") as render:
+            self.assertIsNone(self.searcher._fetch_webpage("http://example.com/paper.pdf"))
+
+        render.assert_not_called()
+        self.assertEqual(self.searcher.stats()["fetches"], {"cache": 0, "http": 0, "selenium": 0, "failed": 1})
+
+    def test_spa_domain_skips_http(self):
+        with patch.object(self.searcher.http_fetcher, "fetch_page") as fetch, \
+                patch.object(self.searcher, "_render_webpage", return_value=None):
+            self.assertIsNone(self.searcher._fetch_webpage("https://spa.example.com/x"))
+
+        fetch.assert_not_called()
+        self.assertEqual(self.searcher.stats()["fetches"]["failed"], 1)
+
+
+class TestPageCacheFetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.searcher = WebMaterialSearcher({"web_search": {"page_cache": {
+            "enabled": True, "path": os.path.join(self.tmp.name, "cache.sqlite"), "ttl": 60
+        }}})
+        self.now = 1000.0
+        self.searcher.page_cache.clock = lambda: self.now
+
+    def tearDown(self):
+        self.searcher.close()
+        self.tmp.cleanup()
+
+    def test_fresh_page_served_from_cache(self):
+        with patch.object(self.searcher.http_fetcher, "fetch_page", return_value=FetchedPage(ARTICLE)) as fetch:
+            first = self.searcher._fetch_webpage("http://example.com/alumina")
+            second = self.searcher._fetch_webpage("http://example.com/alumina")
+
+        self.assertEqual(first, second)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(self.searcher.stats()["page_cache"]["hit_ratio"], 0.5)
+
+    def test_stale_page_revalidated_with_validators(self):
+        page = FetchedPage(ARTICLE, etag='"v1"', last_modified="Mon, 05 Oct 2026 10:00:00 GMT")
+        with patch.object(self.searcher.http_fetcher, "fetch_page", return_value=page):
+            first = self.searcher._fetch_webpage("http://example.com/alumina")
+
+        self.now += 120
+        with patch.object(self.searcher.http_fetcher, "fetch_page",
+                          return_value=FetchedPage(None, not_modified=True)) as fetch, \
+                patch.object(self.searcher, "_parse_webpage") as parse:
+            second = self.searcher._fetch_webpage("http://example.com/alumina")
+
+        self.assertEqual(second, first)
+        fetch.assert_called_once_with("http://example.com/alumina", '"v1"', "Mon, 05 Oct 2026 10:00:00 GMT")
+        parse.assert_not_called()
+        stats = self.searcher.stats()
+        self.assertEqual(stats["page_cache"]["revalidated"], 1)
+        self.assertEqual(stats["fetches"]["cache"], 1)
+
+        # Подтвержденная страница снова свежая
+        self.assertTrue(self.searcher.page_cache.get("http://example.com/alumina")["fresh"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+
+import keyword_matcher
+from creatoria_agent import MaterialsAgent
+from keyword_matcher import KeywordMatcher, TAG_KEYWORDS
+
+# Регулярное выражение есть всегда, автомат - если установлен pyahocorasick
+BACKENDS = [False] + ([True] if keyword_matcher.ahocorasick else [])
+
+CATEGORIES = {
+    "metals": {"keywords": ["Metal", "alloy", "steel"]},
+    "ceramics": {"keywords": ["ceramic", "oxide", "alumina"]},
+    "composites": {"keywords": ["composite", "fiber", "matrix"]}
+}
+
+class TestKeywordSearch(unittest.TestCase):
+    def found(self, keywords, text, use_automaton):
+        matcher = KeywordMatcher({keyword: [keyword] for keyword in keywords}, {}, use_automaton=use_automaton)
+        return matcher.match(text).tags
+
+    def test_overlapping_and_nested_keywords(self):
+        for use_automaton in BACKENDS:
+            with self.subTest(use_automaton=use_automaton):
+                self.assertEqual(self.found(["he", "she", "his", "hers"], "ushers", use_automaton), {"he", "she", "hers"})
+
+    def test_same_as_substring_search(self):
+        keywords = ["light", "lightweight", "nano", "nanoparticle", "particle", "space", "aerospace", "ht", "a.b"]
+        texts = [
+            "lightweight aerospace nanoparticles",
+            "a nanoparticle reinforced highweight part",
+            "no keywords here, not even a-b",
+            "a.b",
+            ""
+        ]
+        for use_automaton in BACKENDS:
+            for text in texts:
+                with self.subTest(use_automaton=use_automaton, text=text):
+                    self.assertEqual(self.found(keywords, text, use_automaton), {k for k in keywords if k in text})
+
+    def test_empty_keyword_ignored(self):
+        for use_automaton in BACKENDS:
+            with self.subTest(use_automaton=use_automaton):
+                self.assertEqual(self.found(["metal", ""], "metal", use_automaton), {"metal"})
+
+    def test_keyword_with_space_matches_any_whitespace(self):
+        for use_automaton in BACKENDS:
+            with self.subTest(use_automaton=use_automaton):
+                self.assertEqual(self.found(["low density"], "LOW\n   density foam", use_automaton), {"low density"})
+
+class TestKeywordMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = KeywordMatcher(TAG_KEYWORDS, CATEGORIES)
+
+    def test_tags_and_scores_in_one_match(self):
+        match = self.matcher.match("Alumina oxide ceramic with a metal alloy binder")
+        self.assertEqual(match.tags, {"ceramic", "metal"})
+        self.assertEqual(match.category_scores, {"metals": 2, "ceramics": 3, "composites": 0})
+        self.assertEqual(match.best_category(), "ceramics")
+
+    def test_keyword_shared_by_tags(self):
+        self.assertEqual(self.matcher.match("light").tags, {"lightweight", "optical"})
+
+    def test_category_keywords_case_insensitive(self):
+        self.assertEqual(self.matcher.match("METALLIC FOAM").best_category(), "metals")
+
+    def test_repeated_keyword_counts_once(self):
+        match = self.matcher.match("steel steel steel fiber matrix")
+        self.assertEqual(match.category_scores["metals"], 1)
+        self.assertEqual(match.best_category(), "composites")
+
+    def test_prefix_keywords_count_separately(self):
+        matcher = KeywordMatcher({}, {"metals": {"keywords": ["metal", "metallic"]}})
+        self.assertEqual(matcher.match("metallic").category_scores, {"metals": 2})
+
+    def test_tie_keeps_first_category_and_default(self):
+        self.assertEqual(self.matcher.match("steel fiber").best_category(), "metals")
+        self.assertEqual(self.matcher.match("wood").best_category(), "other")
+
+class TestAgentTagging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        with open("config.json", "w") as f:
+            json.dump({"web_search": {"enabled": False}, "categories": {}}, f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_extract_tags(self):
+        agent = MaterialsAgent()
+        self.assertEqual(agent._extract_tags("A LOW density aerospace\nalloy"), {"lightweight", "aerospace"})
+        tags = agent._extract_tags("Carbon fiber reinforced polymer composite")
+        self.assertIn("composite", tags)
+        self.assertIn("polymer", tags)
+        self.assertEqual(agent._extract_tags("ceramic oxide"), {"ceramic"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import copy
+import pickle
+import unittest
+
+from material_record import (
+    MISSING, MaterialRecord, RawCategory, RawEntry, materials_from_records, records_from_categories,
+    records_from_materials
+)
+
+class TestMaterialRecord(unittest.TestCase):
+    def test_round_trip_of_regular_material(self):
+        material = {"label": "Alumina", "formula": "Al2O3", "λ": 30, "ρ": 3950.0, "E": None,
+                    "toxicity": "low", "tags": ["ceramic", "thermal"]}
+        record = MaterialRecord.from_dict(material)
+
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.density, 3950.0)
+        self.assertIsNone(record.young_modulus)
+        self.assertIs(record.max_temp, MISSING)
+        self.assertIsNone(record.extra)
+        self.assertEqual(record.to_dict(), material)
+        self.assertIs(type(record.to_dict()["λ"]), int)
+
+    def test_unknown_fields_and_odd_values_kept_in_extra(self):
+        material = {"label": "Ti-6Al-4V", "ρ": 4.43, "ρ_unit": "g/cm³", "cost": "n/a", "tags": "metal"}
+        record = MaterialRecord.from_dict(material)
+
+        self.assertEqual(record.extra, {"ρ_unit": "g/cm³", "tags": "metal"})
+        self.assertEqual(record.cost, "n/a")
+        self.assertEqual(record.to_dict(), material)
+        self.assertEqual(record.get("ρ_unit"), "g/cm³")
+        self.assertEqual(record.get("tags"), "metal")
+        self.assertEqual(record.get("hardness", 0), 0)
+
+    def test_tags_shared_between_records(self):
+        first = MaterialRecord.from_dict({"label": "A", "tags": ["metal", "light" + "weight"]})
+        second = MaterialRecord.from_dict({"label": "B", "tags": ["metal", "".join(["light", "weight"])]})
+        self.assertIs(first.tags, second.tags)
+        self.assertEqual(first.get("tags"), ["metal", "lightweight"])
+
+    def test_copy_and_pickle(self):
+        record = MaterialRecord.from_dict({"label": "Copper", "tags": []})
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+        self.assertIs(pickle.loads(pickle.dumps(record)).formula, MISSING)
+        self.assertEqual(copy.deepcopy(record), record)
+
+    def test_catalogue_conversion(self):
+        materials = {"metals": [{"label": "Steel", "cost": 0.8}], "polymers": None, "ceramics": []}
+        records = records_from_materials(materials)
+        self.assertEqual(records["metals"][0].label, "Steel")
+        self.assertEqual(materials_from_records(records), materials)
+
+    def test_categories_from_iterator(self):
+        def categories():
+            yield "metals", [{"label": "Steel"}]
+            yield "ceramics", [{"label": "Alumina"}, "not a material"]
+
+        records = records_from_categories(categories())
+        self.assertEqual(materials_from_records(records), dict(categories()))
+
+    def test_malformed_categories_and_entries_round_trip(self):
+        materials = {
+            "metals": [{"label": "Steel"}, "not a material", None, ["Al", 2.7]],
+            "notes": "to be filled in",
+            "ceramics": {"label": "Alumina"},
+            "polymers": None
+        }
+        with self.assertLogs("material_record", "WARNING"):
+            records = records_from_materials(materials)
+
+        self.assertEqual(records["metals"][1], RawEntry("not a material"))
+        self.assertIsInstance(records["notes"], RawCategory)
+        # Для индексов такие категории пусты, а записи - без полей
+        self.assertEqual(list(records["ceramics"]), [])
+        self.assertIs(records["metals"][3].label, MISSING)
+        self.assertIsNone(records["metals"][3].get("ρ"))
+        self.assertEqual(materials_from_records(records), materials)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from materials_project import MaterialsProjectClient
+
+
+class TestMaterialsProjectClient(unittest.TestCase):
+    def make_client(self, handler, **kwargs):
+        return MaterialsProjectClient("test-key", transport=httpx.MockTransport(handler), retry_delay=0.01, **kwargs)
+
+    def test_get_material(self):
+        def handler(request):
+            self.assertEqual(request.headers["X-API-KEY"], "test-key")
+            return httpx.Response(200, json={"material_id": request.url.path.rsplit("/", 1)[-1]})
+
+        async def scenario():
+            client = self.make_client(handler)
+            try:
+                return await client.get_material("mp-149"), await client.get_material("mp-13")
+            finally:
+                await client.aclose()
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, {"material_id": "mp-149"})
+        self.assertEqual(second, {"material_id": "mp-13"})
+
+    def test_retries_with_backoff_then_succeeds(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        client = self.make_client(handler)
+        self.assertEqual(asyncio.run(client.get_material("mp-1")), {"ok": True})
+        self.assertEqual(len(calls), 3)
+
+    def test_not_found_and_exhausted_retries_return_none(self):
+        client = self.make_client(lambda request: httpx.Response(404))
+        self.assertIsNone(asyncio.run(client.get_material("missing")))
+
+        def failing(request):
+            raise httpx.ConnectError("refused")
+
+        client = self.make_client(failing, retry_attempts=2)
+        self.assertIsNone(asyncio.run(client.get_material("mp-1")))
+
+    def test_zero_retry_attempts_still_requests_once(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        client = self.make_client(handler, retry_attempts=0)
+        self.assertIsNone(asyncio.run(client.get_material("mp-1")))
+        self.assertEqual(len(calls), 1)
+
+    def test_batch_lookup_is_concurrent_and_capped(self):
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+        client = self.make_client(handler, max_concurrency=5)
+        queries = [f"mp-{i}" for i in range(50)]
+        start = time.monotonic()
+        results = asyncio.run(client.get_materials(queries + ["mp-0"]))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(len(results), 50)
+        self.assertEqual(results["mp-7"], {"id": "mp-7"})
+        self.assertEqual(peak, 5)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from creatoria_agent import MaterialsAgent, Material, ToxicityLevel
+from material_record import MaterialRecord, records_from_materials
+from materials_snapshot import load_snapshot, write_snapshot
+
+MATERIALS = {
+    "metals": [
+        {"label": "Aluminium 6061", "formula": "Al-Mg-Si", "λ": 167, "ρ": 2700.0, "temp_max": None,
+         "E": 68.9, "cost": "n/a", "toxicity": "low", "tags": ["metal", "lightweight"]},
+        {"formula": "Ti-6Al-4V", "label": "Ti-6Al-4V", "ρ": 4.43, "ρ_unit": "g/cm³", "tags": [],
+         "source": {"url": "https://example.org", "confidence": 0.9}}
+    ],
+    "ceramics": [{"label": "Оксид алюминия", "formula": "Al₂O₃", "hardness": 1500, "E": True}],
+    "polymers": [],
+    "nanomaterials": None
+}
+
+class TestMaterialsSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.yaml_path = Path(self.tmp.name) / "materials.yaml"
+        self.snapshot_path = Path(self.tmp.name) / "materials.snapshot"
+        with open(self.yaml_path, "w", encoding="utf-8") as f:
+            yaml.dump(MATERIALS, f, allow_unicode=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_preserves_values_types_and_key_order(self):
+        self.assertTrue(write_snapshot(self.snapshot_path, MATERIALS, self.yaml_path))
+        loaded = load_snapshot(self.snapshot_path, self.yaml_path)
+
+        self.assertEqual(loaded, MATERIALS)
+        self.assertEqual(list(loaded), list(MATERIALS))
+        for category, entries in MATERIALS.items():
+            for original, restored in zip(entries or [], loaded[category] or []):
+                self.assertEqual(list(restored), list(original))
+                for key, value in original.items():
+                    self.assertIs(type(restored[key]), type(value), key)
+
+    def test_records_converted_per_category(self):
+        records = records_from_materials(MATERIALS)
+        self.assertTrue(write_snapshot(self.snapshot_path, records, self.yaml_path, MaterialRecord.to_dict))
+        self.assertEqual(load_snapshot(self.snapshot_path, self.yaml_path), MATERIALS)
+
+        loaded = load_snapshot(self.snapshot_path, self.yaml_path, MaterialRecord.from_dict)
+        self.assertEqual(loaded, records)
+        self.assertIsInstance(loaded["metals"][0], MaterialRecord)
+
+    def test_stale_snapshot_is_ignored(self):
+        write_snapshot(self.snapshot_path, MATERIALS, self.yaml_path)
+        with open(self.yaml_path, "a", encoding="utf-8") as f:
+            f.write("composites: []\n")
+        self.assertIsNone(load_snapshot(self.snapshot_path, self.yaml_path))
+
+    def test_missing_or_corrupt_snapshot_returns_none(self):
+        self.assertIsNone(load_snapshot(self.snapshot_path, self.yaml_path))
+        self.snapshot_path.write_bytes(b"not a snapshot")
+        self.assertIsNone(load_snapshot(self.snapshot_path, self.yaml_path))
+
+class TestAgentSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        with open("config.json", "w") as f:
+            json.dump({
+                "web_search": {"enabled": False},
+                "categories": {},
+                "storage": {"snapshot_file": "materials.snapshot"}
+            }, f)
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(MATERIALS, f, allow_unicode=True)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_snapshot_created_then_used_instead_of_yaml(self):
+        first = MaterialsAgent()
+        self.assertTrue(os.path.exists("materials.snapshot"))
+
+        with patch("creatoria_agent.yaml_io.iter_categories") as iter_categories:
+            second = MaterialsAgent()
+            iter_categories.assert_not_called()
+        self.assertEqual(second.existing_materials, first.existing_materials)
+        self.assertEqual(second.find_duplicate(first_material())["label"], "Aluminium 6061")
+
+    def test_yaml_converted_without_building_the_whole_document(self):
+        with patch("creatoria_agent.yaml_io.load_materials") as load_materials:
+            agent = MaterialsAgent()
+        load_materials.assert_not_called()
+        self.assertIsInstance(agent.existing_materials["metals"][0], MaterialRecord)
+        self.assertEqual(load_snapshot(Path("materials.snapshot"), Path("materials.yaml")), MATERIALS)
+
+    def test_snapshot_follows_materials_file_writes(self):
+        MaterialsAgent()
+        agent = MaterialsAgent()
+        material = first_material()
+        material.label, material.formula = "Copper", "Cu"
+        agent.add_material(material, "metals")
+
+        with open("materials.yaml", encoding="utf-8") as f:
+            expected = yaml.safe_load(f)
+        self.assertEqual(load_snapshot(Path("materials.snapshot"), Path("materials.yaml")), expected)
+
+def first_material() -> Material:
+    return Material(
+        label="aluminium-6061", formula="Al-Mg-Si", thermal_conductivity=167.0, density=2700.0, max_temp=600.0,
+        young_modulus=68.9, yield_strength=276.0, hardness=95.0, cost=3.5, toxicity=ToxicityLevel.LOW, tags=["metal"]
+    )
+
+if __name__ == "__main__":
+    unittest.main()
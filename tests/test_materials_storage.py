@@ -0,0 +1,235 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from creatoria_agent import MaterialsAgent, Material, ToxicityLevel
+from material_record import materials_from_records
+
+
+def make_material(label: str, formula: str) -> Material:
+    return Material(
+        label=label,
+        formula=formula,
+        thermal_conductivity=5.0,
+        density=2700,
+        max_temp=600,
+        young_modulus=70,
+        yield_strength=250,
+        hardness=100,
+        cost=3.5,
+        toxicity=ToxicityLevel.LOW,
+        tags=["metal"]
+    )
+
+
+class TestMaterialsStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.write_config()
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump({
+                "metals": [{"label": "Aluminium 6061", "formula": "Al-Mg-Si"}],
+                "ceramics": [{"label": "Alumina", "formula": "Al2O3"}]
+            }, f, allow_unicode=True)
+
+    def write_config(self, storage=None):
+        config = {"web_search": {"enabled": False}, "categories": {}}
+        if storage:
+            config["storage"] = storage
+        with open("config.json", "w") as f:
+            json.dump(config, f)
+
+    def load_yaml(self):
+        with open("materials.yaml", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_find_duplicate_reports_match(self):
+        agent = MaterialsAgent()
+
+        match = agent.find_duplicate(make_material("ALUMINA", "Al2O3 (alpha)"))
+        self.assertEqual(match["category"], "ceramics")
+        self.assertEqual(match["label"], "Alumina")
+        self.assertEqual(match["matched_on"], "label")
+
+        match = agent.find_duplicate(make_material("Duralumin", "al_mg si"))
+        self.assertEqual(match["label"], "Aluminium 6061")
+        self.assertEqual(match["matched_on"], "formula")
+
+        self.assertIsNone(agent.find_duplicate(make_material("Titanium", "Ti")))
+
+    def test_add_material_updates_index(self):
+        agent = MaterialsAgent()
+        agent.add_material(make_material("Titanium", "Ti"), "metals")
+
+        self.assertTrue(agent.is_duplicate(make_material("titanium", "Ti-6Al-4V")))
+        agent.add_material(make_material("Titanium", "Ti"), "metals")
+        self.assertEqual(len(agent.existing_materials["metals"]), 2)
+
+    def test_journal_mode_appends_instead_of_rewriting(self):
+        self.write_config({"mode": "journal", "compact_threshold": 100})
+        agent = MaterialsAgent()
+        agent.add_material(make_material("Titanium", "Ti"), "metals")
+        agent.add_material(make_material("Zirconia", "ZrO2"), "ceramics")
+
+        self.assertEqual(len(self.load_yaml()["metals"]), 1)
+        with open("materials.journal", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        # Журнал восстанавливается при следующем запуске
+        restarted = MaterialsAgent()
+        self.assertEqual([m.label for m in restarted.existing_materials["metals"]],
+                         ["Aluminium 6061", "Titanium"])
+        self.assertTrue(restarted.is_duplicate(make_material("Zirconia", "ZrO2")))
+
+        restarted.flush_materials()
+        self.assertFalse(os.path.exists("materials.journal"))
+        self.assertEqual(len(self.load_yaml()["ceramics"]), 2)
+
+    def test_replay_skips_entries_already_compacted(self):
+        self.write_config({"mode": "journal"})
+        agent = MaterialsAgent()
+        agent.add_material(make_material("Titanium", "Ti"), "metals")
+        # Сбой после записи materials.yaml, но до удаления журнала
+        agent.journal.rotate()
+        agent._write_materials_file(materials_from_records(agent.existing_materials))
+
+        restarted = MaterialsAgent()
+        self.assertEqual(len(restarted.existing_materials["metals"]), 2)
+
+    def test_background_compaction(self):
+        self.write_config({"mode": "journal", "compact_threshold": 2})
+        agent = MaterialsAgent()
+        agent.add_material(make_material("Titanium", "Ti"), "metals")
+        agent.add_material(make_material("Copper", "Cu"), "metals")
+        agent.close()
+
+        self.assertEqual(len(self.load_yaml()["metals"]), 3)
+        self.assertFalse(os.path.exists("materials.journal.compacting"))
+
+    def test_compaction_keeps_entries_of_other_processes(self):
+        self.write_config({"mode": "journal", "compact_threshold": 100})
+        first = MaterialsAgent()
+        second = MaterialsAgent()
+        second.add_material(make_material("Copper", "Cu"), "metals")
+        first.add_material(make_material("Iron", "Fe"), "metals")
+
+        first.flush_materials()
+
+        labels = [m["label"] for m in self.load_yaml()["metals"]]
+        self.assertEqual(sorted(labels), ["Aluminium 6061", "Copper", "Iron"])
+        self.assertFalse(os.path.exists("materials.journal.compacting"))
+
+    def test_concurrent_flushes_do_not_overlap(self):
+        self.write_config({"mode": "journal", "compact_threshold": 100})
+        agent = MaterialsAgent()
+        agent.add_material(make_material("Copper", "Cu"), "metals")
+        active = []
+        overlaps = []
+        write = agent._write_materials_file
+
+        def tracked_write(materials):
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(len(active))
+            time.sleep(0.05)
+            write(materials)
+            active.pop()
+
+        with patch.object(agent, "_write_materials_file", side_effect=tracked_write):
+            threads = [threading.Thread(target=agent.flush_materials) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+                agent.add_material(make_material("Iron", "Fe"), "metals")
+            for thread in threads:
+                thread.join()
+        agent.flush_materials()
+
+        self.assertEqual(overlaps, [])
+        self.assertEqual(len(self.load_yaml()["metals"]), 3)
+
+    def test_add_materials_batch_report(self):
+        self.write_config({"mode": "journal"})
+        agent = MaterialsAgent()
+        invalid = make_material("X", "")
+
+        def materials():
+            yield make_material("Titanium", "Ti")
+            yield make_material("Alumina", "Al2O3")
+            yield invalid
+            yield make_material("TITANIUM", "Ti-6Al-4V")
+            yield make_material("Copper", "Cu")
+
+        report = agent.add_materials(materials(), "metals")
+
+        self.assertEqual([item["status"] for item in report],
+                         ["added", "duplicate", "invalid", "duplicate", "added"])
+        self.assertEqual(report[1]["duplicate_of"]["category"], "ceramics")
+        self.assertEqual(report[2]["errors"], invalid.validate())
+        self.assertEqual(report[3]["duplicate_of"]["label"], "Titanium")
+        with open("materials.journal", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_add_materials_builds_property_indexes_once(self):
+        agent = MaterialsAgent()
+        batch = [make_material("Titanium", "Ti"), make_material("Copper", "Cu")]
+        with patch("property_store.SortedColumnIndex.insert") as insert, \
+                patch.object(agent.property_store, "rebuild_indexes", wraps=agent.property_store.rebuild_indexes) as rebuild:
+            agent.add_materials(batch, "metals")
+
+        insert.assert_not_called()
+        rebuild.assert_called_once()
+        constraints = agent.parameter_parser.parse_query("density ≤ 3000 kg/m³")
+        self.assertEqual(sorted(agent.property_store.query(constraints)), [("metals", 1), ("metals", 2)])
+
+    def test_add_materials_without_additions_does_not_rewrite(self):
+        agent = MaterialsAgent()
+        with patch.object(agent, "_write_materials_file") as write:
+            report = agent.add_materials([make_material("Alumina", "Al2O3"), make_material("X", "")], "metals")
+
+        self.assertEqual([item["status"] for item in report], ["duplicate", "invalid"])
+        write.assert_not_called()
+
+    def test_add_materials_rolls_back_on_write_error(self):
+        agent = MaterialsAgent()
+        with patch.object(agent, "_write_materials_file", side_effect=OSError("disk full")):
+            report = agent.add_materials([make_material("Titanium", "Ti")], "metals")
+
+        self.assertEqual(report[0]["status"], "error")
+        self.assertEqual(len(agent.existing_materials["metals"]), 1)
+        self.assertFalse(agent.is_duplicate(make_material("Titanium", "Ti")))
+
+    def test_rewrite_keeps_malformed_categories_and_entries(self):
+        malformed = {
+            "metals": [{"label": "Aluminium 6061", "formula": "Al-Mg-Si"}, "legacy note"],
+            "ceramics": "to be filled in",
+        }
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(malformed, f, allow_unicode=True)
+        agent = MaterialsAgent()
+
+        report = agent.add_materials([make_material("Titanium", "Ti")], "metals")
+        self.assertEqual(report[0]["status"], "added")
+        saved = self.load_yaml()
+        self.assertEqual(saved["metals"][1], "legacy note")
+        self.assertEqual(saved["metals"][2]["label"], "Titanium")
+        self.assertEqual(saved["ceramics"], "to be filled in")
+
+        report = agent.add_materials([make_material("Zirconia", "ZrO2")], "ceramics")
+        self.assertEqual(report[0]["status"], "error")
+        self.assertEqual(self.load_yaml(), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
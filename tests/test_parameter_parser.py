@@ -1,3 +1,4 @@
+import time
 import unittest
 from parameter_parser import ParameterParser
 
@@ -59,5 +60,81 @@ class TestParameterParser(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.parser.parse(query)
 
+class TestParseQuery(unittest.TestCase):
+    def setUp(self):
+        self.parser = ParameterParser()
+
+    def test_multiline_query(self):
+        query = "pressure drop ≤ 200 kPa\ninlet temperature 25–40 °C\n- mass ≤ 1.5 kg\ncost ≤ 50"
+        result = self.parser.parse_query(query)
+        self.assertEqual([c.name for c in result], ["pressure", "temperature", "mass", "cost"])
+        self.assertEqual((result[0].operator, result[0].value, result[0].unit), ("less_equal", 200, "kPa"))
+        self.assertEqual((result[1].operator, result[1].range_min, result[1].range_max, result[1].unit),
+                         ("range", 25, 40, "°C"))
+        self.assertEqual(result[3].unit, "")
+
+    def test_and_joined_query(self):
+        query = "pressure_drop < 100 kPa AND inlet_temperature > 300 K AND mass < 1000 kg AND cost < 5000 USD"
+        result = self.parser.parse_query(query)
+        self.assertEqual([(c.name, c.operator, c.value, c.unit) for c in result], [
+            ("pressure", "less", 100, "kPa"),
+            ("temperature", "greater", 300, "K"),
+            ("mass", "less", 1000, "kg"),
+            ("cost", "less", 5000, "USD"),
+        ])
+
+    def test_units_and_signs(self):
+        result = self.parser.parse_query("density ≤ 3 g/cm³; max temperature >= -20 °C; cost ≤ $50")
+        self.assertEqual([(c.name, c.value, c.unit) for c in result], [
+            ("density", 3, "g/cm³"),
+            ("max_temp", -20, "°C"),
+            ("cost", 50, "$"),
+        ])
+        result = self.parser.parse_query("temperature -40 - -10 °C")
+        self.assertEqual((result[0].range_min, result[0].range_max), (-40, -10))
+
+    def test_unknown_parameters_are_skipped(self):
+        self.assertEqual(self.parser.parse_query("invalid query"), ())
+        self.assertEqual(self.parser.parse_query("colour = 5\nmass = 5 kg")[0].name, "mass")
+
+    def test_decimal_comma(self):
+        result = self.parser.parse_query("mass ≤ 1,5 kg\ncost < 2,25")
+        self.assertEqual([(c.name, c.value, c.unit) for c in result], [("mass", 1.5, "kg"), ("cost", 2.25, "")])
+        # "1,000" может быть и 1.0, и 1000 - такое ограничение не разбирается
+        self.assertEqual(self.parser.parse_query("cost < 1,000 USD"), ())
+        self.assertEqual(self.parser.parse_query("mass ≤ 1.5.3 kg"), ())
+        self.assertEqual([c.value for c in self.parser.parse_query("mass < 5, cost < 3")], [5, 3])
+
+    def test_long_token_is_linear(self):
+        start = time.perf_counter()
+        for text in ("a" * 200000, "a " * 100000, "mass" * 50000 + " < 5"):
+            self.assertEqual(self.parser.parse_query(text), ())
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+class TestParseQueryCache(unittest.TestCase):
+    def test_hits_misses_and_evictions(self):
+        parser = ParameterParser(cache_size=2)
+        first = parser.parse_query("mass ≤ 5 kg\ncost ≤ 50")
+        second = parser.parse_query("  mass  ≤ 5 kg\n\ncost ≤ 50  ")
+        self.assertIs(first, second)
+        self.assertIsInstance(first, tuple)
+
+        parser.parse_query("density ≤ 3000 kg/m³")
+        parser.parse_query("hardness > 200 HV")
+        info = parser.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["evictions"], info["size"]), (1, 3, 1, 2))
+        self.assertAlmostEqual(info["hit_rate"], 0.25)
+
+    def test_constraints_are_immutable(self):
+        constraint = ParameterParser().parse_query("mass ≤ 5 kg")[0]
+        with self.assertRaises(Exception):
+            constraint.value = 10
+
+    def test_cache_can_be_disabled(self):
+        parser = ParameterParser(cache_size=0)
+        parser.parse_query("mass ≤ 5 kg")
+        parser.parse_query("mass ≤ 5 kg")
+        self.assertEqual(parser.cache_info()["size"], 0)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import prefork
+import run_agent
+
+@unittest.skipUnless(prefork.fork_supported(), "os.fork недоступен")
+class TestRunWorkers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_workers_share_data_loaded_before_fork(self):
+        catalogue = {"alumina": 3950.0}
+
+        def target():
+            (self.path / str(os.getpid())).write_text(json.dumps(catalogue))
+
+        prefork.run_workers(target, 3)
+
+        files = list(self.path.iterdir())
+        self.assertEqual(len(files), 3)
+        self.assertNotIn(str(os.getpid()), {f.name for f in files})
+        for f in files:
+            self.assertEqual(json.loads(f.read_text()), catalogue)
+
+    def test_crashed_worker_is_restarted(self):
+        marker = self.path / "crashed"
+
+        def target():
+            if not marker.exists():
+                marker.write_text("1")
+                raise RuntimeError("worker crash")
+            (self.path / "done").write_text(str(os.getpid()))
+
+        with patch.object(prefork, "RESTART_DELAY", 0):
+            prefork.run_workers(target, 1)
+
+        self.assertTrue((self.path / "done").exists())
+
+class TestDeployment(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmpdir.name, "config.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_deployment_defaults_and_overrides(self):
+        self.assertEqual(run_agent.load_deployment(self.config_path)["workers"], 1)
+        with open(self.config_path, "w") as f:
+            json.dump({"deployment": {"workers": 4, "reload": False, "preload": True}}, f)
+        deployment = run_agent.load_deployment(self.config_path)
+        self.assertEqual((deployment["workers"], deployment["reload"], deployment["preload"]), (4, False, True))
+        self.assertEqual(deployment["port"], 8000)
+
+    def test_environment_overrides_config(self):
+        with open(self.config_path, "w") as f:
+            json.dump({"deployment": {"workers": 4, "reload": True}}, f)
+        environ = {"PORT": "5000", "WEB_CONCURRENCY": "3", "DEPLOYMENT_RELOAD": "false", "DEPLOYMENT_PRELOAD": "true"}
+        with patch.dict(os.environ, environ):
+            deployment = run_agent.load_deployment(self.config_path)
+        self.assertEqual(
+            (deployment["port"], deployment["workers"], deployment["reload"], deployment["preload"]),
+            (5000, 3, False, True)
+        )
+
+    def test_main_preloads_only_without_reload(self):
+        deployment = {"host": "127.0.0.1", "port": 8001, "workers": 4, "reload": False, "preload": True}
+        with patch.object(run_agent, "load_deployment", return_value=deployment), \
+                patch.object(run_agent, "serve_preloaded") as serve, patch.object(run_agent.uvicorn, "run") as run:
+            run_agent.main()
+            serve.assert_called_once_with("127.0.0.1", 8001, 4)
+            run.assert_not_called()
+
+            deployment["reload"] = True
+            run_agent.main()
+            self.assertEqual(run.call_args.kwargs["reload"], True)
+            self.assertIsNone(run.call_args.kwargs["workers"])
+
+    def test_startup_keeps_preloaded_agent(self):
+        preloaded = object()
+        with patch.object(run_agent, "agent", preloaded), patch.object(run_agent, "MaterialsAgent") as factory:
+            asyncio.run(run_agent.startup_event())
+            self.assertIs(run_agent.agent, preloaded)
+            factory.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock
+
+import yaml
+
+from creatoria_agent import MaterialsAgent
+from property_extractor import PropertyExtractor, extract_properties
+from web_search import WebSearchResult
+
+ABSTRACT = (
+    "Aluminium 6061 has a density of 2.70 g/cm³, a thermal conductivity of 167 W m-1 K-1 "
+    "and Young's modulus of 68.9 GPa. Its yield strength is 240–280 MPa and the hardness is 95 HV. "
+    "Maximum service temperature: 150 °C. Price about $2.5 per kg. The sample measured 30 mm."
+)
+
+
+class TestExtractProperties(unittest.TestCase):
+    def test_extracts_si_values(self):
+        properties = extract_properties(ABSTRACT)
+
+        self.assertAlmostEqual(properties["density"], 2700)
+        self.assertEqual(properties["density_unit"], "kg/m³")
+        self.assertAlmostEqual(properties["thermal_conductivity"], 167)
+        self.assertAlmostEqual(properties["young_modulus"], 68.9e9)
+        self.assertEqual(properties["young_modulus_unit"], "Pa")
+        self.assertAlmostEqual(properties["strength"], 260e6)
+        self.assertEqual(properties["hardness"], 95)
+        self.assertAlmostEqual(properties["max_temp"], 423.15)
+        self.assertEqual(properties["cost"], 2.5)
+        self.assertNotIn("length", properties)
+
+    def test_unit_must_match_property(self):
+        # 70 GPa не может быть плотностью, а 5 kg - ничем из известных свойств
+        properties = extract_properties("density and stiffness: 70 GPa; mass 5 kg")
+        self.assertEqual(properties, {})
+
+    def test_keyword_must_be_near(self):
+        text = "thermal conductivity" + " filler" * 20 + " 150 W/m·K"
+        self.assertEqual(extract_properties(text), {})
+        self.assertEqual(extract_properties(text, lookback=200)["thermal_conductivity"], 150)
+
+    def test_nearest_keyword_wins(self):
+        properties = extract_properties("tensile strength 310 MPa, yield strength 276 MPa, ρ = 2,700 kg/m3")
+        self.assertAlmostEqual(properties["tensile_strength"], 310e6)
+        self.assertAlmostEqual(properties["strength"], 276e6)
+        self.assertAlmostEqual(properties["density"], 2700)
+
+    def test_first_value_kept_and_negative_values(self):
+        properties = extract_properties("operating temperature −40 °C ... operating temperature 100 °C")
+        self.assertAlmostEqual(properties["max_temp"], 233.15)
+
+    def test_streaming_matches_whole_text(self):
+        text = ABSTRACT * 3
+        for size in (1, 5, 64, 1000):
+            extractor = PropertyExtractor()
+            for start in range(0, len(text), size):
+                extractor.feed(text[start:start + size])
+            self.assertEqual(extractor.close(), extract_properties(text))
+
+    def test_streaming_keeps_buffer_bounded(self):
+        extractor = PropertyExtractor()
+        for _ in range(1000):
+            extractor.feed("filler text without values " * 40)
+        self.assertLess(len(extractor._buffer), 1000)
+
+    def test_large_text_is_linear(self):
+        filler = "the sample was annealed and measured using standard methods in 2019 " * 2000
+        small = filler + ABSTRACT
+        start = time.perf_counter()
+        extract_properties(small)
+        small_time = time.perf_counter() - start
+
+        large = (filler * 20) + ABSTRACT
+        start = time.perf_counter()
+        properties = extract_properties(large)
+        large_time = time.perf_counter() - start
+
+        self.assertAlmostEqual(properties["density"], 2700)
+        self.assertLess(large_time, small_time * 60)
+
+
+class TestWebResultsMatchConstraints(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        with open("config.json", "w") as f:
+            json.dump({"web_search": {"enabled": False}, "categories": {}}, f)
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump({"metals": []}, f)
+        self.agent = MaterialsAgent()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_extracted_properties_satisfy_constraints(self):
+        result = WebSearchResult(title="Aluminium 6061", description=ABSTRACT, url="", source="arXiv",
+                                 properties=extract_properties(ABSTRACT), confidence=0.85)
+        self.agent.web_searcher = AsyncMock()
+        self.agent.web_searcher.search_material.return_value = [result]
+
+        results = asyncio.run(self.agent.search_by_parameters("density < 3 g/cm³\nyield strength > 200 MPa"))
+        self.assertEqual([r["name"] for r in results], ["Aluminium 6061"])
+        self.assertAlmostEqual(results[0]["properties"]["density"], 2700)
+
+
+if __name__ == '__main__':
+    unittest.main()
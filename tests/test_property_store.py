@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from parameter_parser import ParameterConstraint
+import numpy as np
+
+from creatoria_agent import MaterialsAgent
+from property_store import PropertyStore, SortedColumnIndex, canonicalize_properties
+
+MATERIALS = {
+    "metals": [
+        {"label": "Aluminium", "formula": "Al", "λ": 237, "ρ": 2700, "yield_strength": 95, "cost": 2.5},
+        {"label": "Steel", "formula": "Fe-C", "λ": 50, "ρ": 7850, "yield_strength": 250, "cost": 0.8,
+         "temp_max": 1000, "temp_max_unit": "K"},
+        {"label": "Titanium", "formula": "Ti", "λ": 21.9, "ρ": 4.506, "ρ_unit": "g/cm³", "yield_strength": 880, "temp_max": 600},
+    ],
+    "ceramics": [
+        {"label": "Alumina", "formula": "Al2O3", "λ": 30, "ρ": 3950, "cost": "n/a"},
+    ]
+}
+
+# Значения одного свойства в разных размерностях: шкалы твердости и валюты
+MIXED_UNITS = {
+    "metals": [
+        {"label": "Al", "hardness": 300, "hardness_unit": "HV", "cost": 30},
+        {"label": "Tool steel", "hardness": 45, "hardness_unit": "HRC", "cost": 40, "cost_unit": "EUR"},
+        {"label": "Bronze", "hardness": 250, "hardness_unit": "HB", "cost": 60, "cost_unit": "USD"},
+        {"label": "Brass", "hardness": 35, "hardness_unit": "HRC", "cost": 20, "cost_unit": "GBP"},
+    ]
+}
+
+
+class TestPropertyStore(unittest.TestCase):
+    def setUp(self):
+        self.store = PropertyStore.from_materials(MATERIALS)
+
+    def labels(self, constraints):
+        return [MATERIALS[category][position]["label"] for category, position in self.store.query(constraints)]
+
+    def test_single_constraint(self):
+        constraints = [ParameterConstraint("thermal_conductivity", "greater", 25, "W/m·K")]
+        self.assertEqual(self.labels(constraints), ["Aluminium", "Steel", "Alumina"])
+
+    def test_multiple_constraints_and_missing_values(self):
+        constraints = [
+            ParameterConstraint("density", "less_equal", 5000, "kg/m³"),
+            ParameterConstraint("cost", "less", 10, ""),
+        ]
+        # У титана нет стоимости, у оксида алюминия она нечисловая
+        self.assertEqual(self.labels(constraints), ["Aluminium"])
+
+    def test_stored_unit_is_normalized(self):
+        # 1000 K = 726.85 °C
+        constraints = [ParameterConstraint("max_temp", "greater", 700, "°C")]
+        self.assertEqual(self.labels(constraints), ["Steel"])
+        constraints = [ParameterConstraint("max_temp", "greater", 900, "K")]
+        self.assertEqual(self.labels(constraints), ["Steel"])
+        constraints = [ParameterConstraint("density", "range", 5, "g/cm³", range_min=4, range_max=5)]
+        self.assertEqual(self.labels(constraints), ["Titanium"])
+
+    def test_range_constraint(self):
+        constraints = [ParameterConstraint("strength", "range", 300, "MPa", range_min=90, range_max=300)]
+        self.assertEqual(self.labels(constraints), ["Aluminium", "Steel"])
+
+    def test_unknown_property_matches_nothing(self):
+        constraints = [ParameterConstraint("pressure", "less", 100, "kPa")]
+        self.assertEqual(self.labels(constraints), [])
+
+    def test_append_grows_columns(self):
+        store = PropertyStore(capacity=2)
+        for position in range(5):
+            store.append("metals", position, {"λ": float(position)})
+        constraints = [ParameterConstraint("thermal_conductivity", "greater_equal", 3, "")]
+        self.assertEqual(store.query(constraints), [("metals", 3), ("metals", 4)])
+
+    def test_index_kept_in_sync_on_append(self):
+        self.store.append("metals", 3, {"label": "Copper", "λ": 401, "ρ": 8960})
+        self.assertEqual(len(self.store.indexes["λ"]), 5)
+        self.assertEqual(len(self.store.indexes["cost"]), 2)
+        constraints = [
+            ParameterConstraint("thermal_conductivity", "greater", 200, "W/m·K"),
+            ParameterConstraint("density", "greater", 3000, "kg/m³"),
+        ]
+        self.assertEqual(self.store.query(constraints), [("metals", 3)])
+
+    def test_sorted_index_bounds(self):
+        index = SortedColumnIndex(np.array([5.0, np.nan, 1.0, 3.0, 3.0]))
+        self.assertEqual(len(index), 4)
+        start, stop = index.bounds((3.0, 3.0, True, True))
+        self.assertEqual(sorted(index.slice(start, stop)), [3, 4])
+        start, stop = index.bounds((-np.inf, 3.0, True, False))
+        self.assertEqual(list(index.slice(start, stop)), [2])
+        index.insert(5, 2.0)
+        start, stop = index.bounds((1.5, 4.0, False, False))
+        self.assertEqual(sorted(index.slice(start, stop)), [3, 4, 5])
+
+    def test_properties_are_kept_in_si_and_original_units(self):
+        row = [label for label in self.labels([])].index("Titanium")
+        self.assertAlmostEqual(self.store.si_properties(row)["density"], 4506)
+        self.assertEqual(self.store.si_properties(row)["density_unit"], "kg/m³")
+        self.assertAlmostEqual(self.store.si_properties(row)["max_temp"], 873.15)
+        self.assertEqual(self.store.display_properties(row)["density"], {"value": 4.506, "unit": "g/cm³"})
+
+    def test_other_dimensions_do_not_match(self):
+        store = PropertyStore.from_materials(MIXED_UNITS)
+
+        def labels(constraints):
+            return [MIXED_UNITS[category][position]["label"] for category, position in store.query(constraints)]
+
+        self.assertEqual(labels([ParameterConstraint("hardness", "greater", 40, "HRC")]), ["Tool steel"])
+        self.assertEqual(labels([ParameterConstraint("hardness", "greater", 200, "HV")]), ["Al"])
+        self.assertEqual(labels([ParameterConstraint("hardness", "greater", 200, "HB")]), ["Bronze"])
+        self.assertEqual(labels([ParameterConstraint("cost", "less", 50, "EUR")]), ["Tool steel"])
+        self.assertEqual(labels([ParameterConstraint("cost", "less", 50, "")]), ["Al"])
+        self.assertEqual(labels([
+            ParameterConstraint("cost", "less", 100, "$"),
+            ParameterConstraint("hardness", "greater", 10, "HB"),
+        ]), ["Bronze"])
+        self.assertEqual(labels([ParameterConstraint("hardness", "greater", 10, "parsec")]), [])
+
+    def test_other_dimensions_do_not_match_after_append(self):
+        store = PropertyStore(capacity=1)
+        for position, material in enumerate(MIXED_UNITS["metals"]):
+            store.append("metals", position, material)
+        constraints = [ParameterConstraint("hardness", "greater", 40, "HRC")]
+        self.assertEqual(store.query(constraints), [("metals", 1)])
+
+    def test_si_properties_keep_stored_dimension(self):
+        store = PropertyStore.from_materials(MIXED_UNITS)
+        self.assertEqual(store.si_properties(0)["hardness_unit"], "HV")
+        self.assertEqual(store.si_properties(1)["hardness_unit"], "HRC")
+        self.assertEqual(store.si_properties(1)["cost_unit"], "EUR")
+        self.assertEqual(store.si_properties(2)["hardness_unit"], "HB")
+        self.assertEqual(store.si_properties(3)["cost_unit"], "GBP")
+
+    def test_canonicalize_properties_is_idempotent(self):
+        canonical = canonicalize_properties({"density": 2.7, "density_unit": "g/cm³", "max_temp": 100, "note": "x"})
+        self.assertAlmostEqual(canonical["density"], 2700)
+        self.assertAlmostEqual(canonical["max_temp"], 373.15)
+        self.assertEqual(canonical["note"], "x")
+        self.assertEqual(canonicalize_properties(canonical), canonical)
+
+
+class TestSearchByParameters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        with open("config.json", "w") as f:
+            json.dump({"web_search": {"enabled": False}, "categories": {}}, f)
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(MATERIALS, f, allow_unicode=True)
+        self.agent = MaterialsAgent()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_local_results_with_units(self):
+        results = asyncio.run(self.agent.search_by_parameters("density ≤ 5 g/cm³\nstrength ≥ 200 MPa"))
+        self.assertEqual([r["name"] for r in results], ["Titanium"])
+        self.assertEqual(results[0]["source"], "local_database")
+        self.assertAlmostEqual(results[0]["properties"]["strength"], 880e6)
+        self.assertEqual(results[0]["display_properties"]["strength"], {"value": 880, "unit": "MPa"})
+
+    def test_check_constraint_converts_only_the_constraint(self):
+        constraint = self.agent.parameter_parser.parse_query("max temperature > 500 °C")[0]
+        self.assertTrue(self.agent._check_constraint({"max_temp": 800.0}, constraint))
+        self.assertFalse(self.agent._check_constraint({"max_temp": 700.0}, constraint))
+        self.assertFalse(self.agent._check_constraint({}, constraint))
+
+    def test_check_constraint_rejects_other_dimension(self):
+        constraint = self.agent.parameter_parser.parse_query("hardness > 200 HV")[0]
+        self.assertTrue(self.agent._check_constraint(canonicalize_properties({"hardness": 250}), constraint))
+        self.assertTrue(self.agent._check_constraint({"hardness": 250.0, "hardness_unit": "HV"}, constraint))
+        self.assertFalse(self.agent._check_constraint(
+            canonicalize_properties({"hardness": 250, "hardness_unit": "HB"}), constraint
+        ))
+        constraint = self.agent.parameter_parser.parse_query("hardness > 40 HRC")[0]
+        self.assertTrue(self.agent._check_constraint(
+            canonicalize_properties({"hardness": 45, "hardness_unit": "HRC"}), constraint
+        ))
+        self.assertFalse(self.agent._check_constraint(canonicalize_properties({"hardness": 300}), constraint))
+
+    def test_check_constraint_compares_only_same_currency(self):
+        constraint = self.agent.parameter_parser.parse_query("cost < 50 EUR")[0]
+        self.assertTrue(self.agent._check_constraint(
+            canonicalize_properties({"cost": 40, "cost_unit": "EUR"}), constraint
+        ))
+        self.assertFalse(self.agent._check_constraint(canonicalize_properties({"cost": 30}), constraint))
+        self.assertFalse(self.agent._check_constraint(
+            canonicalize_properties({"cost": 30, "cost_unit": "GBP"}), constraint
+        ))
+
+    def test_local_search_with_mixed_units(self):
+        with open("materials.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(MIXED_UNITS, f, allow_unicode=True)
+        agent = MaterialsAgent()
+        results = asyncio.run(agent.search_by_parameters("hardness > 40 HRC"))
+        self.assertEqual([r["name"] for r in results], ["Tool steel"])
+        results = asyncio.run(agent.search_by_parameters("hardness > 200 HV"))
+        self.assertEqual([r["name"] for r in results], ["Al"])
+
+
+if __name__ == '__main__':
+    unittest.main()
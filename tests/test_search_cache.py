@@ -0,0 +1,174 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from search_cache import PageCache, SearchResultCache
+from web_search import WebMaterialSearcher, WebSearchResult
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_items(title: str, padding: int = 0):
+    return [{"title": title, "description": "x" * padding, "url": "", "source": "arXiv",
+             "properties": {}, "confidence": 0.85}]
+
+
+class TestSearchResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+        self.clock = Clock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self, **kwargs):
+        options = {"default_ttl": 100, "stale_ttl": 50, "clock": self.clock}
+        options.update(kwargs)
+        return SearchResultCache(self.path, **options)
+
+    def test_fresh_stale_and_expired(self):
+        cache = self.make_cache()
+        cache.set("_search_arxiv", "Graphene", None, make_items("graphene"))
+
+        self.assertEqual(cache.get("_search_arxiv", "  graphene ", None), (make_items("graphene"), True))
+        self.clock.now += 120
+        self.assertEqual(cache.get("_search_arxiv", "graphene", None), (make_items("graphene"), False))
+        self.clock.now += 100
+        self.assertIsNone(cache.get("_search_arxiv", "graphene", None))
+        self.assertEqual(cache.stats(), {"hits": 1, "stale_hits": 1, "misses": 1, "evictions": 0})
+
+    def test_key_includes_source_and_category(self):
+        cache = self.make_cache()
+        cache.set("_search_arxiv", "graphene", "nanomaterials", make_items("graphene"))
+        self.assertIsNone(cache.get("_search_scholar", "graphene", "nanomaterials"))
+        self.assertIsNone(cache.get("_search_arxiv", "graphene", None))
+
+    def test_per_source_ttl(self):
+        cache = self.make_cache(source_ttls={"_search_web": 10})
+        cache.set("_search_web", "graphene", None, make_items("web"))
+        cache.set("_search_arxiv", "graphene", None, make_items("arxiv"))
+        self.clock.now += 20
+        self.assertFalse(cache.get("_search_web", "graphene", None)[1])
+        self.assertTrue(cache.get("_search_arxiv", "graphene", None)[1])
+
+    def test_lru_eviction_by_size(self):
+        cache = self.make_cache(max_bytes=3500)
+        for name in ("a", "b", "c"):
+            self.clock.now += 1
+            cache.set("_search_arxiv", name, None, make_items(name, padding=1000))
+        self.clock.now += 1
+        cache.get("_search_arxiv", "a", None)
+        self.clock.now += 1
+        cache.set("_search_arxiv", "d", None, make_items("d", padding=1000))
+
+        self.assertIsNotNone(cache.get("_search_arxiv", "a", None))
+        self.assertIsNone(cache.get("_search_arxiv", "b", None))
+        self.assertIsNotNone(cache.get("_search_arxiv", "c", None))
+        self.assertIsNotNone(cache.get("_search_arxiv", "d", None))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_persists_between_instances(self):
+        cache = self.make_cache()
+        cache.set("_search_arxiv", "graphene", None, make_items("graphene"))
+        cache.close()
+        self.assertIsNotNone(self.make_cache().get("_search_arxiv", "graphene", None))
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = Clock()
+        self.cache = PageCache(os.path.join(self.tmp.name, "cache.sqlite"), ttl=60, clock=self.clock)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_entry_with_validators(self):
+        content = {"title": "Alumina", "description": "", "text": "ceramic"}
+        self.cache.set("http://example.com/a", content, etag='"v1"')
+
+        entry = self.cache.get("http://example.com/a")
+        self.assertEqual(entry["content"], content)
+        self.assertEqual(entry["etag"], '"v1"')
+        self.assertIsNone(entry["last_modified"])
+        self.assertTrue(entry["fresh"])
+
+        self.clock.now += 61
+        self.assertFalse(self.cache.get("http://example.com/a")["fresh"])
+        self.cache.touch("http://example.com/a", validated=True)
+        self.assertTrue(self.cache.get("http://example.com/a")["fresh"])
+        self.assertIsNone(self.cache.get("http://example.com/b"))
+
+    def test_hit_ratio(self):
+        for outcome in ("hit", "revalidated", "miss", "miss"):
+            self.cache.record(outcome)
+        self.assertEqual(self.cache.stats()["hit_ratio"], 0.5)
+
+
+class TestCachedSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config = {"web_search": {
+            "sources": {"arxiv": True},
+            "cache": {"enabled": True, "path": os.path.join(self.tmp.name, "cache.sqlite"),
+                      "ttl": {"arxiv": 100}, "stale_ttl": 1000}
+        }}
+        self.searcher = WebMaterialSearcher(config)
+        self.clock = Clock()
+        self.searcher.search_cache.clock = self.clock
+        self.calls = 0
+
+        async def arxiv_source(query):
+            self.calls += 1
+            return [WebSearchResult(title=f"{query} #{self.calls}", description="", url="", source="arXiv",
+                                    properties={}, confidence=0.85)]
+
+        self.searcher._search_arxiv = arxiv_source
+
+    def tearDown(self):
+        self.searcher.close()
+        self.tmp.cleanup()
+
+    def test_repeat_query_served_from_cache(self):
+        first = asyncio.run(self.searcher.search_material("graphene"))
+        second = asyncio.run(self.searcher.search_material("Graphene"))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_stale_result_returned_and_revalidated(self):
+        asyncio.run(self.searcher.search_material("graphene"))
+        self.clock.now += 500
+
+        async def stale_then_refresh():
+            stale = await self.searcher.search_material("graphene")
+            await asyncio.gather(*self.searcher._refresh_tasks.values())
+            return stale
+
+        stale = asyncio.run(stale_then_refresh())
+        self.assertEqual(stale[0].title, "graphene #1")
+        self.assertEqual(self.calls, 2)
+        fresh = asyncio.run(self.searcher.search_material("graphene"))
+        self.assertEqual(fresh[0].title, "graphene #2")
+
+    def test_empty_results_not_cached(self):
+        async def failing_source(query):
+            self.calls += 1
+            return []
+
+        self.searcher._search_arxiv = failing_source
+        asyncio.run(self.searcher.search_material("graphene"))
+        asyncio.run(self.searcher.search_material("graphene"))
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
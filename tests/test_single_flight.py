@@ -0,0 +1,118 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import run_agent
+from single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def search():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return ["graphene"]
+
+        async def scenario():
+            return await asyncio.gather(*(flight.do(("graphene", None), search) for _ in range(5)))
+
+        results = asyncio.run(scenario())
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [["graphene"]] * 5)
+        self.assertEqual(flight.stats(), {"in_flight": 0, "executed": 1, "shared": 4})
+
+    def test_different_keys_and_sequential_calls_run_separately(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def search(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        async def scenario():
+            await asyncio.gather(flight.do("a", lambda: search("a")), flight.do("b", lambda: search("b")))
+            await flight.do("a", lambda: search("a"))
+
+        asyncio.run(scenario())
+        self.assertEqual(calls, ["a", "b", "a"])
+
+    def test_exception_propagates_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("source down")
+
+        async def scenario():
+            return await asyncio.gather(flight.do("x", failing), flight.do("x", failing), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flight = SingleFlight()
+
+        async def search():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def scenario():
+            first = asyncio.create_task(flight.do("x", search))
+            second = asyncio.create_task(flight.do("x", search))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+
+
+class TestWebhookCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_identical_webhook_requests_search_once(self):
+        agent = MagicMock()
+        calls = 0
+
+        async def search_material(query, category):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return [{"name": query}]
+
+        agent.search_material = search_material
+        agent.generate_n8n_json.return_value = {}
+        request = run_agent.MaterialRequest(query="graphene", category="nanomaterials")
+        other = run_agent.MaterialRequest(query="alumina", category="ceramics")
+
+        async def scenario():
+            return await asyncio.gather(
+                run_agent.materials_webhook(request),
+                run_agent.materials_webhook(request),
+                run_agent.materials_webhook(other)
+            )
+
+        with patch.object(run_agent, "agent", agent), patch.object(run_agent, "search_flight", SingleFlight()):
+            responses = asyncio.run(scenario())
+
+        self.assertEqual(calls, 2)
+        self.assertEqual(responses[0]["results"], [{"name": "graphene"}])
+        self.assertEqual(responses[1]["results"], [{"name": "graphene"}])
+        self.assertEqual(responses[2]["results"], [{"name": "alumina"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
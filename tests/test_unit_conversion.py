@@ -1,5 +1,7 @@
 import unittest
-from parameter_parser import UnitConverter
+import numpy as np
+
+from parameter_parser import UnitConverter, convert_unit, to_si, from_si
 
 class TestUnitConverter(unittest.TestCase):
     def setUp(self):
@@ -113,5 +115,22 @@ class TestUnitConverter(unittest.TestCase):
         self.assertTrue(self.converter.is_valid_cost_unit("RUB"))
         self.assertFalse(self.converter.is_valid_cost_unit("invalid"))
 
+class TestUnitRegistry(unittest.TestCase):
+    def test_affine_conversion(self):
+        self.assertAlmostEqual(to_si(25, "°C"), 298.15)
+        self.assertAlmostEqual(from_si(298.15, "°F"), 77)
+        self.assertAlmostEqual(convert_unit(7.85, "g/cm³", "kg/m³"), 7850)
+        self.assertAlmostEqual(convert_unit(200, "GPa", "MPa"), 200000)
+
+    def test_unknown_or_incompatible_units_pass_through(self):
+        self.assertEqual(convert_unit(5, "kg", "K"), 5)
+        self.assertEqual(convert_unit(5, "", "kPa"), 5)
+        self.assertEqual(convert_unit(5, "USD", "EUR"), 5)
+
+    def test_vectorized_conversion(self):
+        values = np.array([0.0, 100.0, -40.0])
+        np.testing.assert_allclose(convert_unit(values, "°C", "°F"), [32.0, 212.0, -40.0])
+        np.testing.assert_allclose(to_si(values, "kPa"), [0.0, 1e5, -4e4])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,194 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from web_search import WebMaterialSearcher, WebSearchResult
+
+
+def make_result(source: str) -> WebSearchResult:
+    return WebSearchResult(title=source, description="", url="", source=source, properties={}, confidence=0.8)
+
+
+class TestSearchFanOut(unittest.TestCase):
+    def make_searcher(self, sources, timeout=0.2):
+        config = {"settings": {"timeout": timeout}, "web_search": {"sources": sources}}
+        return WebMaterialSearcher(config)
+
+    def test_sources_run_concurrently(self):
+        searcher = self.make_searcher({"google_scholar": True, "arxiv": True})
+
+        async def slow_scholar(query):
+            await asyncio.sleep(0.1)
+            return [make_result("Google Scholar")]
+
+        async def slow_arxiv(query):
+            await asyncio.sleep(0.1)
+            return [make_result("arXiv")]
+
+        searcher._search_scholar = slow_scholar
+        searcher._search_arxiv = slow_arxiv
+
+        async def timed():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            results = await searcher.search_material("alumina")
+            return results, loop.time() - start
+
+        results, elapsed = asyncio.run(timed())
+        self.assertEqual([r.source for r in results], ["Google Scholar", "arXiv"])
+        self.assertLess(elapsed, 0.18)
+
+    def test_slow_source_returns_partial_results(self):
+        searcher = self.make_searcher({
+            "google_scholar": {"enabled": True, "timeout": 0.05},
+            "arxiv": True
+        })
+
+        async def hanging_scholar(query):
+            await asyncio.sleep(5)
+            return [make_result("Google Scholar")]
+
+        async def arxiv_source(query):
+            return [make_result("arXiv")]
+
+        searcher._search_scholar = hanging_scholar
+        searcher._search_arxiv = arxiv_source
+
+        results = asyncio.run(searcher.search_material("alumina"))
+        self.assertEqual([r.source for r in results], ["arXiv"])
+
+    def test_enabled_sources_and_timeouts(self):
+        searcher = self.make_searcher({
+            "google_scholar": False,
+            "arxiv": {"enabled": False},
+            "sciencedirect": {"timeout": 5},
+            "nature": True,
+            "general_web": {"enabled": True, "timeout": 3}
+        }, timeout=10)
+
+        self.assertEqual(searcher._enabled_sources(), [("_search_databases", 10), ("_search_web", 3)])
+
+    def test_failing_source_is_skipped(self):
+        searcher = self.make_searcher({"google_scholar": True, "arxiv": True})
+
+        async def broken(query):
+            raise RuntimeError("boom")
+
+        async def arxiv_source(query):
+            return [make_result("arXiv")]
+
+        searcher._search_scholar = broken
+        searcher._search_arxiv = arxiv_source
+
+        results = asyncio.run(searcher.search_material("alumina"))
+        self.assertEqual(len(results), 1)
+
+
+class TestBlockingOffload(unittest.TestCase):
+    def setUp(self):
+        config = {"settings": {"max_workers": 3}, "web_search": {"sources": {"google_scholar": True}}}
+        self.searcher = WebMaterialSearcher(config)
+
+    def tearDown(self):
+        self.searcher.close()
+
+    def test_separate_source_and_page_executors(self):
+        self.assertEqual(self.searcher.source_executor._max_workers, 1)
+        self.assertEqual(self.searcher.page_executor._max_workers, 3)
+
+    def test_source_requests_have_timeouts(self):
+        searcher = WebMaterialSearcher({"web_search": {"sources": {"general_web": True}, "http": {"timeout": 4}}})
+        with patch("web_search.search", return_value=iter([])) as search:
+            asyncio.run(searcher.search_material("alumina"))
+        searcher.close()
+        self.assertEqual(search.call_args.kwargs["timeout"], 4)
+        self.assertEqual(searcher.arxiv_client._session.get_adapter("https://export.arxiv.org").timeout, 4)
+
+    def test_blocking_client_does_not_freeze_event_loop(self):
+        def blocking_search(query):
+            time.sleep(0.2)
+            return iter([])
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            results = await self.searcher.search_material("alumina")
+            task.cancel()
+            return results, ticks
+
+        with patch("web_search.scholarly.search_pubs", side_effect=blocking_search):
+            results, ticks = asyncio.run(scenario())
+
+        self.assertEqual(results, [])
+        self.assertGreater(ticks, 5)
+
+    def test_blocking_sources_run_at_once(self):
+        config = {
+            "settings": {"max_workers": 1},
+            "web_search": {"sources": {"google_scholar": True, "arxiv": True, "general_web": True}}
+        }
+        searcher = WebMaterialSearcher(config)
+        self.assertEqual(searcher.source_executor._max_workers, 3)
+        # Барьер проходится, только если все три клиента ждут на нем одновременно
+        barrier = threading.Barrier(3, timeout=2)
+
+        def blocking_client(*args, **kwargs):
+            barrier.wait()
+            return iter([])
+
+        with patch("web_search.scholarly.search_pubs", side_effect=blocking_client), \
+                patch.object(searcher.arxiv_client, "results", side_effect=blocking_client), \
+                patch("web_search.search", side_effect=blocking_client):
+            results = asyncio.run(searcher.search_material("alumina"))
+        searcher.close()
+
+        self.assertEqual(results, [])
+        self.assertFalse(barrier.broken)
+
+
+class TestPagedFetch(unittest.TestCase):
+    def test_pages_fetched_in_parallel_through_pool(self):
+        config = {
+            "settings": {"max_workers": 4},
+            "web_search": {"sources": {"general_web": True}, "selenium": {"pool_size": 3}}
+        }
+        searcher = WebMaterialSearcher(config)
+        self.assertEqual(searcher.driver_pool.created, 0)
+
+        def fetch(url):
+            with searcher.driver_pool.checkout():
+                time.sleep(0.1)
+            return {"title": url, "description": "", "text": ""}
+
+        searcher.driver_pool.factory = FakeDriver
+        urls = ["http://a", "http://b", "http://c"]
+        start = time.monotonic()
+        with patch("web_search.search", return_value=iter(urls)), \
+                patch.object(searcher, "_fetch_webpage", side_effect=fetch):
+            results = asyncio.run(searcher.search_material("alumina"))
+        elapsed = time.monotonic() - start
+        searcher.close()
+
+        self.assertEqual([r.title for r in results], urls)
+        self.assertEqual(searcher.driver_pool.created, 3)
+        self.assertLess(elapsed, 0.25)
+
+
+class FakeDriver:
+    current_url = "about:blank"
+
+    def quit(self):
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+import yaml_io
+
+DOCUMENT = """
+metals:
+- &alloy
+  label: Aluminium 6061
+  ρ: 2700
+  tags: [metal, lightweight]
+- label: Steel
+  cost: 0.8
+ceramics:
+- label: Оксид алюминия
+  formula: Al₂O₃
+composites: []
+polymers:
+copies:
+- *alloy
+"""
+
+class TestYamlIO(unittest.TestCase):
+    def test_load_materials_matches_safe_load(self):
+        self.assertEqual(yaml_io.load_materials(io.StringIO(DOCUMENT)), yaml.safe_load(DOCUMENT))
+
+    def test_categories_are_constructed_lazily(self):
+        broken = "metals:\n- label: Steel\nceramics: [unclosed\n"
+        categories = yaml_io.iter_categories(io.StringIO(broken))
+        self.assertEqual(next(categories), ("metals", [{"label": "Steel"}]))
+        with self.assertRaises(yaml.YAMLError):
+            next(categories)
+
+    def test_empty_and_null_documents(self):
+        self.assertEqual(yaml_io.load_materials(""), {})
+        self.assertEqual(yaml_io.load_materials("# comment only\n"), {})
+        self.assertEqual(yaml_io.load_materials("~\n"), {})
+
+    def test_non_mapping_document_rejected(self):
+        with self.assertRaises(yaml.YAMLError):
+            yaml_io.load_materials("- label: Steel\n")
+
+    def test_pure_python_fallback(self):
+        with patch.object(yaml_io, "_StreamLoader", yaml.SafeLoader):
+            self.assertEqual(yaml_io.load_materials(io.StringIO(DOCUMENT)), yaml.safe_load(DOCUMENT))
+
+    def test_dump_matches_pure_python_output(self):
+        materials = yaml.safe_load(DOCUMENT)
+        self.assertEqual(yaml_io.dump(materials), yaml.dump(materials, allow_unicode=True))
+        self.assertEqual(yaml_io.load(yaml_io.dump(materials)), materials)
+
+if __name__ == "__main__":
+    unittest.main()
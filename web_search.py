@@ -1,7 +1,10 @@
+import asyncio
+import functools
 import logging
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Union
 import requests
-from bs4 import BeautifulSoup
 from googlesearch import search
 from scholarly import scholarly
 import arxiv
@@ -12,8 +15,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential
+from driver_pool import WebDriverPool
+from http_fetcher import HttpFetcher, TimeoutAdapter, DEFAULT_SPA_DOMAINS
+from html_text import extract_page, iter_chunks
+from property_extractor import PropertyExtractor, extract_properties
+from search_cache import PageCache, SearchResultCache, cache_key
 
 @dataclass
 class WebSearchResult:
@@ -21,91 +30,264 @@ class WebSearchResult:
     description: str
     url: str
     source: str
-    properties: Dict[str, str]
+    # Свойства в СИ: {"density": 2700.0, "density_unit": "kg/m³", ...}
+    properties: Dict[str, Union[float, str]]
     confidence: float
 
 class WebMaterialSearcher:
+    # Источник в конфигурации -> метод поиска (базы данных ищутся одним методом)
+    SOURCES = {
+        "google_scholar": "_search_scholar",
+        "arxiv": "_search_arxiv",
+        "sciencedirect": "_search_databases",
+        "nature": "_search_databases",
+        "springer": "_search_databases",
+        "general_web": "_search_web"
+    }
+
     def __init__(self, config: Dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        # Блокирующие клиенты выполняются в пулах потоков, чтобы не останавливать
+        # цикл событий. У источников (scholarly, arxiv, googlesearch) свой пул по
+        # числу включенных источников, у загрузки страниц (HTTP, Selenium) - свой,
+        # так что страницы не отнимают потоки у источников и наоборот
+        self.source_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self._enabled_sources())), thread_name_prefix="web-source"
+        )
+        self.page_executor = ThreadPoolExecutor(
+            max_workers=config.get("settings", {}).get("max_workers", 2), thread_name_prefix="web-page"
+        )
+        self.setup_cache()
+        self.setup_http()
         self.setup_selenium()
         
+    def setup_cache(self):
+        """Настройка дисковых кэшей результатов поиска и страниц"""
+        page_cache_config = self.config.get("web_search", {}).get("page_cache", {})
+        self.page_cache = PageCache(
+            Path(page_cache_config.get("path", "search_cache.sqlite")),
+            ttl=page_cache_config.get("ttl", 3600),
+            max_bytes=page_cache_config.get("max_bytes", 200 * 1024 * 1024)
+        ) if page_cache_config.get("enabled", False) else None
+
+        cache_config = self.config.get("web_search", {}).get("cache", {})
+        self._refresh_tasks = {}
+        if not cache_config.get("enabled", False):
+            self.search_cache = None
+            return
+
+        # TTL задаются по источникам конфигурации, а кэш ведется по методам поиска
+        source_ttls = {}
+        for name, ttl in cache_config.get("ttl", {}).items():
+            method = self.SOURCES.get(name)
+            if method:
+                source_ttls[method] = min(ttl, source_ttls.get(method, ttl))
+
+        self.search_cache = SearchResultCache(
+            Path(cache_config.get("path", "search_cache.sqlite")),
+            default_ttl=cache_config.get("default_ttl", 86400),
+            source_ttls=source_ttls,
+            stale_ttl=cache_config.get("stale_ttl", 604800),
+            max_bytes=cache_config.get("max_bytes", 50 * 1024 * 1024)
+        )
+        
+    def setup_http(self):
+        """Настройка HTTP-загрузки страниц, которым не нужен браузер"""
+        web_config = self.config.get("web_search", {})
+        http_config = web_config.get("http", {})
+        self.http_fetcher = HttpFetcher(
+            pool_size=http_config.get("pool_size", 10),
+            timeout=http_config.get("timeout", 10),
+            max_bytes=http_config.get("max_bytes", 2 * 1024 * 1024),
+            user_agent=web_config.get("selenium", {}).get("user_agent"),
+            spa_domains=http_config.get("spa_domains", DEFAULT_SPA_DOMAINS),
+            min_text_length=http_config.get("min_text_length", 200)
+        )
+        # Таймаут отдельного запроса клиентов источников: asyncio.wait_for в
+        # _run_source не останавливает поток, запрос должен завершиться сам
+        self.request_timeout = http_config.get("timeout", 10)
+        scholarly.set_timeout(self.request_timeout)
+        self.arxiv_client = arxiv.Client()
+        # arxiv.Client не передает таймаут в requests - задаем его адаптером сессии
+        adapter = TimeoutAdapter(self.request_timeout)
+        self.arxiv_client._session.mount("http://", adapter)
+        self.arxiv_client._session.mount("https://", adapter)
+        # Сколько страниц отдал каждый уровень загрузки
+        self.fetch_counters = {"cache": 0, "http": 0, "selenium": 0, "failed": 0}
+        self._counters_lock = threading.Lock()
+
     def setup_selenium(self):
-        """Настройка Selenium для динамического контента"""
+        """Настройка пула драйверов Selenium для динамического контента.
+
+        Браузеры запускаются лениво, при первой загрузке страницы.
+        """
+        selenium_config = self.config.get("web_search", {}).get("selenium", {})
+        self.page_load_timeout = selenium_config.get("timeout", 10)
+        self.driver_pool = WebDriverPool(
+            self._create_driver,
+            size=selenium_config.get("pool_size", self.config.get("settings", {}).get("max_workers", 2)),
+            max_pages=selenium_config.get("max_pages_per_driver", 50)
+        )
+
+    def _create_driver(self) -> webdriver.Chrome:
+        """Запуск нового headless Chrome"""
+        selenium_config = self.config.get("web_search", {}).get("selenium", {})
         chrome_options = Options()
-        chrome_options.add_argument("--headless")
+        if selenium_config.get("headless", True):
+            chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver = webdriver.Chrome(options=chrome_options)
+        if selenium_config.get("user_agent"):
+            chrome_options.add_argument(f"--user-agent={selenium_config['user_agent']}")
+        driver = webdriver.Chrome(options=chrome_options)
+        # Без таймаута driver.get ждет загрузки страницы сколько угодно
+        driver.set_page_load_timeout(self.page_load_timeout)
+        return driver
         
+    def _enabled_sources(self) -> List[Tuple[str, float]]:
+        """Включенные методы поиска и их таймауты.
+
+        Значение в web_search.sources - либо bool, либо словарь
+        {"enabled": bool, "timeout": секунды}; таймаут по умолчанию - settings.timeout.
+        """
+        default_timeout = self.config.get("settings", {}).get("timeout", 30)
+        sources = self.config.get("web_search", {}).get("sources", {name: True for name in self.SOURCES})
+        enabled = {}
+        for name, method in self.SOURCES.items():
+            options = sources.get(name, False)
+            if isinstance(options, dict):
+                if not options.get("enabled", True):
+                    continue
+                timeout = options.get("timeout", default_timeout)
+            elif options:
+                timeout = default_timeout
+            else:
+                continue
+            enabled[method] = max(timeout, enabled.get(method, 0))
+        return list(enabled.items())
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def search_material(self, query: str, category: Optional[str] = None) -> List[WebSearchResult]:
-        """Поиск материалов в различных источниках"""
+        """Параллельный поиск материалов во всех включенных источниках.
+
+        Источник, не уложившийся в свой таймаут, пропускается - возвращаются
+        результаты остальных. Ответы источников берутся из кэша, если он включен.
+        """
+        sources = self._enabled_sources()
+        batches = await asyncio.gather(*(
+            self._cached_source(method, query, category, timeout) for method, timeout in sources
+        ))
+
         results = []
-        
-        # Поиск в Google Scholar
-        scholar_results = await self._search_scholar(query)
-        results.extend(scholar_results)
-        
-        # Поиск в arXiv
-        arxiv_results = await self._search_arxiv(query)
-        results.extend(arxiv_results)
-        
-        # Поиск в научных базах данных
-        database_results = await self._search_databases(query)
-        results.extend(database_results)
-        
-        # Поиск в общем интернете
-        web_results = await self._search_web(query)
-        results.extend(web_results)
-        
+        for batch in batches:
+            results.extend(batch)
         return results
+
+    async def _cached_source(self, method: str, query: str, category: Optional[str], timeout: float) -> List[WebSearchResult]:
+        """Результаты источника из кэша или из самого источника.
+
+        Устаревшая запись отдается сразу, а источник опрашивается в фоне.
+        """
+        if not self.search_cache:
+            return await self._run_source(method, query, timeout)
+
+        cached = self.search_cache.get(method, query, category)
+        if cached is not None:
+            items, fresh = cached
+            if not fresh:
+                self._schedule_refresh(method, query, category, timeout)
+            return [WebSearchResult(**item) for item in items]
+
+        return await self._refresh_source(method, query, category, timeout)
+
+    async def _refresh_source(self, method: str, query: str, category: Optional[str], timeout: float) -> List[WebSearchResult]:
+        results = await self._run_source(method, query, timeout)
+        # Пустой ответ чаще означает сбой или лимит запросов, его не кэшируем
+        if results:
+            self.search_cache.set(method, query, category, [asdict(result) for result in results])
+        return results
+
+    def _schedule_refresh(self, method: str, query: str, category: Optional[str], timeout: float):
+        key = cache_key(method, query, category)
+        if key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh_source(method, query, category, timeout))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _run_source(self, method: str, query: str, timeout: float) -> List[WebSearchResult]:
+        """Запуск одного источника с таймаутом.
+
+        По таймауту результаты источника пропускаются; поток с блокирующим
+        запросом освобождается по таймауту самого запроса (request_timeout).
+        """
+        try:
+            return await asyncio.wait_for(getattr(self, method)(query), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Источник {method} не ответил за {timeout} с, результаты пропущены")
+        except Exception as e:
+            self.logger.error(f"Ошибка в источнике {method}: {str(e)}")
+        return []
     
+    async def _run_blocking(self, executor: ThreadPoolExecutor, func, *args, **kwargs):
+        """Выполнение блокирующего вызова в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
     async def _search_scholar(self, query: str) -> List[WebSearchResult]:
         """Поиск в Google Scholar"""
-        results = []
         try:
-            search_query = scholarly.search_pubs(query)
-            for i in range(5):  # Получаем первые 5 результатов
-                try:
-                    pub = next(search_query)
-                    result = WebSearchResult(
-                        title=pub.bib.get('title', ''),
-                        description=pub.bib.get('abstract', ''),
-                        url=pub.bib.get('url', ''),
-                        source='Google Scholar',
-                        properties=self._extract_properties(pub.bib.get('abstract', '')),
-                        confidence=0.8
-                    )
-                    results.append(result)
-                except StopIteration:
-                    break
+            return await self._run_blocking(self.source_executor, self._scholar_results, query)
         except Exception as e:
             self.logger.error(f"Ошибка при поиске в Google Scholar: {str(e)}")
+            return []
+
+    def _scholar_results(self, query: str) -> List[WebSearchResult]:
+        results = []
+        search_query = scholarly.search_pubs(query)
+        for i in range(5):  # Получаем первые 5 результатов
+            try:
+                pub = next(search_query)
+                result = WebSearchResult(
+                    title=pub.bib.get('title', ''),
+                    description=pub.bib.get('abstract', ''),
+                    url=pub.bib.get('url', ''),
+                    source='Google Scholar',
+                    properties=self._extract_properties(pub.bib.get('abstract', '')),
+                    confidence=0.8
+                )
+                results.append(result)
+            except StopIteration:
+                break
         return results
     
     async def _search_arxiv(self, query: str) -> List[WebSearchResult]:
         """Поиск в arXiv"""
-        results = []
         try:
-            search = arxiv.Search(
-                query=query,
-                max_results=5,
-                sort_by=arxiv.SortCriterion.Relevance
-            )
-            
-            for result in search.results():
-                result = WebSearchResult(
-                    title=result.title,
-                    description=result.summary,
-                    url=result.entry_id,
-                    source='arXiv',
-                    properties=self._extract_properties(result.summary),
-                    confidence=0.85
-                )
-                results.append(result)
+            return await self._run_blocking(self.source_executor, self._arxiv_results, query)
         except Exception as e:
             self.logger.error(f"Ошибка при поиске в arXiv: {str(e)}")
+            return []
+
+    def _arxiv_results(self, query: str) -> List[WebSearchResult]:
+        results = []
+        search = arxiv.Search(
+            query=query,
+            max_results=5,
+            sort_by=arxiv.SortCriterion.Relevance
+        )
+
+        for result in self.arxiv_client.results(search):
+            result = WebSearchResult(
+                title=result.title,
+                description=result.summary,
+                url=result.entry_id,
+                source='arXiv',
+                properties=self._extract_properties(result.summary),
+                confidence=0.85
+            )
+            results.append(result)
         return results
     
     async def _search_databases(self, query: str) -> List[WebSearchResult]:
@@ -131,66 +313,157 @@ class WebMaterialSearcher:
         """Поиск в общем интернете"""
         results = []
         try:
-            search_results = search(query, num_results=5)
-            for url in search_results:
-                try:
-                    content = self._fetch_webpage(url)
-                    if content:
-                        result = WebSearchResult(
-                            title=content.get('title', ''),
-                            description=content.get('description', ''),
-                            url=url,
-                            source='Web',
-                            properties=self._extract_properties(content.get('text', '')),
-                            confidence=0.6
-                        )
-                        results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Ошибка при обработке {url}: {str(e)}")
+            search_results = await self._run_blocking(
+                self.source_executor, lambda: list(search(query, num_results=5, timeout=self.request_timeout))
+            )
+            # Страницы загружаются параллельно в пуле загрузки страниц
+            pages = await asyncio.gather(
+                *(self._run_blocking(self.page_executor, self._fetch_webpage, url) for url in search_results),
+                return_exceptions=True
+            )
+            for url, content in zip(search_results, pages):
+                if isinstance(content, Exception):
+                    self.logger.error(f"Ошибка при обработке {url}: {str(content)}")
+                    continue
+                if content:
+                    result = WebSearchResult(
+                        title=content.get('title', ''),
+                        description=content.get('description', ''),
+                        url=url,
+                        source='Web',
+                        properties=content['properties'] if 'properties' in content
+                        else self._extract_properties(content.get('text', '')),
+                        confidence=0.6
+                    )
+                    results.append(result)
         except Exception as e:
             self.logger.error(f"Ошибка при веб-поиске: {str(e)}")
         return results
     
     def _fetch_webpage(self, url: str) -> Optional[Dict]:
-        """Получение содержимого веб-страницы"""
+        """Получение содержимого веб-страницы.
+
+        Свежая страница берется из кэша, устаревшая с ETag/Last-Modified
+        перепроверяется условным запросом. Иначе страница запрашивается по
+        HTTP; в браузере рендерятся только страницы, которым по эвристике
+        нужен JavaScript. Ответ с кодом ошибки или не-HTML считается неудачей
+        без обращения к браузеру.
+        """
+        cached = self.page_cache.get(url) if self.page_cache else None
+        if cached and cached["fresh"]:
+            self.page_cache.touch(url)
+            self.page_cache.record("hit")
+            self._count_fetch("cache")
+            return cached["content"]
+
+        page = None
+        if not self.http_fetcher.is_spa_domain(url):
+            if cached:
+                page = self.http_fetcher.fetch_page(url, cached["etag"], cached["last_modified"])
+            else:
+                page = self.http_fetcher.fetch_page(url)
+            if page and page.not_modified:
+                self.page_cache.touch(url, validated=True)
+                self.page_cache.record("revalidated")
+                self._count_fetch("cache")
+                return cached["content"]
+        if self.page_cache:
+            self.page_cache.record("miss")
+        if page and page.not_renderable:
+            # Код ошибки или не-HTML: браузер здесь не поможет
+            self._count_fetch("failed")
+            return None
+
+        html = page.html if page else None
+        tier = "http"
+        if self.http_fetcher.needs_javascript(url, html):
+            tier = "selenium"
+            html = self._render_webpage(url)
+            page = None
+
+        if html is None:
+            self._count_fetch("failed")
+            return None
+        self._count_fetch(tier)
+
+        content = self._parse_webpage(url, html)
+        if content and self.page_cache:
+            # Валидаторы есть только у страниц, полученных по HTTP
+            self.page_cache.set(url, content, page.etag if page else None, page.last_modified if page else None)
+        return content
+
+    def _parse_webpage(self, url: str, html: str) -> Optional[Dict]:
+        """Заголовок, мета-описание, текст и свойства страницы.
+
+        HTML разбирается потоково, без построения дерева; текст ограничен
+        web_search.max_text_bytes и по фрагментам передается в извлечение свойств.
+        """
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            extractor = PropertyExtractor()
+            content = extract_page(
+                iter_chunks(html),
+                max_text_bytes=self.config.get("web_search", {}).get("max_text_bytes", 1024 * 1024),
+                on_text=extractor.feed
             )
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Удаление ненужных элементов
-            for script in soup(["script", "style", "nav", "footer"]):
-                script.decompose()
-            
-            return {
-                'title': soup.title.string if soup.title else '',
-                'description': self._get_meta_description(soup),
-                'text': soup.get_text(separator=' ', strip=True)
-            }
+            content['properties'] = extractor.close()
+            return content
+        except Exception as e:
+            self.logger.error(f"Ошибка при разборе страницы {url}: {str(e)}")
+            return None
+
+    def _render_webpage(self, url: str) -> Optional[str]:
+        """Рендеринг страницы в браузере из пула"""
+        try:
+            with self.driver_pool.checkout() as driver:
+                driver.get(url)
+                WebDriverWait(driver, self.page_load_timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                return driver.page_source
         except Exception as e:
             self.logger.error(f"Ошибка при получении страницы {url}: {str(e)}")
             return None
+
+    def _count_fetch(self, tier: str):
+        with self._counters_lock:
+            self.fetch_counters[tier] += 1
     
-    def _get_meta_description(self, soup: BeautifulSoup) -> str:
-        """Получение мета-описания страницы"""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            return meta_desc.get('content', '')
-        return ''
-    
-    def _extract_properties(self, text: str) -> Dict[str, str]:
-        """Извлечение свойств материала из текста"""
-        properties = {}
-        # Здесь должна быть реализация извлечения свойств
-        # Например, поиск числовых значений с единицами измерения
-        return properties
+    def _extract_properties(self, text: str) -> Dict[str, Union[float, str]]:
+        """Извлечение свойств материала из текста (значения в СИ)"""
+        try:
+            return extract_properties(text)
+        except Exception as e:
+            self.logger.error(f"Ошибка при извлечении свойств: {str(e)}")
+            return {}
     
+    def stats(self) -> Dict:
+        """Счетчики веб-поиска"""
+        with self._counters_lock:
+            fetches = dict(self.fetch_counters)
+        stats = {
+            "fetches": fetches,
+            "driver_pool": self.driver_pool.stats()
+        }
+        if self.search_cache:
+            stats["search_cache"] = self.search_cache.stats()
+        if self.page_cache:
+            stats["page_cache"] = self.page_cache.stats()
+        return stats
+
+    def close(self):
+        """Остановка пула потоков и драйверов Selenium"""
+        self.source_executor.shutdown(wait=False, cancel_futures=True)
+        self.page_executor.shutdown(wait=False, cancel_futures=True)
+        self.http_fetcher.close()
+        self.driver_pool.close()
+        if self.search_cache:
+            self.search_cache.close()
+        if self.page_cache:
+            self.page_cache.close()
+
     def __del__(self):
-        """Закрытие драйвера Selenium при уничтожении объекта"""
+        """Закрытие драйверов Selenium при уничтожении объекта"""
         try:
-            self.driver.quit()
+            self.close()
         except:
             pass 
\ No newline at end of file
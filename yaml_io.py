@@ -0,0 +1,69 @@
+import logging
+from typing import IO, Any, Dict, Iterator, Tuple, Union
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import MappingEndEvent, MappingStartEvent, StreamEndEvent
+from yaml.resolver import Resolver
+
+logger = logging.getLogger(__name__)
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+    from yaml._yaml import CParser
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+    LIBYAML = False
+
+if LIBYAML:
+    class _StreamLoader(CParser, Composer, SafeConstructor, Resolver):
+        """События разбирает libyaml, узлы собираются по одному значению верхнего уровня"""
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    _StreamLoader = SafeLoader
+
+def load(stream: Union[str, IO]) -> Any:
+    """yaml.safe_load через libyaml, если он доступен"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+def dump(data: Any, stream: IO = None, **kwargs) -> Any:
+    """yaml.dump безопасными типами через libyaml, если он доступен"""
+    kwargs.setdefault("allow_unicode", True)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+def iter_categories(stream: Union[str, IO]) -> Iterator[Tuple[Any, Any]]:
+    """Пары (категория, материалы) документа materials.yaml по одной.
+
+    Дерево узлов строится только для текущей категории, поэтому в памяти
+    не находятся одновременно разобранный документ целиком и построенные
+    из него объекты. Пустой документ не дает ни одной пары.
+    """
+    loader = _StreamLoader(stream)
+    try:
+        loader.get_event()
+        if loader.check_event(StreamEndEvent):
+            return
+        loader.get_event()
+        if not loader.check_event(MappingStartEvent):
+            node = loader.compose_node(None, None)
+            if loader.construct_document(node) is None:
+                return
+            raise yaml.YAMLError("Ожидается словарь категорий материалов")
+        loader.get_event()
+        while not loader.check_event(MappingEndEvent):
+            category = loader.construct_document(loader.compose_node(None, None))
+            materials = loader.construct_document(loader.compose_node(None, None))
+            yield category, materials
+    finally:
+        loader.dispose()
+
+def load_materials(stream: Union[str, IO]) -> Dict:
+    """Словарь категорий materials.yaml, прочитанный по категориям"""
+    return dict(iter_categories(stream))